@@ -0,0 +1,254 @@
+"""
+Benchmarks of Judgee's own overhead.
+
+Generates synthetic test folders, judges trivial reference programs against
+them through Judge.run_all and reports throughput, per-test harness overhead,
+peak harness memory and timing jitter as JSON:
+
+    python main.py bench --output bench.json
+
+Scenarios:
+    tiny     thousands of tests with a few bytes of input, measures per-test overhead
+    huge-io  a few tests with tens of megabytes of input echoed back, measures I/O and comparison
+    cpu      identical CPU-bound tests, measures timing jitter
+    startup  starting Judgee: the headless `judge` command and the window, each in a fresh process
+
+Every scenario runs in a child process of its own so that its peak memory is
+measured on its own.
+"""
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+try:
+    import resource
+except ImportError: # Windows
+    resource = None
+
+import compile_cache
+import judge
+import scheduler
+import timings
+
+
+SCENARIOS = ('tiny', 'huge-io', 'cpu')
+STARTUP_REPEAT = 10
+
+PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# from a fresh interpreter until the command could start work: argument parsing and every
+# import of `judge`, and the window shown with its first events processed
+STARTUP_COMMANDS = {
+    'headless': [sys.executable, os.path.join(PACKAGE_DIR, 'main.py'), 'judge', '--help'],
+    'gui': [sys.executable, '-c', 'import gui; app, window = gui.create_window(["judgee"]); app.processEvents()'],
+}
+
+PROGRAMS = {
+    'tiny': '''#include <cstdio>
+int main() { long long a, b; if (scanf("%lld %lld", &a, &b) != 2) return 1; printf("%lld\\n", a + b); }
+''',
+    'huge-io': '''#include <cstdio>
+int main() { static char buffer[1 << 16]; size_t n; while ((n = fread(buffer, 1, sizeof buffer, stdin)) > 0) fwrite(buffer, 1, n, stdout); }
+''',
+    'cpu': '''#include <cstdio>
+int main() { unsigned long long n, x = 1; if (scanf("%llu", &n) != 1) return 1;
+    for (unsigned long long i = 0; i < n; i++) x = x * 6364136223846793005ULL + 1442695040888963407ULL;
+    printf("%llu\\n", x); }
+''',
+}
+
+
+def generate(scenario, folder_path, tiny_tests=2000, huge_tests=3, huge_mb=32, cpu_tests=20, cpu_iterations=50_000_000):
+    """
+    Writes the .in/.ok files of scenario into folder_path
+    """
+    os.makedirs(folder_path, exist_ok=True)
+    if scenario == 'tiny':
+        for i in range(1, tiny_tests + 1):
+            with open(os.path.join(folder_path, f'{i}.in'), 'w') as f:
+                f.write(f'{i} {i * 7}\n')
+            with open(os.path.join(folder_path, f'{i}.ok'), 'w') as f:
+                f.write(f'{i * 8}\n')
+    elif scenario == 'huge-io':
+        line = b' '.join(str(i).encode() for i in range(1000, 1000 + 200)) + b'\n'
+        lines = huge_mb * 2**20 // len(line)
+        for i in range(1, huge_tests + 1):
+            for extension in ('in', 'ok'):
+                with open(os.path.join(folder_path, f'{i}.{extension}'), 'wb') as f:
+                    for _ in range(lines):
+                        f.write(line)
+    elif scenario == 'cpu':
+        expected = _lcg(cpu_iterations)
+        for i in range(1, cpu_tests + 1):
+            with open(os.path.join(folder_path, f'{i}.in'), 'w') as f:
+                f.write(f'{cpu_iterations}\n')
+            with open(os.path.join(folder_path, f'{i}.ok'), 'w') as f:
+                f.write(f'{expected}\n')
+    else:
+        raise ValueError(f'unknown scenario {scenario!r}')
+
+
+def _lcg(iterations, a=6364136223846793005, c=1442695040888963407, m=2**64):
+    """
+    What the cpu program prints, without running 50M iterations in Python:
+    x_n = a^n + c * (1 + a + ... + a^(n-1)) mod m, the series summed by halving n
+    """
+    def series(n):
+        # returns (a^n, 1 + a + ... + a^(n-1)) mod m
+        if n == 0:
+            return 1, 0
+        power, total = series(n // 2)
+        total = total * (1 + power) % m
+        power = power * power % m
+        if n % 2:
+            total = (total + power) % m
+            power = power * a % m
+        return power, total
+    power, total = series(iterations)
+    return (power + c * total) % m
+
+
+def percentile(values, fraction):
+    values = sorted(values)
+    if not values:
+        return None
+    return values[min(len(values) - 1, int(fraction * len(values)))]
+
+
+def run_scenario(scenario, folder_path, exe_path, jobs=None, pin=False, timing_accurate=False):
+    """
+    Judges exe_path against folder_path and returns the measurements of one scenario
+    """
+    cpu_scheduler = scheduler.CpuScheduler(jobs, pin, timing_accurate)
+    runner = judge.Judge(exe_path, runtime=60, scheduler=cpu_scheduler, memory_limit=None, record=False)
+    start_time = time.perf_counter()
+    test_results = runner.run_all(folder_path, order='name')
+    wall_time = time.perf_counter() - start_time
+
+    overheads = [r['Overhead'] for r in test_results if r.get('Overhead') is not None]
+    cpu_times = [r['Elapsed'] for r in test_results if r.get('Elapsed') is not None]
+    return {
+        'scenario': scenario,
+        'tests': len(test_results),
+        'passed': sum(1 for r in test_results if r['Verdict'] == 'OK'),
+        'workers': cpu_scheduler.workers,
+        'pinned': cpu_scheduler.pin,
+        'wall_time': wall_time,
+        'tests_per_second': len(test_results) / wall_time if wall_time else None,
+        'overhead_mean': statistics.mean(overheads) if overheads else None,
+        'overhead_p50': percentile(overheads, 0.5),
+        'overhead_p95': percentile(overheads, 0.95),
+        'overhead_stdev': statistics.pstdev(overheads) if overheads else None,
+        'phases_mean': {phase: seconds / len(test_results) for phase, seconds in timings.totals(test_results).items()},
+        'cpu_time_mean': statistics.mean(cpu_times) if cpu_times else None,
+        # coefficient of variation of the solution's CPU time: 0 means perfectly stable timings
+        'cpu_time_jitter': statistics.pstdev(cpu_times) / statistics.mean(cpu_times) if cpu_times and statistics.mean(cpu_times) else None,
+        'peak_harness_memory': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * judge.MAXRSS_UNIT if resource else None,
+    }
+
+
+def startup(repeat=STARTUP_REPEAT):
+    """
+    Times STARTUP_COMMANDS, returns {path: {'median': seconds, 'min': seconds, 'runs': n}},
+    None for the window when it can't be opened here
+    """
+    env = dict(os.environ)
+    if sys.platform.startswith('linux') and not env.get('DISPLAY') and not env.get('WAYLAND_DISPLAY'):
+        env['QT_QPA_PLATFORM'] = 'offscreen'
+    results = {}
+    for path, command in STARTUP_COMMANDS.items():
+        times = []
+        try:
+            for i in range(repeat + 1):
+                start_time = time.perf_counter()
+                subprocess.run(command, cwd=PACKAGE_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True)
+                if i: # the first run writes the bytecode caches
+                    times.append(time.perf_counter() - start_time)
+        except subprocess.CalledProcessError:
+            results[path] = None
+            continue
+        results[path] = {'median': statistics.median(times), 'min': min(times), 'runs': len(times)}
+    return results
+
+
+def bench(scenarios=SCENARIOS, compiler=None, jobs=None, pin=False, timing_accurate=False, work_dir=None, **sizes):
+    """
+    Generates, compiles and runs every scenario, each in its own child process.
+    Returns the report dict.
+    """
+    compiler = compiler or judge.find_compiler()
+    own_dir = work_dir is None
+    work_dir = work_dir or tempfile.mkdtemp(prefix='judgee-bench-')
+    report = {
+        'version': 1,
+        'started': time.time(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpus': len(scheduler.available_cpus()),
+        'compiler': compile_cache.compiler_version(compiler).splitlines()[0] if compiler else None,
+        'scenarios': [],
+    }
+    try:
+        for scenario in scenarios:
+            if scenario == 'startup':
+                report['startup'] = startup()
+                continue
+            folder_path = os.path.join(work_dir, scenario)
+            start_time = time.perf_counter()
+            generate(scenario, folder_path, **sizes)
+            generate_time = time.perf_counter() - start_time
+            exe_path = judge.compile_source(PROGRAMS[scenario], compiler, flags=('-O2',))
+
+            command = [sys.executable, os.path.abspath(__file__), scenario, folder_path, exe_path]
+            if jobs:
+                command += ['--jobs', str(jobs)]
+            if pin:
+                command.append('--pin')
+            if timing_accurate:
+                command.append('--timing-accurate')
+            output = subprocess.run(command, stdout=subprocess.PIPE, check=True, text=True).stdout
+            result = json.loads(output)
+            result['generate_time'] = generate_time
+            report['scenarios'].append(result)
+    finally:
+        if own_dir:
+            shutil.rmtree(work_dir, ignore_errors=True)
+    return report
+
+
+def print_report(report, file=sys.stdout):
+    for result in report['scenarios']:
+        file.write(f"{result['scenario']:>8}: {result['tests']} tests in {result['wall_time']:.2f}s "
+                   f"({result['tests_per_second']:.1f} tests/s), overhead {result['overhead_mean'] * 1000:.2f}ms mean "
+                   f"/ {result['overhead_p95'] * 1000:.2f}ms p95, jitter {result['cpu_time_jitter'] or 0:.1%}, "
+                   f"peak memory {judge.format_memory(result['peak_harness_memory'])}\n")
+    for path, result in report.get('startup', {}).items():
+        if result is None:
+            file.write(f"{path:>8} startup: could not start\n")
+        else:
+            file.write(f"{path:>8} startup: {result['median'] * 1000:.0f}ms median, {result['min'] * 1000:.0f}ms best of {result['runs']}\n")
+
+
+def main(argv=None):
+    # child process side: python bench.py <scenario> <folder> <exe> [--jobs N] [--pin] [--timing-accurate]
+    import argparse
+    parser = argparse.ArgumentParser(prog='bench.py')
+    parser.add_argument('scenario', choices=SCENARIOS)
+    parser.add_argument('folder')
+    parser.add_argument('exe')
+    parser.add_argument('--jobs', type=int, default=None)
+    parser.add_argument('--pin', action='store_true')
+    parser.add_argument('--timing-accurate', action='store_true')
+    args = parser.parse_args(argv)
+    json.dump(run_scenario(args.scenario, args.folder, args.exe, args.jobs, args.pin, args.timing_accurate), sys.stdout)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,213 @@
+"""
+Calibration of the runtime multiplier against a reference workload.
+
+Three fixed programs are compiled with -O2 and timed on this machine:
+
+    integer  multiplications, shifts and divisions in a dependent chain
+    memory   a random walk over a 32MB array, so nearly every step misses the cache
+    io       reading two million numbers with scanf
+
+Their CPU times are compared with a stored baseline, the times of the same
+programs on the judge being targeted. The multiplier of a workload is
+baseline / local time, so a laptop twice as fast as the judge gets 2.0 and
+its 0.6s becomes the judge's 1.2s. The overall multiplier is the geometric
+mean of the three.
+
+Baselines and the calibrated multipliers of every machine (keyed by host
+name, so a shared JUDGEE_HOME works) are kept in JUDGEE_HOME/calibration.json.
+A baseline is recorded by running
+
+    python main.py calibrate --save-baseline codeforces
+
+on a machine that times like the judge, or entered by hand from times
+measured elsewhere (`--sources DIR` writes the programs and the io input):
+
+    python main.py calibrate --set-baseline codeforces integer=0.42 memory=0.61 io=0.18
+
+after which `python main.py calibrate --target codeforces` calibrates any
+other machine, and `judge` uses the calibrated multiplier unless
+--multiplier is given.
+"""
+import json
+import math
+import os
+import platform
+import statistics
+import subprocess
+import time
+
+import judge
+from testsource import anonymous_file
+
+
+WORKLOADS = ('integer', 'memory', 'io')
+CALIBRATION_REPEAT = 5
+CALIBRATION_TIMEOUT = 30 # seconds per run, a workload takes a second or two at most on anything recent
+CALIBRATION_FLAGS = ('-O2',)
+IO_NUMBERS = 2_000_000
+
+PROGRAMS = {
+    'integer': '''#include <cstdio>
+int main() { unsigned long long x = 88172645463325252ULL, s = 0;
+    for (int i = 0; i < 60000000; i++) { x ^= x << 13; x ^= x >> 7; x ^= x << 17; s += x % 1000003; }
+    printf("%llu\\n", s); }
+''',
+    'memory': '''#include <cstdio>
+#include <vector>
+int main() { const unsigned n = 1u << 23; std::vector<unsigned> next(n);
+    for (unsigned i = 0; i < n; i++) next[i] = i;
+    unsigned long long x = 2463534242ULL;
+    for (unsigned i = n - 1; i > 0; i--) { x ^= x << 13; x ^= x >> 7; x ^= x << 17;
+        unsigned j = x % i, t = next[i]; next[i] = next[j]; next[j] = t; }
+    unsigned p = 0; unsigned long long s = 0;
+    for (int i = 0; i < 10000000; i++) { p = next[p]; s += p; }
+    printf("%llu\\n", s); }
+''',
+    'io': '''#include <cstdio>
+int main() { int n; long long v, s = 0; if (scanf("%d", &n) != 1) return 1;
+    for (int i = 0; i < n; i++) { if (scanf("%lld", &v) != 1) return 1; s += v; }
+    printf("%lld\\n", s); }
+''',
+}
+
+
+class CalibrationError(Exception):
+    pass
+
+
+def calibration_path():
+    return os.path.join(judge.JUDGEE_HOME, 'calibration.json')
+
+
+def machine_id():
+    return platform.node() or 'localhost'
+
+
+def load(path=None):
+    """
+    Returns the stored calibration: {'baselines': {name: {workload: seconds}}, 'machines': {id: {...}}}
+    """
+    try:
+        with open(path or calibration_path()) as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        data = {}
+    data.setdefault('baselines', {})
+    data.setdefault('machines', {})
+    return data
+
+
+def save(data, path=None):
+    path = path or calibration_path()
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temp_path = f'{path}.{os.getpid()}.tmp'
+    with open(temp_path, 'w') as f:
+        json.dump(data, f, indent=2)
+    os.replace(temp_path, path)
+
+
+def io_input(numbers=IO_NUMBERS):
+    """
+    The input of the io workload: a count, then that many numbers of varying length
+    """
+    return f'{numbers}\n'.encode() + b' '.join(str(i * 7919 % 1000000007).encode() for i in range(numbers)) + b'\n'
+
+
+def measure(exe_path, stdin_data=None, repeat=CALIBRATION_REPEAT):
+    """
+    Runs exe_path repeat times and returns the CPU time of every run
+    """
+    runner = judge.Judge(exe_path, runtime=CALIBRATION_TIMEOUT, memory_limit=None, record=False)
+    times = []
+    with anonymous_file('judgee-calibration') as stdin:
+        if stdin_data is not None:
+            stdin.write(stdin_data)
+        for _ in range(repeat):
+            stdin.seek(0)
+            process = runner.spawn([exe_path], stdin if stdin_data is not None else subprocess.DEVNULL,
+                                   subprocess.DEVNULL, subprocess.DEVNULL, timeout=CALIBRATION_TIMEOUT)
+            usage = runner.wait(process, CALIBRATION_TIMEOUT)
+            if usage['timed_out'] or usage['returncode'] != 0:
+                raise CalibrationError(f'{os.path.basename(exe_path)} failed with exit code {usage["returncode"]}')
+            times.append(usage['cpu_time'])
+    return times
+
+
+def run_workloads(compiler, workloads=WORKLOADS, repeat=CALIBRATION_REPEAT):
+    """
+    Compiles and times the reference workloads, returns {workload: median CPU seconds}
+    """
+    times = {}
+    for workload in workloads:
+        try:
+            exe_path = judge.compile_source(PROGRAMS[workload], compiler, flags=CALIBRATION_FLAGS)
+        except judge.CompileError as e:
+            raise CalibrationError(f'could not compile the {workload} workload\n{e}')
+        times[workload] = statistics.median(measure(exe_path, io_input() if workload == 'io' else None, repeat))
+    return times
+
+
+def multipliers(times, baseline):
+    """
+    Returns ({workload: baseline / local time}, geometric mean of them) over the workloads both have
+    """
+    result = {workload: baseline[workload] / times[workload] for workload in WORKLOADS
+              if baseline.get(workload) and times.get(workload)}
+    if not result:
+        raise CalibrationError('the baseline has no time for any workload')
+    return result, math.exp(statistics.fmean(math.log(value) for value in result.values()))
+
+
+def calibrate(compiler, target=None, repeat=CALIBRATION_REPEAT, path=None):
+    """
+    Times the workloads, compares them with the baseline of target (the only
+    stored one when None) and saves the multipliers of this machine.
+    Returns the saved entry.
+    """
+    data = load(path)
+    if target is None:
+        if len(data['baselines']) != 1:
+            raise CalibrationError('pick a baseline with --target, stored ones: ' + (', '.join(data['baselines']) or 'none'))
+        target = next(iter(data['baselines']))
+    if target not in data['baselines']:
+        raise CalibrationError(f'no baseline named {target!r}, record one with --save-baseline or --set-baseline')
+
+    times = run_workloads(compiler, repeat=repeat)
+    per_workload, multiplier = multipliers(times, data['baselines'][target])
+    entry = {'target': target, 'multiplier': round(multiplier, 3),
+             'multipliers': {workload: round(value, 3) for workload, value in per_workload.items()},
+             'times': times, 'calibrated': time.time()}
+    data['machines'][machine_id()] = entry
+    save(data, path)
+    return entry
+
+
+def save_baseline(name, times, path=None):
+    data = load(path)
+    data['baselines'][name] = {workload: times[workload] for workload in WORKLOADS if workload in times}
+    save(data, path)
+
+
+def machine_multiplier(workload=None, default=judge.RUNTIME_MULTIPLIER, path=None):
+    """
+    The calibrated multiplier of this machine, of one workload class if given,
+    or default when it was never calibrated
+    """
+    entry = load(path)['machines'].get(machine_id())
+    if entry is None:
+        return default
+    if workload is not None and workload in entry.get('multipliers', {}):
+        return entry['multipliers'][workload]
+    return entry['multiplier']
+
+
+def write_sources(folder_path):
+    """
+    Writes the workload programs and the io input to folder_path, to time them on another machine
+    """
+    os.makedirs(folder_path, exist_ok=True)
+    for workload, program in PROGRAMS.items():
+        with open(os.path.join(folder_path, f'{workload}.cpp'), 'w') as f:
+            f.write(program)
+    with open(os.path.join(folder_path, 'io.in'), 'wb') as f:
+        f.write(io_input())
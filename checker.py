@@ -0,0 +1,149 @@
+"""
+Special judges (custom checkers) for problems with more than one valid answer.
+
+A checker follows the testlib convention: it is run as
+
+    checker <input> <output> <answer>
+
+and its exit code is the verdict (0 accepted, 1 wrong answer, 2 presentation
+error, anything else a checker failure). Whatever it prints to stderr is kept
+as the message.
+
+Cheap checkers can instead run in persistent mode, where every worker keeps one
+checker process alive for the whole run. Judgee writes one line per test to its
+stdin, with the three paths separated by tabs:
+
+    <input>\t<output>\t<answer>\n
+
+and the checker answers with one line, the exit code it would have used
+followed by an optional message:
+
+    0 ok 3 numbers\n
+
+so a few hundred tests don't pay for a few hundred checker startups.
+"""
+import os
+import shutil
+import subprocess
+import tempfile
+import threading
+
+
+CHECKER_TIMEOUT = 10
+
+VERDICTS = {0: 'OK', 1: 'WA', 2: 'PE'}
+
+
+class CheckerError(Exception):
+    pass
+
+
+def output_path(output):
+    """
+    Returns (path, cleanup) for an output file object so another process can open it.
+    On Linux the anonymous file is reachable through /proc, elsewhere it is copied
+    into a named temporary file which cleanup removes.
+    """
+    if os.path.isdir(f'/proc/{os.getpid()}/fd'):
+        return f'/proc/{os.getpid()}/fd/{output.fileno()}', lambda: None
+    output.seek(0)
+    with tempfile.NamedTemporaryFile('wb', suffix='.out', delete=False) as f:
+        shutil.copyfileobj(output, f)
+    return f.name, lambda: os.remove(f.name)
+
+
+class Checker:
+    def __init__(self, exe_path, persistent=False, timeout=CHECKER_TIMEOUT):
+        '''
+        Parameters
+        ----------
+        exe_path : str
+            compiled checker
+        persistent : bool
+            keep one checker process per worker thread and talk to it over stdin/stdout
+        timeout : float
+            seconds a checker may take for one test
+        '''
+        self.exe_path = exe_path
+        self.persistent = persistent
+        self.timeout = timeout
+        self.local = threading.local()
+        self.processes = []
+        self.processes_lock = threading.Lock()
+
+    def check(self, in_file, output, ok_file):
+        """
+        Checks the output file object of a test.
+        Returns (verdict, message) with verdict one of OK, WA, PE.
+        Raises CheckerError if the checker itself fails.
+        """
+        path, cleanup = output_path(output)
+        try:
+            if self.persistent:
+                return self.check_persistent(in_file, path, ok_file)
+            return self.check_once(in_file, path, ok_file)
+        finally:
+            cleanup()
+
+    def check_once(self, in_file, out_path, ok_file):
+        try:
+            result = subprocess.run([self.exe_path, in_file, out_path, ok_file], stdin=subprocess.DEVNULL,
+                                    stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, timeout=self.timeout)
+        except subprocess.TimeoutExpired:
+            raise CheckerError(f'checker timed out after {self.timeout}s')
+        except OSError as e:
+            raise CheckerError(str(e))
+        message = result.stderr.decode('utf-8', 'replace').strip()
+        if result.returncode not in VERDICTS:
+            raise CheckerError(message or f'checker exited with code {result.returncode}')
+        return VERDICTS[result.returncode], message
+
+    def check_persistent(self, in_file, out_path, ok_file):
+        process = getattr(self.local, 'process', None)
+        if process is None or process.poll() is not None:
+            process = self.start()
+
+        timer = threading.Timer(self.timeout, process.kill)
+        timer.start()
+        try:
+            process.stdin.write(f'{in_file}\t{out_path}\t{ok_file}\n')
+            process.stdin.flush()
+            line = process.stdout.readline()
+        except OSError:
+            line = ''
+        finally:
+            timer.cancel()
+
+        if not line:
+            process.kill()
+            self.local.process = None
+            raise CheckerError('persistent checker exited without answering')
+        code, _, message = line.strip().partition(' ')
+        if not code.lstrip('-').isdigit() or int(code) not in VERDICTS:
+            raise CheckerError(message or f'checker answered {line.strip()!r}')
+        return VERDICTS[int(code)], message
+
+    def start(self):
+        try:
+            process = subprocess.Popen([self.exe_path], stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                                       stderr=subprocess.DEVNULL, text=True, bufsize=1)
+        except OSError as e:
+            raise CheckerError(str(e))
+        self.local.process = process
+        with self.processes_lock:
+            self.processes.append(process)
+        return process
+
+    def close(self):
+        """
+        Stops every persistent checker process
+        """
+        with self.processes_lock:
+            processes, self.processes = self.processes, []
+        for process in processes:
+            try:
+                process.stdin.close()
+                process.wait(timeout=1)
+            except (OSError, subprocess.TimeoutExpired):
+                process.kill()
+        self.local = threading.local()
@@ -0,0 +1,213 @@
+"""
+Streaming output comparison.
+
+Outputs are read in fixed-size chunks (through mmap for big files), so memory
+stays bounded whatever the size of the output, and reading stops at the first
+difference. Three modes are supported:
+
+    exact   byte for byte, except that \r\n counts as \n
+    tokens  whitespace-separated tokens must match, spacing and blank lines are ignored
+    float   like tokens, but numbers may differ by a relative or absolute epsilon
+"""
+import io
+import mmap
+import os
+
+
+CHUNK_SIZE = 1 << 16
+MMAP_THRESHOLD = 1 << 24 # files of 16MB and up are mapped instead of read
+
+MODES = ('exact', 'tokens', 'float')
+EPSILON = 1e-6
+
+_whitespace = b' \t\n\r\v\f'
+
+
+def _size(f):
+    try:
+        return os.fstat(f.fileno()).st_size
+    except (OSError, AttributeError, io.UnsupportedOperation):
+        return None
+
+
+def chunks(f):
+    """
+    Yields the rest of binary file f, from its current position, in chunks of at most CHUNK_SIZE bytes
+    """
+    size = _size(f)
+    if size is not None and size >= MMAP_THRESHOLD:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            for offset in range(f.tell(), size, CHUNK_SIZE):
+                yield mapped[offset:offset + CHUNK_SIZE]
+        return
+    while True:
+        chunk = f.read(CHUNK_SIZE)
+        if not chunk:
+            return
+        yield chunk
+
+
+def _normalized(f):
+    """
+    Chunks of f with every \r\n turned into \n, also across chunk borders
+    """
+    pending = b''
+    for chunk in chunks(f):
+        chunk = pending + chunk
+        if chunk.endswith(b'\r'):
+            chunk, pending = chunk[:-1], b'\r'
+        else:
+            pending = b''
+        yield chunk.replace(b'\r\n', b'\n')
+    if pending:
+        yield pending
+
+
+def tokens(stream):
+    """
+    Yields the whitespace-separated tokens of a stream of chunks
+    """
+    partial = b''
+    for chunk in stream:
+        data = partial + chunk
+        parts = data.split()
+        if parts and data[-1] not in _whitespace:
+            partial = parts.pop()
+        else:
+            partial = b''
+        yield from parts
+    if partial:
+        yield partial
+
+
+def _preview(data, limit=32):
+    text = data.decode('utf-8', 'replace')
+    return text if len(text) <= limit else text[:limit] + '...'
+
+
+def compare_exact(output, expected):
+    try:
+        output.seek(0)
+        expected.seek(0)
+        if _common_prefix(output, expected) is None:
+            return True, ''
+        output.seek(0)
+        expected.seek(0)
+    except (OSError, AttributeError, io.UnsupportedOperation):
+        pass
+
+    position = 0
+    output_buffer = expected_buffer = b''
+    output_stream, expected_stream = _normalized(output), _normalized(expected)
+    while True:
+        if not output_buffer:
+            output_buffer = next(output_stream, b'')
+        if not expected_buffer:
+            expected_buffer = next(expected_stream, b'')
+        if not output_buffer or not expected_buffer:
+            if output_buffer or expected_buffer:
+                return False, f'output {"is longer" if output_buffer else "ends early"} at byte {position}'
+            return True, ''
+        length = min(len(output_buffer), len(expected_buffer))
+        if output_buffer[:length] != expected_buffer[:length]:
+            offset = next(i for i in range(length) if output_buffer[i] != expected_buffer[i])
+            return False, f'byte {position + offset} differs'
+        position += length
+        output_buffer, expected_buffer = output_buffer[length:], expected_buffer[length:]
+
+
+def _common_prefix(output, expected):
+    """
+    Returns the offset where the raw bytes of output and expected start to differ,
+    or None if they are identical, comparing chunk by chunk
+    """
+    position = 0
+    output_stream, expected_stream = chunks(output), chunks(expected)
+    output_buffer = expected_buffer = b''
+    while True:
+        if not output_buffer:
+            output_buffer = next(output_stream, b'')
+        if not expected_buffer:
+            expected_buffer = next(expected_stream, b'')
+        if not output_buffer and not expected_buffer:
+            return None
+        length = min(len(output_buffer), len(expected_buffer))
+        if length == 0 or output_buffer[:length] != expected_buffer[:length]:
+            return position + next((i for i in range(length) if output_buffer[i] != expected_buffer[i]), length)
+        position += length
+        output_buffer, expected_buffer = output_buffer[length:], expected_buffer[length:]
+
+
+def _token_start(output, expected):
+    """
+    Returns the offset from which the token streams of output and expected may
+    differ, or None if the files are byte-identical. Identical leading bytes are
+    skipped without tokenizing them, which is the common case for accepted tests.
+    Both files are left positioned at the returned offset.
+    """
+    try:
+        output.seek(0)
+        expected.seek(0)
+    except (OSError, AttributeError, io.UnsupportedOperation):
+        # a stream we can't rewind: tokenize it from where it is
+        return 0
+    differs_at = _common_prefix(output, expected)
+    if differs_at is None:
+        return None
+
+    # back up to the start of the token the difference is in
+    window_start = max(0, differs_at - CHUNK_SIZE)
+    output.seek(window_start)
+    window = output.read(differs_at - window_start)
+    border = max(window.rfind(bytes([c])) for c in _whitespace)
+    # no whitespace in the window means a token longer than a chunk, start over
+    start = window_start + border + 1 if border != -1 else 0
+    output.seek(start)
+    expected.seek(start)
+    return start
+
+
+def _numbers_match(a, b, epsilon):
+    try:
+        x, y = float(a), float(b)
+    except ValueError:
+        return False
+    if x != x or y != y: # nan
+        return False
+    return abs(x - y) <= epsilon or abs(x - y) <= epsilon * max(abs(x), abs(y))
+
+
+def compare_tokens(output, expected, epsilon=None):
+    start = _token_start(output, expected)
+    if start is None:
+        return True, ''
+    output_tokens = tokens(chunks(output))
+    expected_tokens = tokens(chunks(expected))
+    index = 0
+    while True:
+        a = next(output_tokens, None)
+        b = next(expected_tokens, None)
+        if a is None and b is None:
+            return True, ''
+        if a is None:
+            return False, f'output ends early, expected {_preview(b)!r}'
+        if b is None:
+            return False, f'output is longer, found extra {_preview(a)!r}'
+        if a != b and (epsilon is None or not _numbers_match(a, b, epsilon)):
+            where = f'token {index + 1}' if start == 0 else f'token {index + 1} after byte {start}'
+            return False, f'{where}: expected {_preview(b)!r}, found {_preview(a)!r}'
+        index += 1
+
+
+def compare(output, expected, mode='tokens', epsilon=EPSILON):
+    """
+    Compares two binary files opened for reading.
+    Returns (True, '') if they match under mode, otherwise (False, a short description of the first difference).
+    """
+    if mode == 'exact':
+        return compare_exact(output, expected)
+    if mode == 'tokens':
+        return compare_tokens(output, expected)
+    if mode == 'float':
+        return compare_tokens(output, expected, epsilon)
+    raise ValueError(f'unknown compare mode {mode!r}, expected one of {", ".join(MODES)}')
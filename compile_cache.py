@@ -0,0 +1,157 @@
+"""
+Content-addressed cache of compiled binaries.
+
+Binaries are keyed by a hash of the source text, the compiler (path and
+version) and the compile flags, so rebuilding an unchanged source is a file
+lookup instead of a g++ run. The cache is bounded in size and evicts the least
+recently used binaries first.
+"""
+import hashlib
+import json
+import os
+import subprocess
+import threading
+
+
+MAX_CACHE_BYTES = 512 * 1024 * 1024 # 512MB by default
+
+_compiler_versions = {}
+
+
+def compiler_version(compiler):
+    """
+    Returns the `--version` banner of compiler, memoized on its path and modification time
+    """
+    try:
+        stamp = (os.path.realpath(compiler), os.path.getmtime(compiler))
+    except OSError:
+        stamp = (compiler, None)
+    if stamp not in _compiler_versions:
+        try:
+            _compiler_versions[stamp] = subprocess.run([compiler, '--version'], stdout=subprocess.PIPE,
+                                                       stderr=subprocess.DEVNULL, text=True, timeout=10).stdout
+        except (OSError, subprocess.SubprocessError):
+            _compiler_versions[stamp] = ''
+    return _compiler_versions[stamp]
+
+
+class CompileCache:
+    def __init__(self, cache_dir, max_bytes=MAX_CACHE_BYTES):
+        '''
+        Parameters
+        ----------
+        cache_dir : str
+            folder the binaries and stats are kept in
+        max_bytes : int
+            total size above which least recently used binaries are evicted
+        '''
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        os.makedirs(cache_dir, exist_ok=True)
+        self.stats_file = os.path.join(cache_dir, 'stats.json')
+
+    def key(self, cpp_code, compiler, flags=()):
+        digest = hashlib.sha256()
+        for part in (cpp_code, os.path.realpath(compiler), compiler_version(compiler), '\0'.join(flags)):
+            digest.update(part.encode('utf-8', 'surrogateescape'))
+            digest.update(b'\0')
+        return digest.hexdigest()
+
+    def path(self, key):
+        return os.path.join(self.cache_dir, key + '.exe')
+
+    def lookup(self, key):
+        """
+        Returns the cached binary for key, or None on a miss
+        """
+        path = self.path(key)
+        if os.path.isfile(path):
+            # touch the binary so eviction sees it as recently used
+            try:
+                os.utime(path)
+            except OSError:
+                pass
+            self._count('hits')
+            return path
+        self._count('misses')
+        return None
+
+    def store(self, key, built_path):
+        """
+        Moves a freshly built binary into the cache and returns its cached path
+        """
+        path = self.path(key)
+        os.replace(built_path, path)
+        self.evict()
+        return path
+
+    def temp_path(self, key):
+        """
+        Returns a unique path inside the cache folder to build into before calling store
+        """
+        return os.path.join(self.cache_dir, f'{key}.{os.getpid()}.{threading.get_ident()}.tmp')
+
+    def entries(self):
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith('.exe'):
+                continue
+            try:
+                st = os.stat(os.path.join(self.cache_dir, name))
+            except OSError:
+                continue
+            entries.append((st.st_mtime, st.st_size, name))
+        return entries
+
+    def evict(self):
+        with self.lock:
+            entries = sorted(self.entries())
+            total = sum(size for _, size, _ in entries)
+            while entries and total > self.max_bytes:
+                _, size, name = entries.pop(0)
+                try:
+                    os.remove(os.path.join(self.cache_dir, name))
+                except OSError:
+                    continue
+                total -= size
+                self._count('evictions', locked=True)
+
+    def clear(self):
+        with self.lock:
+            for _, _, name in self.entries():
+                try:
+                    os.remove(os.path.join(self.cache_dir, name))
+                except OSError:
+                    pass
+            if os.path.exists(self.stats_file):
+                os.remove(self.stats_file)
+
+    def stats(self):
+        stats = {'hits': 0, 'misses': 0, 'evictions': 0}
+        try:
+            with open(self.stats_file, 'r') as f:
+                stats.update(json.load(f))
+        except (OSError, ValueError):
+            pass
+        entries = self.entries()
+        stats['entries'] = len(entries)
+        stats['bytes'] = sum(size for _, size, _ in entries)
+        stats['max_bytes'] = self.max_bytes
+        return stats
+
+    def _count(self, name, locked=False):
+        if not locked:
+            with self.lock:
+                return self._count(name, locked=True)
+        stats = {}
+        try:
+            with open(self.stats_file, 'r') as f:
+                stats = json.load(f)
+        except (OSError, ValueError):
+            pass
+        stats[name] = stats.get(name, 0) + 1
+        temp_file = self.stats_file + f'.{os.getpid()}.tmp'
+        with open(temp_file, 'w') as f:
+            json.dump(stats, f)
+        os.replace(temp_file, self.stats_file)
@@ -0,0 +1,180 @@
+"""
+Single-pass C++ lexer for the editor's syntax highlighting.
+
+Every rule is compiled once into one alternation, so a line is classified in a
+single left-to-right scan instead of one regex search per rule. Block comments
+that span lines are carried from one line to the next through a state, the
+way QSyntaxHighlighter block states work:
+
+    spans, state = highlight('int x; /* starts here', NORMAL)
+    spans, state = highlight('ends here */ x++;', state)
+
+Nothing in here touches Qt. Run it as a script to measure how many lines per
+second it (and, when PyQt5 is available, the editor's highlighter) gets through:
+
+    python cpplexer.py [source.cpp] [--lines 5000]
+"""
+import re
+import sys
+import time
+
+
+NORMAL = 0
+IN_COMMENT = 1 # the line ends inside a /* comment
+
+KEYWORDS = frozenset([
+    "alignas", "alignof", "and", "and_eq", "asm", "auto", "bitand", "bitor",
+    "bool", "break", "case", "catch", "char", "class", "compl", "const",
+    "constexpr", "const_cast", "continue", "decltype", "default", "delete",
+    "do", "double", "dynamic_cast", "else", "enum", "explicit", "export",
+    "extern", "false", "float", "for", "friend", "goto", "if", "inline",
+    "int", "long", "mutable", "namespace", "new", "noexcept", "not", "not_eq",
+    "nullptr", "operator", "or", "or_eq", "private", "protected", "public",
+    "register", "reinterpret_cast", "return", "short", "signed", "sizeof",
+    "static", "static_assert", "static_cast", "struct", "switch", "template",
+    "this", "thread_local", "throw", "true", "try", "typedef", "typeid",
+    "typename", "union", "unsigned", "using", "virtual", "void", "volatile",
+    "wchar_t", "while", "xor", "xor_eq"
+])
+
+# alternatives are tried in order at each position, so comments and strings
+# win over the operators and words inside them
+TOKEN = re.compile(r'''
+    (?P<comment>//.*)
+  | (?P<multiline>/\*)
+  | (?P<string>"(?:[^"\\]|\\.)*(?:"|\\?$))
+  | (?P<directive>\#\w+)
+  | (?P<number>\b\d+\b)
+  | (?P<word>[A-Za-z_]\w*)
+  | (?P<operator><<=|>>=|==|!=|<=|>=|&&|\|\||\+=|-=|\*=|/=|%=|&=|\|=|\^=|<<|>>|[-+*/%<>!?:=(){}\[\]])
+''', re.VERBOSE)
+
+COMMENT_END = '*/'
+
+
+def highlight(text, state=NORMAL):
+    """
+    Classifies one line. Returns (spans, state) where spans is a list of
+    (start, length, kind) with kind one of keyword, operator, number, string,
+    directive, comment or multiline, and state is the state for the next line.
+    """
+    spans = []
+    position = 0
+    length = len(text)
+    if state == IN_COMMENT:
+        end = text.find(COMMENT_END)
+        if end == -1:
+            if length:
+                spans.append((0, length, 'multiline'))
+            return spans, IN_COMMENT
+        position = end + 2
+        spans.append((0, position, 'multiline'))
+
+    search = TOKEN.search
+    while True:
+        match = search(text, position)
+        if match is None:
+            return spans, NORMAL
+        kind = match.lastgroup
+        start, position = match.span()
+        if kind == 'word':
+            if match.group() in KEYWORDS:
+                spans.append((start, position - start, 'keyword'))
+        elif kind == 'multiline':
+            end = text.find(COMMENT_END, position)
+            if end == -1:
+                spans.append((start, length - start, 'multiline'))
+                return spans, IN_COMMENT
+            position = end + 2
+            spans.append((start, position - start, 'multiline'))
+        else:
+            spans.append((start, position - start, kind))
+
+
+def highlight_lines(lines, state=NORMAL):
+    """
+    Classifies consecutive lines, yielding the spans of each
+    """
+    for line in lines:
+        spans, state = highlight(line, state)
+        yield spans
+
+
+def sample_source(lines=5000):
+    """
+    A generated C++ source of about `lines` lines, mixing every kind of token
+    """
+    unit = [
+        '#include <bits/stdc++.h>',
+        '/* generated block',
+        '   spanning lines */',
+        'static const long long MOD = 1000000007; // modulus',
+        'template <typename T> struct Fenwick {',
+        '    std::vector<T> tree; int n;',
+        '    void add(int i, T v) { for (; i <= n; i += i & -i) tree[i] += v; }',
+        '    T sum(int i) const { T s = 0; for (; i > 0; i -= i & -i) s += tree[i]; return s; }',
+        '};',
+        'int solve(int n) { if (n < 2) return n; printf("%d\\n", n * 2 + 1); return n % 3 == 0 ? 1 : 0; }',
+    ]
+    return '\n'.join(unit[i % len(unit)] for i in range(lines))
+
+
+def benchmark(text, repeat=3):
+    """
+    Returns the best lines per second of highlight_lines over text
+    """
+    lines = text.split('\n')
+    best = float('inf')
+    for _ in range(repeat):
+        start_time = time.perf_counter()
+        for _ in highlight_lines(lines):
+            pass
+        best = min(best, time.perf_counter() - start_time)
+    return len(lines) / best
+
+
+def benchmark_qt(text, repeat=3):
+    """
+    Returns the best blocks per second of the editor's CppSyntaxHighlighter
+    rehighlighting a QTextDocument holding text, or None without PyQt5
+    """
+    try:
+        from PyQt5.QtGui import QTextDocument
+        from PyQt5.QtWidgets import QApplication
+        from gui import CppSyntaxHighlighter
+    except ImportError:
+        return None
+    app = QApplication.instance() or QApplication(['cpplexer.py'])
+    document = QTextDocument()
+    document.setPlainText(text)
+    highlighter = CppSyntaxHighlighter(document)
+    best = float('inf')
+    for _ in range(repeat):
+        start_time = time.perf_counter()
+        highlighter.rehighlight()
+        best = min(best, time.perf_counter() - start_time)
+    return document.blockCount() / best
+
+
+def main(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(prog='cpplexer.py', description='Benchmark the syntax highlighter.')
+    parser.add_argument('source', nargs='?', help='C++ source to highlight (defaults to a generated one)')
+    parser.add_argument('--lines', type=int, default=5000, help='lines of the generated source')
+    parser.add_argument('--repeat', type=int, default=3, help='runs, the best one counts')
+    args = parser.parse_args(argv)
+
+    if args.source:
+        with open(args.source, 'r', errors='replace') as f:
+            text = f.read()
+    else:
+        text = sample_source(args.lines)
+    print(f"Lexer: {benchmark(text, args.repeat):,.0f} lines/s")
+    blocks_per_second = benchmark_qt(text, args.repeat)
+    if blocks_per_second is not None:
+        print(f"Highlighter: {blocks_per_second:,.0f} blocks/s")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,440 @@
+"""
+Distributed judging: a coordinator hands tests to worker processes over TCP.
+
+Start a worker on every machine, or several on one:
+
+    python main.py worker --host 0.0.0.0 --port 7878 --jobs 8
+
+and judge on them instead of the local pool:
+
+    python main.py judge solution.cpp tests/ --workers host1:7878 host2:7878
+
+The binary is sent once per worker (workers keep binaries by hash under
+JUDGEE_HOME/remote, so a resubmission isn't sent again) and tests are handed
+out as workers finish earlier ones, so faster nodes get more of them.
+
+The protocol is JSON lines. A message with "sizes" is followed by that many
+raw bytes per listed size:
+
+    worker       {"type": "hello", "version": 1, "capacity": 8, "node": "host1"}
+    coordinator  {"type": "start", "token": "...", "sha256": "...", "settings": {...}}
+    worker       {"type": "need"}, answered with {"type": "binary", "sizes": [n]} + bytes
+    worker       {"type": "ready"}
+    coordinator  {"type": "test", "id": 3, "test": "12", "sizes": [input, answer]} + input + answer
+    worker       {"type": "result", "id": 3, "result": {...}}
+    coordinator  {"type": "cancel"} or {"type": "done"}
+    worker       {"type": "error", "message": "..."}
+
+Anyone who can reach a worker can make it run programs: workers listen on
+localhost unless told otherwise, and --token makes them reject coordinators
+that don't know it.
+"""
+import collections
+import functools
+import hashlib
+import hmac
+import itertools
+import json
+import os
+import re
+import socket
+import socketserver
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+
+import judge
+from scheduler import CpuScheduler
+from testsource import SpooledMember, anonymous_file, open_answer
+
+
+PROTOCOL_VERSION = 1
+DEFAULT_PORT = 7878
+CONNECT_TIMEOUT = 10
+
+# the Judge arguments a coordinator passes on to its workers
+REMOTE_SETTINGS = ('runtime', 'multiplier', 'memory_limit', 'compare_mode', 'epsilon')
+
+
+class RemoteError(ConnectionError):
+    """
+    A worker could not be reached, refused the run or broke the protocol
+    """
+    pass
+
+
+def parse_address(address):
+    """
+    'host:port' or 'host' to (host, port)
+    """
+    host, _, port = address.rpartition(':')
+    if not host:
+        return address, DEFAULT_PORT
+    return host, int(port)
+
+
+def send(stream, message, *payloads):
+    if payloads:
+        message = dict(message, sizes=[len(payload) for payload in payloads])
+    stream.write(json.dumps(message).encode() + b'\n')
+    for payload in payloads:
+        stream.write(payload)
+    stream.flush()
+
+
+def receive(stream):
+    """
+    Returns (message, payloads), or (None, []) once the other side has closed the connection
+    """
+    line = stream.readline()
+    if not line:
+        return None, []
+    message = json.loads(line)
+    payloads = []
+    for size in message.get('sizes', ()):
+        payload = stream.read(size)
+        if len(payload) != size:
+            return None, []
+        payloads.append(payload)
+    return message, payloads
+
+
+def read_test_file(file):
+    with open_answer(file) as f:
+        return f.read()
+
+
+class Connection:
+    """
+    The coordinator's side of one worker
+    """
+    def __init__(self, address, exe_path, settings, token=None):
+        self.address = address
+        try:
+            self.socket = socket.create_connection(parse_address(address), timeout=CONNECT_TIMEOUT)
+        except (OSError, ValueError) as e:
+            raise RemoteError(f'{address}: {e}')
+        self.socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.stream = self.socket.makefile('rwb')
+        self.lock = threading.Lock() # the sender thread and cancel both write
+        self.lost = None # why the connection broke, set by the thread reading results
+        try:
+            hello, _ = receive(self.stream)
+            if hello is None or hello.get('type') != 'hello' or hello.get('version') != PROTOCOL_VERSION:
+                raise RemoteError(f'{address} is not a Judgee worker of protocol version {PROTOCOL_VERSION}')
+            self.capacity = hello['capacity']
+            self.node = hello.get('node', address)
+
+            with open(exe_path, 'rb') as f:
+                binary = f.read()
+            send(self.stream, {'type': 'start', 'token': token, 'sha256': hashlib.sha256(binary).hexdigest(), 'settings': settings})
+            reply, _ = receive(self.stream)
+            if reply is not None and reply['type'] == 'need':
+                send(self.stream, {'type': 'binary'}, binary)
+                reply, _ = receive(self.stream)
+            if reply is None or reply['type'] != 'ready':
+                raise RemoteError(f"{address}: {reply.get('message') if reply else 'connection closed'}")
+        except RemoteError:
+            self.close()
+            raise
+        except (OSError, ValueError, KeyError) as e:
+            self.close()
+            raise RemoteError(f'{address}: {e}')
+        # the handshake is done, results may take as long as the tests do
+        self.socket.settimeout(None)
+
+    def send(self, message, *payloads):
+        with self.lock:
+            send(self.stream, message, *payloads)
+
+    def shutdown(self):
+        """
+        Ends the connection both ways, which wakes up a thread blocked reading it
+        """
+        try:
+            self.socket.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+
+    def close(self):
+        try:
+            self.stream.close()
+            self.socket.close()
+        except OSError:
+            pass
+
+
+class RemotePool:
+    """
+    Runs tests on remote workers, in place of the local thread pool of Judge.run_all.
+    submit returns a Future of the test's result dict.
+    """
+    def __init__(self, addresses, exe_path, settings, token=None):
+        self.connections = []
+        try:
+            for address in addresses:
+                self.connections.append(Connection(address, exe_path, settings, token))
+        except RemoteError:
+            for connection in self.connections:
+                connection.close()
+            raise
+        self.capacity = sum(connection.capacity for connection in self.connections)
+        self.queue = collections.deque() # (future, test number, input, answer)
+        self.condition = threading.Condition()
+        self.closed = False
+        self.ids = itertools.count(1)
+        self.live = len(self.connections)
+        self.threads = [threading.Thread(target=self.run, args=(connection,), name=f'judgee-remote-{connection.address}', daemon=True)
+                        for connection in self.connections]
+        for thread in self.threads:
+            thread.start()
+
+    def submit(self, in_file, out_file, test_number):
+        future = Future()
+        with self.condition:
+            if self.live == 0:
+                future.set_result(judge.make_result(test_number, 'ERR', 'No worker left'))
+                return future
+            self.queue.append((future, test_number, in_file, out_file))
+            self.condition.notify_all()
+        return future
+
+    def run(self, connection):
+        # the sender: each worker gets up to twice its capacity of tests ahead, and a
+        # new one as soon as a result frees a slot. Results are read on a thread of
+        # their own, so tests go out as they are submitted, not with the next reply.
+        outstanding = {}
+        receiver = threading.Thread(target=self.receive_results, args=(connection, outstanding),
+                                    name=f'judgee-remote-results-{connection.address}', daemon=True)
+        receiver.start()
+        try:
+            while True:
+                with self.condition:
+                    while not (connection.lost or (self.closed and not outstanding) or
+                               (self.queue and len(outstanding) < 2 * connection.capacity)):
+                        self.condition.wait()
+                    if connection.lost:
+                        raise RemoteError(connection.lost)
+                    if self.closed and not outstanding:
+                        break
+                    batch = []
+                    while self.queue and len(outstanding) < 2 * connection.capacity:
+                        future, test_number, in_file, out_file = test = self.queue.popleft()
+                        # tests requeued from a lost worker are already running
+                        if not future.running() and not future.set_running_or_notify_cancel():
+                            continue
+                        test_id = next(self.ids)
+                        outstanding[test_id] = test
+                        batch.append((test_id, test_number, in_file, out_file))
+                for test_id, test_number, in_file, out_file in batch:
+                    connection.send({'type': 'test', 'id': test_id, 'test': test_number},
+                                    read_test_file(in_file), read_test_file(out_file))
+        except (OSError, ValueError, KeyError, RemoteError):
+            with self.condition:
+                self.live -= 1
+                # hand this worker's tests to the others, or fail them if it was the last one
+                for test in outstanding.values():
+                    if self.live and not self.closed:
+                        self.queue.appendleft(test)
+                    else:
+                        test[0].set_result(judge.make_result(test[1], 'ERR', 'Worker lost'))
+                if not self.live:
+                    while self.queue:
+                        test = self.queue.popleft()
+                        if test[0].running() or test[0].set_running_or_notify_cancel():
+                            test[0].set_result(judge.make_result(test[1], 'ERR', 'Worker lost'))
+                self.condition.notify_all()
+        finally:
+            with self.condition:
+                message = 'cancel' if self.closed and outstanding else 'done'
+            try:
+                connection.send({'type': message})
+            except OSError:
+                pass
+            connection.shutdown()
+            receiver.join()
+            connection.close()
+
+    def receive_results(self, connection, outstanding):
+        """
+        Hands the results a worker sends back to their futures until the connection ends
+        """
+        try:
+            while True:
+                message, _ = receive(connection.stream)
+                if message is None:
+                    raise RemoteError(f'{connection.address} closed the connection')
+                if message['type'] == 'error':
+                    raise RemoteError(f"{connection.address}: {message['message']}")
+                with self.condition:
+                    test = outstanding.pop(message['id'], None)
+                    self.condition.notify_all()
+                if test is None: # failed over to another worker already
+                    continue
+                result = dict(message['result'], Node=connection.node)
+                if result.get('Worker'):
+                    # thread names repeat across workers, timings keep one track per node and thread
+                    result['Worker'] = f"{connection.node}/{result['Worker']}"
+                test[0].set_result(result)
+        except (OSError, ValueError, KeyError, RemoteError) as e:
+            with self.condition:
+                connection.lost = str(e) or 'connection lost'
+                self.condition.notify_all()
+
+    @staticmethod
+    def drop(test):
+        future, test_number = test[:2]
+        if not future.cancel():
+            future.set_result(judge.make_result(test_number, 'Cancelled', '-'))
+
+    def cancel(self):
+        """
+        Tells every worker to stop, the tests they are running are killed
+        """
+        with self.condition:
+            self.closed = True
+            while self.queue:
+                self.drop(self.queue.popleft())
+            self.condition.notify_all()
+        for connection in self.connections:
+            try:
+                connection.send({'type': 'cancel'})
+            except OSError:
+                pass
+
+    def shutdown(self, wait=True, cancel_futures=False):
+        with self.condition:
+            self.closed = True
+            if cancel_futures:
+                while self.queue:
+                    self.drop(self.queue.popleft())
+            self.condition.notify_all()
+        if wait:
+            for thread in self.threads:
+                thread.join()
+
+
+def is_sha256(value):
+    """
+    Whether value is a hex SHA-256 digest as hashlib writes it, so it is safe as a file name
+    """
+    return isinstance(value, str) and re.fullmatch('[0-9a-f]{64}', value) is not None
+
+
+def binary_path(sha256):
+    if not is_sha256(sha256):
+        raise ValueError(f'not a SHA-256 digest: {sha256!r}')
+    return os.path.join(judge.JUDGEE_HOME, 'remote', sha256 + ('.exe' if os.name == 'nt' else ''))
+
+
+class WorkerHandler(socketserver.StreamRequestHandler):
+    """
+    The worker's side of one coordinator connection
+    """
+    def handle(self):
+        server = self.server
+        scheduler = CpuScheduler(server.jobs, server.pin)
+        write_lock = threading.Lock()
+
+        def reply(message):
+            with write_lock:
+                send(self.wfile, message)
+
+        reply({'type': 'hello', 'version': PROTOCOL_VERSION, 'capacity': scheduler.workers, 'node': server.node})
+        start, _ = receive(self.rfile)
+        if start is None or start.get('type') != 'start':
+            return
+        if server.token and not hmac.compare_digest(str(start.get('token') or ''), server.token):
+            reply({'type': 'error', 'message': 'wrong token'})
+            return
+
+        sha256 = start.get('sha256')
+        if not is_sha256(sha256):
+            # it names the binary's file, anything but a digest could point outside JUDGEE_HOME/remote
+            reply({'type': 'error', 'message': 'sha256 must be 64 lowercase hex digits'})
+            return
+        exe_path = binary_path(sha256)
+        if not os.path.exists(exe_path):
+            reply({'type': 'need'})
+            message, payloads = receive(self.rfile)
+            if (message is None or message.get('type') != 'binary' or len(payloads) != 1 or
+                    hashlib.sha256(payloads[0]).hexdigest() != sha256):
+                reply({'type': 'error', 'message': 'binary does not match its hash'})
+                return
+            os.makedirs(os.path.dirname(exe_path), exist_ok=True)
+            temp_path = f'{exe_path}.{os.getpid()}.{threading.get_ident()}.tmp'
+            with open(temp_path, 'wb') as f:
+                f.write(payloads[0])
+            os.chmod(temp_path, 0o755)
+            os.replace(temp_path, exe_path)
+
+        settings = {key: value for key, value in (start.get('settings') or {}).items() if key in REMOTE_SETTINGS}
+        runner = judge.Judge(exe_path, scheduler=scheduler, record=False, **settings)
+        runner.run_start = time.perf_counter()
+        reply({'type': 'ready'})
+
+        def finished(test_id, test_number, future):
+            if future.cancelled():
+                # dropped from the queue by the shutdown after a cancel, the coordinator isn't waiting for it
+                return
+            try:
+                result = future.result()
+            except Exception as e:
+                result = judge.make_result(test_number, 'ERR', 'Unknown Error: ' + str(e))
+            try:
+                reply({'type': 'result', 'id': test_id, 'result': result})
+            except OSError:
+                runner.cancel()
+
+        executor = ThreadPoolExecutor(max_workers=scheduler.workers, thread_name_prefix='judgee-worker',
+                                      initializer=scheduler.pin_worker)
+        try:
+            while True:
+                message, payloads = receive(self.rfile)
+                if message is None or message['type'] in ('done', 'cancel'):
+                    if message is None or message['type'] == 'cancel':
+                        runner.cancel()
+                    break
+                if message['type'] != 'test':
+                    continue
+                in_file, out_file = (SpooledMember(self.spool(payload, extension), f"{message['test']}.{extension}")
+                                     for payload, extension in zip(payloads, ('in', 'ok')))
+                future = executor.submit(runner.run_test, in_file, out_file, message['test'])
+                future.add_done_callback(functools.partial(finished, message['id'], message['test']))
+        except (OSError, ValueError, KeyError):
+            runner.cancel()
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    @staticmethod
+    def spool(payload, extension):
+        f = anonymous_file(f'judgee-{extension}')
+        f.write(payload)
+        f.seek(0)
+        return f
+
+
+class WorkerServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, host='127.0.0.1', port=DEFAULT_PORT, jobs=None, pin=False, token=None):
+        '''
+        Parameters
+        ----------
+        host : str
+            address to listen on, 0.0.0.0 for every interface
+        port : int
+            TCP port to listen on, 0 for any free one
+        jobs : int
+            tests run in parallel, defaults to one per CPU
+        pin : bool
+            pin every test to a CPU of its own
+        token : str
+            shared secret coordinators must send, None to accept any
+        '''
+        super().__init__((host, port), WorkerHandler)
+        self.jobs = jobs
+        self.pin = pin
+        self.token = token
+        self.node = f'{socket.gethostname()}:{self.server_address[1]}'
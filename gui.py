@@ -0,0 +1,1530 @@
+"""
+Judgee's window: the editor, the preferences and the results table.
+
+Started by main.py, which only imports this module (and with it Qt) when no
+headless command is given.
+"""
+import os
+import sys
+import time
+
+from PyQt5.QtWidgets import *
+from PyQt5.QtGui import QSyntaxHighlighter, QTextCharFormat, QTextCursor, QTextBlockUserData, QColor, QFont, QPainter, QTextFormat
+from PyQt5.QtCore import Qt, pyqtSlot, pyqtSignal, QObject, QThread, QTimer, QRect, QModelIndex
+from PyQt5 import QtGui
+import qdarktheme
+
+import cpplexer
+import judge
+import calibrate
+import compare
+import profiles
+import resultmodel
+import timings
+import watch
+from store import NOISE_FLOOR
+
+RUNTIME = 2.0 # 2s by default
+RUNTIME_MULTIPLIER = calibrate.machine_multiplier(default=1.0) # calibrated for this machine, 1x otherwise
+MEMORY_LIMIT = 256 # 256MB by default
+COMPARE_MODE = 'tokens' # exact, tokens or float
+CHECKER_PATH = "" # no special judge by default
+CHECKER_PERSISTENT = False
+INTERACTOR_PATH = "" # interactor of an interactive problem, none for batch problems
+BUILD_PROFILE = 'release' # see profiles.py
+SANITIZE_PROFILE = "" # profile failing tests are rerun with, none by default
+WORKERS = [] # host:port of remote workers, none to judge locally
+WORKERS_TOKEN = os.environ.get('JUDGEE_TOKEN', "")
+
+VERSION = "0.6"
+ 
+class QCodeEditor(QPlainTextEdit):
+    LARGE_FILE_CHARS = 1 << 18 # 256KB
+    LOAD_SLICE_LINES = 500
+
+    class NumberBar(QWidget):
+        def __init__(self, editor):
+            QWidget.__init__(self, editor)
+            
+            self.editor = editor
+            self.editor.blockCountChanged.connect(self.updateWidth)
+            self.editor.updateRequest.connect(self.updateContents)
+            self.font = QFont()
+            self.boldFont = QFont(self.font)
+            self.boldFont.setBold(True)
+            self.numberBarColor = QColor("#49494A")
+            self.numberColor = QColor("#8ab4f7")
+            self.currentNumberColor = QColor("#2D74E6")
+            self.lineHeight = self.editor.fontMetrics().height()
+            # the width only changes with the number of digits of the line count
+            self.digits = 0
+            self.cachedWidth = 0
+                     
+        def paintEvent(self, event):
+            
+            painter = QPainter(self)
+            painter.fillRect(event.rect(), self.numberBarColor)
+            painter.setFont(self.font)
+            painter.setPen(self.numberColor)
+             
+            block = self.editor.firstVisibleBlock()
+            blockNumber = block.blockNumber()
+            currentBlockNumber = self.editor.textCursor().blockNumber()
+            block_top = self.editor.blockBoundingGeometry(block).translated(self.editor.contentOffset()).top()
+            bottom = event.rect().bottom()
+            width = self.width()
+ 
+            # Iterate over all visible text blocks in the document.
+            while block.isValid():
+                # Check if the position of the block is out side of the visible area.
+                if not block.isVisible() or block_top >= bottom:
+                    break
+ 
+                # Draw the line number right justified at the position of the line,
+                # we want the line number for the selected line to be bold.
+                paint_rect = QRect(0, int(block_top), width, self.lineHeight)
+                if blockNumber == currentBlockNumber:
+                    painter.setFont(self.boldFont)
+                    painter.setPen(self.currentNumberColor)
+                    painter.drawText(paint_rect, Qt.AlignRight, str(blockNumber+1))
+                    painter.setFont(self.font)
+                    painter.setPen(self.numberColor)
+                else:
+                    painter.drawText(paint_rect, Qt.AlignRight, str(blockNumber+1))
+ 
+                block_top += self.editor.blockBoundingRect(block).height()
+                block = block.next()
+                blockNumber += 1
+ 
+            painter.end()
+            
+            QWidget.paintEvent(self, event)
+ 
+        def getWidth(self):
+            digits = len(str(self.editor.blockCount()))
+            if digits != self.digits:
+                self.digits = digits
+                self.cachedWidth = self.fontMetrics().width('9' * digits) + 8
+            return self.cachedWidth
+        
+        def updateWidth(self):
+            width = self.getWidth()
+            if self.width() != width:
+                self.setFixedWidth(width)
+                self.editor.setViewportMargins(width, 0, 0, 0);
+ 
+        def updateContents(self, rect, scroll):
+            if scroll:
+                self.scroll(0, scroll)
+            else:
+                self.update(0, rect.y(), self.width(), rect.height())
+            
+            if rect.contains(self.editor.viewport().rect()):   
+                fontSize = self.editor.currentCharFormat().font().pointSize()
+                if fontSize != self.font.pointSize():
+                    self.font.setPointSize(fontSize)
+                    self.font.setStyle(QFont.StyleNormal)
+                    self.boldFont = QFont(self.font)
+                    self.boldFont.setBold(True)
+                    self.lineHeight = self.editor.fontMetrics().height()
+                self.updateWidth()
+                
+        
+    def __init__(self, DISPLAY_LINE_NUMBERS=True, HIGHLIGHT_CURRENT_LINE=True,
+                 SyntaxHighlighter=None, *args):        
+        '''
+        Parameters
+        ----------
+        DISPLAY_LINE_NUMBERS : bool 
+            switch on/off the presence of the lines number bar
+        HIGHLIGHT_CURRENT_LINE : bool
+            switch on/off the current line highliting
+        SyntaxHighlighter : QSyntaxHighlighter
+            should be inherited from QSyntaxHighlighter
+        
+        '''                  
+        super(QCodeEditor, self).__init__()
+        self.setLineWrapMode(QPlainTextEdit.NoWrap)
+                               
+        self.DISPLAY_LINE_NUMBERS = DISPLAY_LINE_NUMBERS
+
+        if DISPLAY_LINE_NUMBERS:
+            self.number_bar = self.NumberBar(self)
+            self.setViewportMargins(self.number_bar.getWidth(), 0, 0, 0)
+            
+        if HIGHLIGHT_CURRENT_LINE:
+            self.currentLineNumber = None
+            self.currentLineColor = QColor("#333539")
+            self.cursorPositionChanged.connect(self.highligtCurrentLine)
+        
+        if SyntaxHighlighter is not None: # add highlighter to textdocument
+           self.highlighter = SyntaxHighlighter(self.document())         
+
+        # big sources are loaded in slices, see loadText
+        self.pendingLines = None
+        self.loadedLines = 0
+        self.loadTimer = QTimer(self)
+        self.loadTimer.setInterval(0) # runs whenever the event loop is idle
+        self.loadTimer.timeout.connect(self.loadSlice)
+
+    def loadText(self, text):
+        """
+        Replaces the text. Sources of LARGE_FILE_CHARS and up show the lines in view
+        (and highlight them) straight away, the rest is appended and highlighted a
+        slice at a time while the event loop is idle. The editor stays read-only
+        until everything is in; toPlainText waits for the rest.
+        """
+        self.loadTimer.stop()
+        self.pendingLines = None
+        if len(text) < self.LARGE_FILE_CHARS:
+            self.setPlainText(text)
+            return
+
+        lines = text.split('\n')
+        visibleLines = self.viewport().height() // max(1, self.fontMetrics().height()) + 1
+        self.loadedLines = min(len(lines), max(self.LOAD_SLICE_LINES, 2 * visibleLines))
+        self.document().setUndoRedoEnabled(False)
+        self.setPlainText('\n'.join(lines[:self.loadedLines]))
+        self.pendingLines = lines
+        self.setReadOnly(True)
+        self.loadTimer.start()
+
+    def loadSlice(self):
+        lines = self.pendingLines
+        if lines is None:
+            return
+        if self.loadedLines < len(lines):
+            end = min(len(lines), self.loadedLines + self.LOAD_SLICE_LINES)
+            cursor = QTextCursor(self.document())
+            cursor.movePosition(QTextCursor.End)
+            cursor.insertText('\n' + '\n'.join(lines[self.loadedLines:end]))
+            self.loadedLines = end
+        if self.loadedLines >= len(lines):
+            self.loadTimer.stop()
+            self.pendingLines = None
+            self.document().setUndoRedoEnabled(True)
+            self.setReadOnly(False)
+        elif not self.loadTimer.isActive():
+            self.loadTimer.start()
+
+    def finishLoading(self):
+        while self.pendingLines is not None:
+            self.loadSlice()
+
+    def toPlainText(self):
+        self.finishLoading()
+        return super().toPlainText()
+                 
+    def resizeEvent(self, *e):              
+        if self.DISPLAY_LINE_NUMBERS:   # resize number_bar widget
+            cr = self.contentsRect()
+            rec = QRect(cr.left(), cr.top(), self.number_bar.getWidth(), cr.height())
+            self.number_bar.setGeometry(rec)
+        
+        QPlainTextEdit.resizeEvent(self, *e)
+
+    def highligtCurrentLine(self):
+        newCurrentLineNumber = self.textCursor().blockNumber()
+        if newCurrentLineNumber != self.currentLineNumber:                
+            self.currentLineNumber = newCurrentLineNumber
+            hi_selection = QTextEdit.ExtraSelection() 
+            hi_selection.format.setBackground(self.currentLineColor)
+            hi_selection.format.setProperty(QTextFormat.FullWidthSelection, True)
+            hi_selection.cursor = self.textCursor()
+            hi_selection.cursor.clearSelection() 
+            self.setExtraSelections([hi_selection])        
+
+
+class CppSyntaxHighlighter(QSyntaxHighlighter):
+    def __init__(self, parent=None):
+        super(CppSyntaxHighlighter, self).__init__(parent)
+
+        self.keywordFormat = QTextCharFormat()
+        self.keywordFormat.setForeground(QColor("#569CD6"))
+        self.keywordFormat.setFontWeight(QFont.Bold)
+
+        self.operatorFormat = QTextCharFormat()
+        self.operatorFormat.setForeground(QColor("#e8e2b7"))
+
+        self.numberFormat = QTextCharFormat()
+        self.numberFormat.setForeground(QColor("#B5CEA8"))
+
+        self.stringFormat = QTextCharFormat()
+        self.stringFormat.setForeground(QColor("#CE9178"))
+
+        self.directiveFormat = QTextCharFormat()
+        self.directiveFormat.setForeground(QColor("#59b923"))
+
+        self.commentFormat = QTextCharFormat()
+        self.commentFormat.setForeground(QColor("#93c47d"))
+
+        self.multiLineCommentFormat = QTextCharFormat()
+        self.multiLineCommentFormat.setForeground(QColor("#57A64A"))
+
+        # one format per kind of span cpplexer.highlight returns
+        self.formats = {
+            'keyword': self.keywordFormat,
+            'operator': self.operatorFormat,
+            'number': self.numberFormat,
+            'string': self.stringFormat,
+            'directive': self.directiveFormat,
+            'comment': self.commentFormat,
+            'multiline': self.multiLineCommentFormat,
+        }
+
+    def highlightBlock(self, text):
+        # a block that starts inside a /* comment has the IN_COMMENT state on the block before it
+        spans, state = cpplexer.highlight(text, self.previousBlockState())
+        if spans and not text.isascii() and len(text.encode('utf-16-le')) != 2 * len(text):
+            # Qt positions count UTF-16 units, characters outside the BMP take two
+            units = [0]
+            for character in text:
+                units.append(units[-1] + (2 if ord(character) > 0xFFFF else 1))
+            spans = [(units[start], units[start + length] - units[start], kind) for start, length, kind in spans]
+        for start, length, kind in spans:
+            self.setFormat(start, length, self.formats[kind])
+        self.setCurrentBlockState(state)
+
+    def highlightCurrentLine(self):
+        newCurrentLineNumber = self.textCursor().blockNumber()
+        if newCurrentLineNumber != self.currentLineNumber:
+            self.currentLineNumber = newCurrentLineNumber
+            hi_selection = QTextEdit.ExtraSelection()
+            hi_selection.format.setBackground(self.currentLineColor)
+            hi_selection.format.setProperty(QTextFormat.FullWidthSelection, True)
+            hi_selection.cursor = self.textCursor()
+            hi_selection.cursor.clearSelection()
+            self.setExtraSelections([hi_selection])
+
+    class CommentUserData(QTextBlockUserData):
+        def __init__(self, endingIndex):
+            super().__init__()
+            self._endingIndex = endingIndex
+
+        def endingIndex(self):
+            return self._endingIndex
+
+class JudgeWorker(QObject):
+    """
+    Compiles and judges off the GUI thread, emitting each result as soon as its test finishes
+    """
+    started = pyqtSignal(int)
+    result = pyqtSignal(dict)
+    failed = pyqtSignal(str)
+    phases = pyqtSignal(dict)
+    sanitized = pyqtSignal(dict)
+    finished = pyqtSignal()
+
+    def __init__(self, cpp_code, folder_path, compiler, fail_fast=False, tests=None):
+        super().__init__()
+        self.cpp_code = cpp_code
+        self.folder_path = folder_path
+        self.compiler = compiler
+        self.fail_fast = fail_fast
+        self.tests = tests # only these tests, all when None
+        self.judge = None
+        self.cancelled = False
+
+    @pyqtSlot()
+    def run(self):
+        compile_phases = {}
+        names = [BUILD_PROFILE] + ([SANITIZE_PROFILE] if SANITIZE_PROFILE and SANITIZE_PROFILE != BUILD_PROFILE else [])
+        with timings.timed(compile_phases, 'compile'):
+            built, build_errors = judge.compile_profiles(self.cpp_code, self.compiler, names)
+        if BUILD_PROFILE in build_errors:
+            print(f"Compilation failed.\n{build_errors[BUILD_PROFILE]}")
+            self.failed.emit("Compilation failed.")
+            self.finished.emit()
+            return
+        exe_path = built[BUILD_PROFILE]
+        if SANITIZE_PROFILE in build_errors:
+            print(f"The {SANITIZE_PROFILE} build failed, failing tests won't be rerun with it.\n{build_errors[SANITIZE_PROFILE]}")
+
+        checker = None
+        if CHECKER_PATH:
+            try:
+                checker = judge.compile_checker(CHECKER_PATH, self.compiler, CHECKER_PERSISTENT)
+            except (judge.CompileError, OSError) as e:
+                print(f"Checker compilation failed.\n{e}")
+                self.failed.emit("Checker compilation failed.")
+                self.finished.emit()
+                return
+
+        interactor = None
+        if INTERACTOR_PATH:
+            try:
+                interactor = judge.compile_interactor(INTERACTOR_PATH, self.compiler)
+            except (judge.CompileError, OSError) as e:
+                print(f"Interactor compilation failed.\n{e}")
+                self.failed.emit("Interactor compilation failed.")
+                self.finished.emit()
+                return
+
+        self.judge = judge.Judge(exe_path, RUNTIME, RUNTIME_MULTIPLIER, memory_limit=int(MEMORY_LIMIT * 2**20) or None,
+                                 compare_mode=COMPARE_MODE, checker=checker, interactor=interactor,
+                                 source_hash=judge.source_hash(self.cpp_code),
+                                 compile_time=compile_phases['compile'], record=self.tests is None,
+                                 workers=WORKERS or None, token=WORKERS_TOKEN or None,
+                                 sanitized=profiles.is_sanitized(judge.get_profiles()[BUILD_PROFILE]))
+        if self.cancelled:
+            self.judge.cancel()
+        test_numbers = self.tests if self.tests is not None else judge.list_tests(self.folder_path)
+        self.started.emit(len(test_numbers) if test_numbers is not None else 0) # 0 while the count is unknown
+        test_results = []
+        try:
+            test_results = self.judge.run_all(self.folder_path, self.result.emit, fail_fast=self.fail_fast, tests=self.tests)
+        except Exception as e:
+            self.failed.emit(f"Error: {e}")
+        self.phases.emit(self.judge.run_phases)
+
+        # the verdicts are already in the table, the sanitizer reports are added as they come
+        if SANITIZE_PROFILE in built and not self.cancelled:
+            self.judge = judge.sanitizer_judge(built[SANITIZE_PROFILE], RUNTIME, RUNTIME_MULTIPLIER, interactor=interactor)
+            if self.cancelled:
+                self.judge.cancel()
+            try:
+                judge.sanitize_failures(self.judge, self.folder_path, test_results, self.sanitized.emit)
+            except Exception as e:
+                self.failed.emit(f"Error: {e}")
+        self.finished.emit()
+
+    def cancel(self):
+        self.cancelled = True
+        if self.judge is not None:
+            self.judge.cancel()
+
+
+class CalibrationWorker(QObject):
+    """
+    Times the calibration workloads off the GUI thread
+    """
+    finished = pyqtSignal(dict)
+    failed = pyqtSignal(str)
+
+    def __init__(self, compiler, target):
+        super().__init__()
+        self.compiler = compiler
+        self.target = target
+
+    @pyqtSlot()
+    def run(self):
+        try:
+            self.finished.emit(calibrate.calibrate(self.compiler, self.target))
+        except (calibrate.CalibrationError, judge.CompileError, OSError) as e:
+            # every way out has to signal, or the button stays on "Calibrating..."
+            self.failed.emit(f"Error: {e}")
+
+
+class CPPCheckerApp(QWidget):
+    def __init__(self):
+        super().__init__()
+
+        self.judge_thread = None
+        self.judge_worker = None
+        self.pending_results = [] # results not in the table yet, added in batches
+        self.run_phases = {}
+        self.source_path = None # file the code was loaded from
+        self.tests_path = None # folder or archive of the last mass check
+        self.watcher = None
+        # built the first time they are opened, then reused
+        self.runtime_window = None
+        self.runtime_multiplier_window = None
+        self.view_window = None
+
+        self.initUI()
+
+    def initUI(self):
+        layout = QVBoxLayout()
+
+        menubar = QMenuBar()
+        preferences_menu = menubar.addMenu("Preferences")
+        runtimeAction = QAction("Runtime", self)
+        viewAction = QAction("View", self)
+        runtimeMultiplierAction = QAction("Runtime Multiplier", self)
+        memoryLimitAction = QAction("Memory Limit", self)
+        compareModeAction = QAction("Compare Mode", self)
+        checkerAction = QAction("Checker", self)
+        interactorAction = QAction("Interactor", self)
+        workersAction = QAction("Workers", self)
+        buildAction = QAction("Build Profiles", self)
+
+        preferences_menu.addAction(runtimeAction)
+        runtimeAction.triggered.connect(self.showRuntimeMenu)
+
+        preferences_menu.addAction(runtimeMultiplierAction)
+        runtimeMultiplierAction.triggered.connect(self.showRuntimeMultiplierMenu)
+
+        preferences_menu.addAction(memoryLimitAction)
+        memoryLimitAction.triggered.connect(self.showMemoryLimitMenu)
+
+        preferences_menu.addAction(compareModeAction)
+        compareModeAction.triggered.connect(self.showCompareModeMenu)
+
+        preferences_menu.addAction(checkerAction)
+        checkerAction.triggered.connect(self.showCheckerMenu)
+
+        preferences_menu.addAction(interactorAction)
+        interactorAction.triggered.connect(self.showInteractorMenu)
+
+        preferences_menu.addAction(buildAction)
+        buildAction.triggered.connect(self.showBuildMenu)
+
+        preferences_menu.addAction(workersAction)
+        workersAction.triggered.connect(self.showWorkersMenu)
+
+        preferences_menu.addAction(viewAction)
+        viewAction.triggered.connect(self.show_view_dialog)
+
+        history_menu = menubar.addMenu("History")
+        compareRunsAction = QAction("Compare Runs", self)
+        history_menu.addAction(compareRunsAction)
+        compareRunsAction.triggered.connect(self.showCompareRunsDialog)
+        timingsAction = QAction("Timings", self)
+        history_menu.addAction(timingsAction)
+        timingsAction.triggered.connect(lambda: self.showTimingsDialog())
+        exportTimingsAction = QAction("Export Timings", self)
+        history_menu.addAction(exportTimingsAction)
+        exportTimingsAction.triggered.connect(self.exportTimings)
+
+        layout.setMenuBar(menubar)
+
+        title_label = QLabel("C++ Code:", self)
+        layout.addWidget(title_label)
+
+        # icon
+        self.setWindowIcon(QtGui.QIcon('icon.png'))
+
+        self.code_text = QCodeEditor(self)
+        layout.addWidget(self.code_text)
+
+        cppButtons = QHBoxLayout()
+
+        browse_cpp_button = QPushButton("Browse CPP", self)
+        browse_cpp_button.clicked.connect(self.browseCPP)
+        cppButtons.addWidget(browse_cpp_button)
+
+        self.remove_io_button = QPushButton("Remove IO", self)
+        self.remove_io_button.clicked.connect(self.removeIO)
+        cppButtons.addWidget(self.remove_io_button)
+
+        layout.addLayout(cppButtons)
+
+        mingw_label = QLabel("Mingw Path:", self)
+        layout.addWidget(mingw_label)
+
+        self.mingw_entry = QLineEdit(self)
+        layout.addWidget(self.mingw_entry)
+
+        mingw_button_layout = QHBoxLayout()
+
+        mingw_browse_button = QPushButton("Browse", self)
+        mingw_browse_button.clicked.connect(self.browseMingw)
+        mingw_button_layout.addWidget(mingw_browse_button)
+
+        mingw_autofind_button = QPushButton("Auto-Find", self)
+        mingw_autofind_button.clicked.connect(self.autoFindMingw)
+        mingw_button_layout.addWidget(mingw_autofind_button)
+
+        layout.addLayout(mingw_button_layout)
+
+        filter_layout = QHBoxLayout()
+        filter_layout.addWidget(QLabel("Show:", self))
+        self.result_filter_box = QComboBox(self)
+        self.result_filter_box.addItems(["All tests", "Failed only", "Slowest"])
+        self.result_filter_box.currentIndexChanged.connect(self.filterResults)
+        filter_layout.addWidget(self.result_filter_box)
+        self.slowest_box = QSpinBox(self)
+        self.slowest_box.setRange(1, 1000000)
+        self.slowest_box.setValue(100)
+        self.slowest_box.setEnabled(False)
+        self.slowest_box.valueChanged.connect(self.filterResults)
+        filter_layout.addWidget(self.slowest_box)
+        filter_layout.addStretch()
+        layout.addLayout(filter_layout)
+
+        self.result_model = resultmodel.ResultTableModel(self)
+        self.result_table = QTableView(self)
+        self.result_table.setModel(self.result_model)
+        self.result_table.setSortingEnabled(True)
+        self.result_table.sortByColumn(0, Qt.AscendingOrder)
+        self.result_table.verticalHeader().setSectionResizeMode(QHeaderView.Fixed) # no per-row size hints
+        self.result_table.doubleClicked.connect(self.showTestTimings)
+        layout.addWidget(self.result_table)
+
+        # results arrive per test from the worker thread, the table takes them a batch at a time
+        self.result_timer = QTimer(self)
+        self.result_timer.setInterval(100)
+        self.result_timer.timeout.connect(self.flushResults)
+
+        self.highlighter = CppSyntaxHighlighter(self.code_text.document())
+
+        simple_check_button = QPushButton("Simple Check", self)
+        simple_check_button.clicked.connect(self.simpleCheck)
+
+        self.mass_check_button = QPushButton("Mass Check", self)
+        self.mass_check_button.clicked.connect(self.massCheck)
+
+        self.archive_check_button = QPushButton("Check Archive", self)
+        self.archive_check_button.setToolTip("Mass check against a .zip or .tar.gz of .in/.ok files without extracting it")
+        self.archive_check_button.clicked.connect(self.archiveCheck)
+
+        self.cancel_button = QPushButton("Cancel", self)
+        self.cancel_button.clicked.connect(self.cancelCheck)
+        self.cancel_button.setEnabled(False)
+
+        # use qboxlayout for mass check/ simple check buttons
+        check_button_layout = QHBoxLayout()
+
+        check_button_layout.addWidget(simple_check_button)
+        check_button_layout.addWidget(self.mass_check_button)
+        check_button_layout.addWidget(self.archive_check_button)
+        check_button_layout.addWidget(self.cancel_button)
+
+        self.fail_fast_box = QCheckBox("Fail Fast", self)
+        self.fail_fast_box.setToolTip("Stop at the first failing test. Tests that failed last time run first.")
+        check_button_layout.addWidget(self.fail_fast_box)
+
+        self.watch_box = QCheckBox("Watch", self)
+        self.watch_box.setToolTip("Check again when the CPP file or the tests of the last mass check change.\n"
+                                  "Only changed tests are rerun when just tests change.")
+        self.watch_box.toggled.connect(self.toggleWatch)
+        check_button_layout.addWidget(self.watch_box)
+
+        self.watch_timer = QTimer(self)
+        self.watch_timer.setInterval(int(watch.WATCH_INTERVAL * 1000))
+        self.watch_timer.timeout.connect(self.pollWatch)
+
+        layout.addLayout(check_button_layout)
+
+        self.progress_bar = QProgressBar(self)
+        self.progress_bar.setVisible(False)
+        layout.addWidget(self.progress_bar)
+
+        # make the table to be the width of the box
+        header = self.result_table.horizontalHeader()
+        header.setSectionResizeMode(QHeaderView.Stretch)
+
+        #make the table text noon editable
+        self.result_table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+
+        #make text color black
+        self.result_table.setStyleSheet("color: black")
+
+        self.setLayout(layout)
+        self.setGeometry(100, 100, 600, 400)
+        self.setWindowTitle('Judgee' + ' v' + VERSION)
+        self.show()
+
+    @pyqtSlot()
+    def simpleCheck(self):
+        cpp_code = self.code_text.toPlainText()
+        compiler = judge.find_compiler(self.mingw_entry.text())
+        in_file = QFileDialog.getOpenFileName(self, "Select IN file")[0]
+        out_file = QFileDialog.getOpenFileName(self, "Select OUT file")[0]
+
+        if not in_file or not out_file:
+            self.showError("Error: Please select both IN and OUT files.")
+            return
+
+        if compiler is None:
+            self.showError("Error: Please select a MinGW path.")
+            return
+
+        # Compile the C++ code first
+        flags = judge.get_profiles()[BUILD_PROFILE]
+        try:
+            exe_path = judge.compile_source(cpp_code, compiler, flags=flags)
+        except judge.CompileError as e:
+            print(f"Compilation failed.\n{e}")
+            self.showError("Compilation failed.")
+            return
+
+        checker = None
+        if CHECKER_PATH:
+            try:
+                checker = judge.compile_checker(CHECKER_PATH, compiler)
+            except (judge.CompileError, OSError) as e:
+                print(f"Checker compilation failed.\n{e}")
+                self.showError("Checker compilation failed.")
+                return
+
+        interactor = None
+        if INTERACTOR_PATH:
+            try:
+                interactor = judge.compile_interactor(INTERACTOR_PATH, compiler)
+            except (judge.CompileError, OSError) as e:
+                print(f"Interactor compilation failed.\n{e}")
+                self.showError("Interactor compilation failed.")
+                return
+
+        test_result = judge.Judge(exe_path, RUNTIME, RUNTIME_MULTIPLIER, memory_limit=int(MEMORY_LIMIT * 2**20) or None,
+                                  compare_mode=COMPARE_MODE, checker=checker, interactor=interactor,
+                                  sanitized=profiles.is_sanitized(flags)).run_test(in_file, out_file)
+        self.showResult(test_result['Result'], f"{test_result['Time Taken']}, Memory: {test_result['Memory Used']}")
+
+    @pyqtSlot()
+    def massCheck(self):
+        folder_path = QFileDialog.getExistingDirectory(self, "Select Test Folder")
+
+        if not folder_path:
+            self.showError("Error: Please select a test folder.")
+            return
+
+        self.startMassCheck(folder_path)
+
+    @pyqtSlot()
+    def archiveCheck(self):
+        archive_path = QFileDialog.getOpenFileName(self, "Select Test Archive",
+                                                   filter="Test Archives (*.zip *.tar *.tar.gz *.tgz *.tar.bz2 *.tar.xz)")[0]
+
+        if not archive_path:
+            self.showError("Error: Please select a test archive.")
+            return
+
+        self.startMassCheck(archive_path)
+
+    def startMassCheck(self, folder_path, tests=None):
+        """
+        Judges the tests in folder_path, or only tests and keeps the other results in the table
+        """
+        cpp_code = self.code_text.toPlainText()
+        mingw_path = self.mingw_entry.text()
+
+        compiler = judge.find_compiler(mingw_path)
+        if compiler is None:
+            self.showError("Error: Please select a MinGW path.")
+            return
+
+        if tests is None:
+            self.result_model.clear()
+        if folder_path != self.tests_path:
+            self.tests_path = folder_path
+            self.restartWatch()
+        self.pending_results = []
+        self.result_timer.start()
+        self.run_phases = {}
+        self.mass_check_button.setEnabled(False)
+        self.archive_check_button.setEnabled(False)
+        self.cancel_button.setEnabled(True)
+        self.progress_bar.setRange(0, 0) # busy until the test count is known
+        self.progress_bar.setVisible(True)
+
+        self.judge_thread = QThread(self)
+        self.judge_worker = JudgeWorker(cpp_code, folder_path, compiler, self.fail_fast_box.isChecked(), tests)
+        self.judge_worker.moveToThread(self.judge_thread)
+        self.judge_thread.started.connect(self.judge_worker.run)
+        self.judge_worker.started.connect(self.startProgress)
+        self.judge_worker.result.connect(self.addResult)
+        self.judge_worker.failed.connect(self.showError)
+        self.judge_worker.phases.connect(self.setRunPhases)
+        self.judge_worker.sanitized.connect(self.addSanitizerReport)
+        self.judge_worker.finished.connect(self.massCheckFinished)
+        self.judge_worker.finished.connect(self.judge_thread.quit)
+        self.judge_thread.finished.connect(self.judge_worker.deleteLater)
+        self.judge_thread.start()
+
+    @pyqtSlot()
+    def cancelCheck(self):
+        if self.judge_worker is not None:
+            self.judge_worker.cancel()
+        self.cancel_button.setEnabled(False)
+
+    @pyqtSlot(int)
+    def startProgress(self, total):
+        self.progress_bar.setRange(0, total)
+        self.progress_bar.setValue(0)
+
+    @pyqtSlot()
+    def massCheckFinished(self):
+        self.result_timer.stop()
+        self.flushResults()
+        self.result_model.refresh() # results were appended in arrival order, put them in place
+        self.mass_check_button.setEnabled(True)
+        self.archive_check_button.setEnabled(True)
+        self.cancel_button.setEnabled(False)
+        self.progress_bar.setVisible(False)
+        self.judge_worker = None
+
+    @pyqtSlot(dict)
+    def setRunPhases(self, run_phases):
+        self.run_phases = run_phases
+
+    @pyqtSlot(dict)
+    def addSanitizerReport(self, test_result):
+        self.flushResults()
+        self.result_model.updateResult(test_result['Test No.'], Sanitizer=test_result['Sanitizer'])
+
+    @pyqtSlot(dict)
+    def addResult(self, test_result):
+        self.pending_results.append(test_result)
+
+    @pyqtSlot()
+    def flushResults(self):
+        if not self.pending_results:
+            return
+        results, self.pending_results = self.pending_results, []
+        self.result_model.addResults(results)
+        self.progress_bar.setValue(self.progress_bar.value() + len(results))
+
+    @pyqtSlot()
+    def filterResults(self):
+        result_filter = resultmodel.FILTERS[self.result_filter_box.currentIndex()]
+        self.slowest_box.setEnabled(result_filter == 'slowest')
+        self.result_model.setFilter(result_filter, self.slowest_box.value())
+
+    @pyqtSlot(bool)
+    def toggleWatch(self, checked):
+        if checked and self.tests_path is None:
+            self.showError("Error: Run a mass check first, its tests are watched.")
+            self.watch_box.setChecked(False)
+            return
+        self.restartWatch()
+
+    def restartWatch(self):
+        self.watch_timer.stop()
+        self.watcher = None
+        if self.watch_box.isChecked() and self.tests_path is not None:
+            self.watcher = watch.Watcher(self.source_path, self.tests_path)
+            self.watch_timer.start()
+
+    @pyqtSlot()
+    def pollWatch(self):
+        if self.judge_worker is not None:
+            return # the change is picked up once the running check is done
+        change = self.watcher.poll()
+        # big test folders take a while to scan, poll them less often
+        self.watch_timer.setInterval(int(max(watch.WATCH_INTERVAL, self.watcher.scan_time / watch.SCAN_SHARE) * 1000))
+        if change is None:
+            return
+        if change.removed:
+            self.result_model.removeTests(change.removed)
+        if change.source:
+            with open(self.source_path, 'r') as f:
+                self.code_text.loadText(f.read())
+        if change.source or change.everything:
+            self.startMassCheck(self.tests_path)
+        elif change.tests:
+            self.startMassCheck(self.tests_path, change.tests)
+
+    def updateTable(self, test_results):
+        self.result_model.clear()
+        self.result_model.addResults(test_results)
+        self.result_model.refresh()
+
+    """
+    Changes the max timeout for each test case
+    self - CPPCheckerApp
+    """
+    def showRuntimeMenu(self):
+        if self.runtime_window is None:
+            self.runtime_window = QDialog(self)
+            self.runtime_window.setWindowTitle("Runtime")
+            self.runtime_window.setWindowModality(Qt.ApplicationModal)
+            self.runtime_window.resize(300, 100)
+
+            self.runtime_layout = QVBoxLayout()
+
+            self.runtime_label = QLabel("Runtime (seconds):", self)
+            self.runtime_layout.addWidget(self.runtime_label)
+
+            self.runtime_entry = QLineEdit(self)
+            self.runtime_layout.addWidget(self.runtime_entry)
+
+            self.runtime_button = QPushButton("Set", self)
+            self.runtime_button.clicked.connect(self.setRuntime)
+            self.runtime_layout.addWidget(self.runtime_button)
+
+            self.runtime_window.setLayout(self.runtime_layout)
+        self.runtime_entry.setText(f"{RUNTIME:g}")
+        self.runtime_window.show()
+
+
+    """
+    Sets the runtime global variable
+    self - CPPCheckerApp
+    """
+    def setRuntime(self):
+        global RUNTIME
+        try:
+            float(self.runtime_entry.text())
+        except ValueError:
+            self.showError("Error: Please enter a valid number.")
+            return
+        
+        RUNTIME = float(self.runtime_entry.text())
+        self.runtime_window.close()
+
+    """
+    Changes the runtime multiplier for each test case
+    self - CPPCheckerApp
+    """
+    def showRuntimeMultiplierMenu(self):
+        if self.runtime_multiplier_window is None:
+            self.runtime_multiplier_window = QDialog(self)
+            self.runtime_multiplier_window.setWindowTitle("Runtime Multiplier")
+            self.runtime_multiplier_window.setWindowModality(Qt.ApplicationModal)
+            self.runtime_multiplier_window.resize(300, 100)
+
+            self.runtime_multiplier_layout = QVBoxLayout()
+
+            self.runtime_multiplier_label = QLabel("Runtime Multiplier:", self)
+            self.runtime_multiplier_layout.addWidget(self.runtime_multiplier_label)
+
+            self.runtime_multiplier_entry = QLineEdit(self)
+            self.runtime_multiplier_layout.addWidget(self.runtime_multiplier_entry)
+
+            calibrate_layout = QHBoxLayout()
+            self.calibrate_target_box = QComboBox(self)
+            self.calibrate_target_box.setToolTip("Judge baseline to calibrate against (python main.py calibrate --save-baseline NAME)")
+            calibrate_layout.addWidget(self.calibrate_target_box)
+            self.calibrate_button = QPushButton("Calibrate", self)
+            self.calibrate_button.clicked.connect(self.calibrateRuntimeMultiplier)
+            calibrate_layout.addWidget(self.calibrate_button)
+            self.runtime_multiplier_layout.addLayout(calibrate_layout)
+
+            self.runtime_multiplier_button = QPushButton("Set", self)
+            self.runtime_multiplier_button.clicked.connect(self.setRuntimeMultiplier)
+            self.runtime_multiplier_layout.addWidget(self.runtime_multiplier_button)
+
+            self.runtime_multiplier_window.setLayout(self.runtime_multiplier_layout)
+        self.runtime_multiplier_entry.setText(f"{RUNTIME_MULTIPLIER:g}")
+        # baselines can be recorded from the command line while the window is open
+        target = self.calibrate_target_box.currentText()
+        self.calibrate_target_box.clear()
+        self.calibrate_target_box.addItems(calibrate.load()['baselines'])
+        self.calibrate_target_box.setCurrentText(target)
+        self.runtime_multiplier_window.show()
+
+
+    """
+    Sets the runtime multiplier global variable
+    self - CPPCheckerApp
+    """
+    def setRuntimeMultiplier(self):
+        global RUNTIME_MULTIPLIER
+        try:
+            float(self.runtime_multiplier_entry.text())
+        except ValueError:
+            self.showError("Error: Please enter a valid number.")
+            return
+        
+        RUNTIME_MULTIPLIER = float(self.runtime_multiplier_entry.text())
+        self.runtime_multiplier_window.close()
+
+
+    """
+    Times the reference workloads and fills in the multiplier that matches the chosen judge
+    self - CPPCheckerApp
+    """
+    def calibrateRuntimeMultiplier(self):
+        target = self.calibrate_target_box.currentText()
+        if not target:
+            self.showError("Error: No judge baseline yet, record one with `python main.py calibrate --save-baseline NAME`.")
+            return
+        compiler = judge.find_compiler(self.mingw_entry.text())
+        if compiler is None:
+            self.showError("Error: Please select a MinGW path.")
+            return
+
+        self.calibrate_button.setEnabled(False)
+        self.calibrate_button.setText("Calibrating...")
+        self.calibration_thread = QThread(self)
+        self.calibration_worker = CalibrationWorker(compiler, target)
+        self.calibration_worker.moveToThread(self.calibration_thread)
+        self.calibration_thread.started.connect(self.calibration_worker.run)
+        self.calibration_worker.finished.connect(self.calibrationFinished)
+        self.calibration_worker.failed.connect(self.calibrationFailed)
+        self.calibration_worker.finished.connect(self.calibration_thread.quit)
+        self.calibration_worker.failed.connect(self.calibration_thread.quit)
+        self.calibration_thread.finished.connect(self.calibration_worker.deleteLater)
+        self.calibration_thread.start()
+
+    @pyqtSlot(dict)
+    def calibrationFinished(self, entry):
+        self.calibrate_button.setEnabled(True)
+        self.calibrate_button.setText("Calibrate")
+        self.runtime_multiplier_entry.setText(f"{entry['multiplier']:g}")
+        self.runtime_multiplier_entry.setToolTip(", ".join(f"{workload} x{value:g}" for workload, value in entry['multipliers'].items()))
+
+    @pyqtSlot(str)
+    def calibrationFailed(self, message):
+        self.calibrate_button.setEnabled(True)
+        self.calibrate_button.setText("Calibrate")
+        self.showError(message)
+
+
+    """
+    Changes the memory limit for each test case
+    self - CPPCheckerApp
+    """
+    def showMemoryLimitMenu(self):
+        self.memory_limit_window = QDialog(self)
+        self.memory_limit_window.setWindowTitle("Memory Limit")
+        self.memory_limit_window.setWindowModality(Qt.ApplicationModal)
+        self.memory_limit_window.resize(300, 100)
+
+        self.memory_limit_layout = QVBoxLayout()
+
+        self.memory_limit_label = QLabel("Memory Limit (MB, 0 for none):", self)
+        self.memory_limit_layout.addWidget(self.memory_limit_label)
+
+        self.memory_limit_entry = QLineEdit(self)
+        self.memory_limit_layout.addWidget(self.memory_limit_entry)
+
+        self.memory_limit_button = QPushButton("Set", self)
+        self.memory_limit_button.clicked.connect(self.setMemoryLimit)
+        self.memory_limit_layout.addWidget(self.memory_limit_button)
+
+        self.memory_limit_window.setLayout(self.memory_limit_layout)
+        self.memory_limit_window.show()
+
+
+    """
+    Sets the memory limit global variable
+    self - CPPCheckerApp
+    """
+    def setMemoryLimit(self):
+        global MEMORY_LIMIT
+        try:
+            float(self.memory_limit_entry.text())
+        except ValueError:
+            self.showError("Error: Please enter a valid number.")
+            return
+
+        MEMORY_LIMIT = float(self.memory_limit_entry.text())
+        self.memory_limit_window.close()
+
+
+    """
+    Changes how outputs are compared with the expected outputs
+    self - CPPCheckerApp
+    """
+    def showCompareModeMenu(self):
+        self.compare_mode_window = QDialog(self)
+        self.compare_mode_window.setWindowTitle("Compare Mode")
+        self.compare_mode_window.setWindowModality(Qt.ApplicationModal)
+        self.compare_mode_window.resize(300, 100)
+
+        self.compare_mode_layout = QVBoxLayout()
+
+        self.compare_mode_label = QLabel("Compare Mode:", self)
+        self.compare_mode_layout.addWidget(self.compare_mode_label)
+
+        self.compare_mode_entry = QComboBox(self)
+        self.compare_mode_entry.addItems(compare.MODES)
+        self.compare_mode_entry.setCurrentText(COMPARE_MODE)
+        self.compare_mode_layout.addWidget(self.compare_mode_entry)
+
+        self.compare_mode_button = QPushButton("Set", self)
+        self.compare_mode_button.clicked.connect(self.setCompareMode)
+        self.compare_mode_layout.addWidget(self.compare_mode_button)
+
+        self.compare_mode_window.setLayout(self.compare_mode_layout)
+        self.compare_mode_window.show()
+
+
+    """
+    Sets the compare mode global variable
+    self - CPPCheckerApp
+    """
+    def setCompareMode(self):
+        global COMPARE_MODE
+        COMPARE_MODE = self.compare_mode_entry.currentText()
+        self.compare_mode_window.close()
+
+
+    """
+    Picks a special judge (testlib-style checker source) used instead of the compare mode
+    self - CPPCheckerApp
+    """
+    def showCheckerMenu(self):
+        self.checker_window = QDialog(self)
+        self.checker_window.setWindowTitle("Checker")
+        self.checker_window.setWindowModality(Qt.ApplicationModal)
+        self.checker_window.resize(400, 100)
+
+        self.checker_layout = QVBoxLayout()
+
+        self.checker_label = QLabel("Checker source (empty for none):", self)
+        self.checker_layout.addWidget(self.checker_label)
+
+        self.checker_entry = QLineEdit(self)
+        self.checker_entry.setText(CHECKER_PATH)
+        self.checker_layout.addWidget(self.checker_entry)
+
+        self.checker_browse_button = QPushButton("Browse", self)
+        self.checker_browse_button.clicked.connect(self.browseChecker)
+        self.checker_layout.addWidget(self.checker_browse_button)
+
+        self.checker_persistent_box = QCheckBox("Persistent checker (one process per worker)", self)
+        self.checker_persistent_box.setChecked(CHECKER_PERSISTENT)
+        self.checker_layout.addWidget(self.checker_persistent_box)
+
+        self.checker_button = QPushButton("Set", self)
+        self.checker_button.clicked.connect(self.setChecker)
+        self.checker_layout.addWidget(self.checker_button)
+
+        self.checker_window.setLayout(self.checker_layout)
+        self.checker_window.show()
+
+    @pyqtSlot()
+    def browseChecker(self):
+        checker_path, _ = QFileDialog.getOpenFileName(self, "Select checker", filter="C++ Files (*.cpp)")
+        if checker_path:
+            self.checker_entry.setText(checker_path)
+
+
+    """
+    Sets the checker global variables
+    self - CPPCheckerApp
+    """
+    def setChecker(self):
+        global CHECKER_PATH, CHECKER_PERSISTENT
+        checker_path = self.checker_entry.text().strip()
+        if checker_path and not os.path.isfile(checker_path):
+            self.showError("Error: Please select an existing checker source.")
+            return
+        if checker_path and WORKERS:
+            self.showError("Error: Checkers only run locally, clear the workers to use a checker.")
+            return
+        if checker_path and INTERACTOR_PATH:
+            self.showError("Error: The interactor decides the verdict, clear it to use a checker.")
+            return
+
+        CHECKER_PATH = checker_path
+        CHECKER_PERSISTENT = self.checker_persistent_box.isChecked()
+        self.checker_window.close()
+
+
+    """
+    Picks the interactor (testlib-style interactor source) of an interactive problem
+    self - CPPCheckerApp
+    """
+    def showInteractorMenu(self):
+        self.interactor_window = QDialog(self)
+        self.interactor_window.setWindowTitle("Interactor")
+        self.interactor_window.setWindowModality(Qt.ApplicationModal)
+        self.interactor_window.resize(400, 100)
+
+        self.interactor_layout = QVBoxLayout()
+
+        self.interactor_label = QLabel("Interactor source (empty for batch problems):", self)
+        self.interactor_layout.addWidget(self.interactor_label)
+
+        self.interactor_entry = QLineEdit(self)
+        self.interactor_entry.setText(INTERACTOR_PATH)
+        self.interactor_entry.setToolTip("Run as: interactor <in> <out> <ok>, talking to the solution over its stdin and stdout.\n"
+                                         "Its exit code is the verdict: 0 accepted, 1 wrong answer, 2 presentation error.")
+        self.interactor_layout.addWidget(self.interactor_entry)
+
+        self.interactor_browse_button = QPushButton("Browse", self)
+        self.interactor_browse_button.clicked.connect(self.browseInteractor)
+        self.interactor_layout.addWidget(self.interactor_browse_button)
+
+        self.interactor_button = QPushButton("Set", self)
+        self.interactor_button.clicked.connect(self.setInteractor)
+        self.interactor_layout.addWidget(self.interactor_button)
+
+        self.interactor_window.setLayout(self.interactor_layout)
+        self.interactor_window.show()
+
+    @pyqtSlot()
+    def browseInteractor(self):
+        interactor_path, _ = QFileDialog.getOpenFileName(self, "Select interactor", filter="C++ Files (*.cpp)")
+        if interactor_path:
+            self.interactor_entry.setText(interactor_path)
+
+
+    """
+    Sets the interactor global variable
+    self - CPPCheckerApp
+    """
+    def setInteractor(self):
+        global INTERACTOR_PATH
+        interactor_path = self.interactor_entry.text().strip()
+        if interactor_path and not os.path.isfile(interactor_path):
+            self.showError("Error: Please select an existing interactor source.")
+            return
+        if interactor_path and WORKERS:
+            self.showError("Error: Interactors only run locally, clear the workers to use an interactor.")
+            return
+        if interactor_path and CHECKER_PATH:
+            self.showError("Error: The interactor decides the verdict, clear the checker to use an interactor.")
+            return
+
+        INTERACTOR_PATH = interactor_path
+        self.interactor_window.close()
+
+
+    """
+    Changes the build profile tests are timed with and the one failing tests are rerun with
+    self - CPPCheckerApp
+    """
+    def showBuildMenu(self):
+        self.build_window = QDialog(self)
+        self.build_window.setWindowTitle("Build Profiles")
+        self.build_window.setWindowModality(Qt.ApplicationModal)
+        self.build_window.resize(300, 100)
+
+        self.build_layout = QVBoxLayout()
+        build_profiles = judge.get_profiles()
+
+        self.build_profile_label = QLabel("Build tests are timed with:", self)
+        self.build_layout.addWidget(self.build_profile_label)
+
+        self.build_profile_entry = QComboBox(self)
+        self.build_profile_entry.addItems(build_profiles)
+        self.build_profile_entry.setCurrentText(BUILD_PROFILE)
+        self.build_layout.addWidget(self.build_profile_entry)
+
+        self.sanitize_profile_label = QLabel("Rerun failing tests with (built alongside):", self)
+        self.build_layout.addWidget(self.sanitize_profile_label)
+
+        self.sanitize_profile_entry = QComboBox(self)
+        self.sanitize_profile_entry.addItems(["none", *build_profiles])
+        self.sanitize_profile_entry.setCurrentText(SANITIZE_PROFILE or "none")
+        self.build_layout.addWidget(self.sanitize_profile_entry)
+
+        self.build_button = QPushButton("Set", self)
+        self.build_button.clicked.connect(self.setBuildProfiles)
+        self.build_layout.addWidget(self.build_button)
+
+        self.build_window.setLayout(self.build_layout)
+        self.build_window.show()
+
+
+    """
+    Sets the build profile global variables
+    self - CPPCheckerApp
+    """
+    def setBuildProfiles(self):
+        global BUILD_PROFILE, SANITIZE_PROFILE
+        BUILD_PROFILE = self.build_profile_entry.currentText()
+        sanitize_profile = self.sanitize_profile_entry.currentText()
+        SANITIZE_PROFILE = "" if sanitize_profile == "none" else sanitize_profile
+        self.build_window.close()
+
+
+    """
+    Changes the remote workers tests are run on (started with `python main.py worker`)
+    self - CPPCheckerApp
+    """
+    def showWorkersMenu(self):
+        self.workers_window = QDialog(self)
+        self.workers_window.setWindowTitle("Workers")
+        self.workers_window.setWindowModality(Qt.ApplicationModal)
+        self.workers_window.resize(400, 100)
+
+        self.workers_layout = QVBoxLayout()
+
+        self.workers_label = QLabel("Workers (host:port separated by spaces, empty to judge locally):", self)
+        self.workers_layout.addWidget(self.workers_label)
+
+        self.workers_entry = QLineEdit(self)
+        self.workers_entry.setText(" ".join(WORKERS))
+        self.workers_layout.addWidget(self.workers_entry)
+
+        self.workers_token_label = QLabel("Token:", self)
+        self.workers_layout.addWidget(self.workers_token_label)
+
+        self.workers_token_entry = QLineEdit(self)
+        self.workers_token_entry.setEchoMode(QLineEdit.Password)
+        self.workers_token_entry.setText(WORKERS_TOKEN)
+        self.workers_layout.addWidget(self.workers_token_entry)
+
+        self.workers_button = QPushButton("Set", self)
+        self.workers_button.clicked.connect(self.setWorkers)
+        self.workers_layout.addWidget(self.workers_button)
+
+        self.workers_window.setLayout(self.workers_layout)
+        self.workers_window.show()
+
+
+    """
+    Sets the workers global variables
+    self - CPPCheckerApp
+    """
+    def setWorkers(self):
+        global WORKERS, WORKERS_TOKEN
+        workers = self.workers_entry.text().split()
+        for worker in workers:
+            port = worker.rpartition(':')[2]
+            if ':' in worker and not port.isdigit():
+                self.showError(f"Error: {worker} is not a valid host:port.")
+                return
+        if workers and CHECKER_PATH:
+            self.showError("Error: Checkers only run locally, clear the checker to use workers.")
+            return
+        if workers and INTERACTOR_PATH:
+            self.showError("Error: Interactors only run locally, clear the interactor to use workers.")
+            return
+
+        WORKERS = workers
+        WORKERS_TOKEN = self.workers_token_entry.text()
+        self.workers_window.close()
+
+
+    """
+    Shows the preferences that youve set
+    self - CPPCheckerApp
+    """
+    def show_view_dialog(self):
+        if self.view_window is None:
+            self.view_window = QDialog(self)
+            self.view_window.setWindowTitle("View")
+            self.view_window.setWindowModality(Qt.ApplicationModal)
+            self.view_window.resize(300, 100)
+
+            self.view_layout = QVBoxLayout()
+
+            self.view_label = QLabel("Preferences:", self)
+            self.view_layout.addWidget(self.view_label)
+
+            self.setRuntime_label = QLabel(self)
+            self.view_layout.addWidget(self.setRuntime_label)
+
+            self.setRuntimeMultiplier_label = QLabel(self)
+            self.view_layout.addWidget(self.setRuntimeMultiplier_label)
+
+            self.setMemoryLimit_label = QLabel(self)
+            self.view_layout.addWidget(self.setMemoryLimit_label)
+
+            self.setCompareMode_label = QLabel(self)
+            self.view_layout.addWidget(self.setCompareMode_label)
+
+            self.setChecker_label = QLabel(self)
+            self.view_layout.addWidget(self.setChecker_label)
+
+            self.setInteractor_label = QLabel(self)
+            self.view_layout.addWidget(self.setInteractor_label)
+
+            self.version_label = QLabel(f"Version: {VERSION}", self)
+            self.view_layout.addWidget(self.version_label)
+
+            self.view_window.setLayout(self.view_layout)
+
+        self.setRuntime_label.setText(f"Runtime: {RUNTIME}s")
+        self.setRuntimeMultiplier_label.setText(f"Runtime Multiplier: {RUNTIME_MULTIPLIER}x")
+        self.setMemoryLimit_label.setText(f"Memory Limit: {MEMORY_LIMIT}MB" if MEMORY_LIMIT else "Memory Limit: none")
+        self.setCompareMode_label.setText(f"Compare Mode: {COMPARE_MODE}")
+        self.setChecker_label.setText(f"Checker: {os.path.basename(CHECKER_PATH) or 'none'}" + (" (persistent)" if CHECKER_PATH and CHECKER_PERSISTENT else ""))
+        self.setInteractor_label.setText(f"Interactor: {os.path.basename(INTERACTOR_PATH) or 'none'}")
+        self.view_window.show()
+    
+    """
+    Shows two past runs side by side, tests that got slower are marked
+    self - CPPCheckerApp
+    """
+    def showCompareRunsDialog(self):
+        runs = judge.get_store().runs(limit=100)
+        if len(runs) < 2:
+            self.showError("Error: At least two runs are needed to compare.")
+            return
+
+        self.compare_runs_window = QDialog(self)
+        self.compare_runs_window.setWindowTitle("Compare Runs")
+        self.compare_runs_window.resize(600, 400)
+
+        self.compare_runs_layout = QVBoxLayout()
+
+        run_picker_layout = QHBoxLayout()
+        self.run_a_entry = QComboBox(self)
+        self.run_b_entry = QComboBox(self)
+        for run in runs:
+            started = time.strftime('%Y-%m-%d %H:%M', time.localtime(run['started']))
+            label = f"#{run['id']} {started} {run['passed'] or 0}/{run['tests']} {os.path.basename(run['tests_path'])}"
+            self.run_a_entry.addItem(label, run['id'])
+            self.run_b_entry.addItem(label, run['id'])
+        self.run_a_entry.setCurrentIndex(1)
+        run_picker_layout.addWidget(self.run_a_entry)
+        run_picker_layout.addWidget(self.run_b_entry)
+        self.compare_runs_layout.addLayout(run_picker_layout)
+
+        self.compare_runs_table = QTableWidget(0, 6)
+        self.compare_runs_table.setHorizontalHeaderLabels(["Test No.", "Result A", "Time A", "Result B", "Time B", "Change"])
+        self.compare_runs_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        self.compare_runs_table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.compare_runs_layout.addWidget(self.compare_runs_table)
+
+        self.run_a_entry.currentIndexChanged.connect(self.updateCompareRuns)
+        self.run_b_entry.currentIndexChanged.connect(self.updateCompareRuns)
+        self.updateCompareRuns()
+
+        self.compare_runs_window.setLayout(self.compare_runs_layout)
+        self.compare_runs_window.show()
+
+    def updateCompareRuns(self):
+        rows = judge.get_store().compare_runs(self.run_a_entry.currentData(), self.run_b_entry.currentData())
+        self.compare_runs_table.setRowCount(len(rows))
+        for i, row in enumerate(rows):
+            change = '' if row['change'] is None else f"{row['change']:+.1f}%"
+            values = [row['test'], row['verdict_a'] or '-', judge.format_seconds(row['time_a']),
+                      row['verdict_b'] or '-', judge.format_seconds(row['time_b']), change]
+            for column, value in enumerate(values):
+                self.compare_runs_table.setItem(i, column, QTableWidgetItem(value))
+            slower = row['change'] is not None and row['change'] > judge.REGRESSION_THRESHOLD \
+                and row['time_b'] - row['time_a'] > NOISE_FLOOR
+            if slower or row['verdict_a'] != row['verdict_b']:
+                for column in range(len(values)):
+                    self.compare_runs_table.item(i, column).setBackground(QColor(255, 160, 0))
+
+    """
+    Shows where the last mass check spent its time, per run phase and per test
+    self - CPPCheckerApp
+    """
+    def showTimingsDialog(self, test_number=None):
+        test_results = self.result_model.results()
+        if not test_results:
+            self.showError("Error: Run a mass check first.")
+            return
+
+        self.timings_window = QDialog(self)
+        self.timings_window.setWindowTitle("Timings")
+        self.timings_window.resize(500, 400)
+
+        self.timings_layout = QVBoxLayout()
+
+        self.timings_tree = QTreeWidget(self)
+        self.timings_tree.setHeaderLabels(["Phase", "Time", "Share"])
+        self.timings_tree.header().setSectionResizeMode(QHeaderView.Stretch)
+
+        self.addTimingsItem("Run", self.run_phases).setExpanded(True)
+        self.addTimingsItem(f"All tests ({len(test_results)})", timings.totals(test_results)).setExpanded(True)
+        for test_result in sorted(test_results, key=lambda r: judge.natural_key(r['Test No.'])):
+            item = self.addTimingsItem(f"Test {test_result['Test No.']} ({test_result['Verdict']})", test_result.get('Phases') or {})
+            if test_result['Test No.'] == test_number:
+                item.setExpanded(True)
+                self.timings_tree.setCurrentItem(item)
+                self.timings_tree.scrollToItem(item)
+        self.timings_layout.addWidget(self.timings_tree)
+
+        export_button = QPushButton("Export", self)
+        export_button.clicked.connect(self.exportTimings)
+        self.timings_layout.addWidget(export_button)
+
+        self.timings_window.setLayout(self.timings_layout)
+        self.timings_window.show()
+
+    def addTimingsItem(self, name, phases):
+        total = sum(phases.values())
+        item = QTreeWidgetItem(self.timings_tree, [name, f"{total * 1000:.2f}ms", ""])
+        for phase, seconds in phases.items():
+            share = f"{seconds / total * 100:.1f}%" if total else ""
+            QTreeWidgetItem(item, [phase, f"{seconds * 1000:.2f}ms", share])
+        return item
+
+    @pyqtSlot(QModelIndex)
+    def showTestTimings(self, index):
+        self.showTimingsDialog(self.result_model.testNumber(index.row()))
+
+    @pyqtSlot()
+    def exportTimings(self):
+        test_results = self.result_model.results()
+        if not test_results:
+            self.showError("Error: Run a mass check first.")
+            return
+        path, selected = QFileDialog.getSaveFileName(self, "Export Timings", "timings.json",
+                                                     "JSON (*.json);;Chrome Trace (*.json)")
+        if not path:
+            return
+        try:
+            timings.export(path, test_results, self.run_phases, 'chrome' if selected.startswith("Chrome") else 'json')
+        except OSError as e:
+            self.showError(f"Error: Could not export the timings: {e}")
+
+    @pyqtSlot()
+    def browseMingw(self):
+        mingw_path = QFileDialog.getExistingDirectory(self, "Select MinGW Folder")
+        if not mingw_path:
+            self.showError("Error: Please select a MinGW folder.")
+            return
+        self.mingw_entry.setText(mingw_path)
+
+    @pyqtSlot()
+    def autoFindMingw(self):
+        possible_paths = [
+            'C:/Program Files/CodeBlocks/MinGW/bin',
+            'C:/Program Files/CodeBlocks/MinGW64/bin',
+            'C:/Program Files (x86)/CodeBlocks/MinGW/bin',
+            'C:/Program Files (x86)/CodeBlocks/MinGW64/bin',
+            'C:/Program Files (x86)/Dev-Cpp/MinGW64/bin',
+            'C:/Program Files (x86)/Dev-Cpp/MinGW32/bin',
+            'C:/Program Files (x86)/Dev-Cpp/MinGW/bin',
+            'C:/Program Files (x86)/Dev-Cpp/MinGW64/bin',
+            ]
+        for path in possible_paths:
+            if os.path.exists(path):
+                self.mingw_entry.setText(path)
+                break
+            else:
+                self.showError("Could not auto-find MinGW. Please select the path manually.")
+                return
+
+
+    @pyqtSlot()
+    def browseCPP(self):
+        cpp_code, _ = QFileDialog.getOpenFileName(self, "Select CPP file", filter="C++ Files (*.cpp)")
+        if not cpp_code:
+            self.showError("Error: Please select a CPP file.")
+            return
+        with open(cpp_code, 'r') as f:
+            self.code_text.loadText(f.read())
+        self.source_path = cpp_code
+        self.restartWatch()
+
+    def showError(self, message):
+        QMessageBox.critical(self, "Error", message)
+
+    def showResult(self, result, time_taken):
+        QMessageBox.information(self, "Result", f'Test {result}! Time Taken: {time_taken}')
+
+    @pyqtSlot()
+    def removeIO(self):
+        cpp_code = self.code_text.toPlainText()
+        lines = cpp_code.split('\n')
+        read_line = ""
+        output_line = ""
+        read_variable = ""
+        output_variable = ""
+
+        for line in lines:
+            if "ifstream" in line:
+                read_line = line
+                read_variable = line.split(' ')[1].split('(')[0]
+            if "ofstream" in line:
+                output_line = line
+                output_variable = line.split(' ')[1].split('(')[0]
+            
+        if read_line == "" or output_line == "":
+            self.showError("Error: Could not find input/output lines. \nDoes your code use ifstream/ofstream?")
+            return
+        
+        # edit the lines in place so only the blocks that change are highlighted again
+        document = self.code_text.document()
+        cursor = QTextCursor(document)
+        cursor.beginEditBlock()
+        block = document.begin()
+        while block.isValid():
+            if block.text() in (read_line, output_line):
+                cursor.setPosition(block.position())
+                cursor.movePosition(QTextCursor.EndOfBlock, QTextCursor.KeepAnchor)
+                cursor.removeSelectedText()
+            block = block.next()
+        cursor.movePosition(QTextCursor.Start)
+        cursor.insertText(f'#define {read_variable} cin\n#define {output_variable} cout\n')
+        cursor.endEditBlock()
+
+
+def create_window(argv=None):
+    """
+    Creates the application and shows the window, returns both
+    """
+    qdarktheme.enable_hi_dpi()
+    app = QApplication(sys.argv if argv is None else argv)
+    qdarktheme.setup_theme()
+    return app, CPPCheckerApp()
+
+
+def main(argv=None):
+    app, window = create_window(argv)
+    return app.exec_()
@@ -0,0 +1,33 @@
+"""
+Test ordering. The last verdict and time of every test come from the results
+store, so the next run can start with the tests most likely to fail and the
+slowest ones.
+"""
+import re
+
+
+ORDERS = ('history', 'name')
+
+
+def natural_key(test_number):
+    """
+    Sort key that orders test names numerically where they contain numbers ("2" before "10")
+    """
+    return [int(part) if part.isdigit() else part for part in re.split(r'(\d+)', test_number)]
+
+
+def order_tests(test_numbers, last_results):
+    """
+    Returns test_numbers with the tests that failed last time first, then tests
+    never run before, then the rest. Within each group the slowest run first,
+    which also shortens the run when tests have very different lengths.
+    last_results maps a test to its last (verdict, cpu time).
+    """
+    def key(test_number):
+        last = last_results.get(test_number)
+        if last is None:
+            return (1, 0.0, natural_key(test_number))
+        verdict, elapsed = last
+        group = 2 if verdict == 'OK' else 0
+        return (group, -(elapsed or 0.0), natural_key(test_number))
+    return sorted(test_numbers, key=key)
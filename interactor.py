@@ -0,0 +1,45 @@
+"""
+Interactive problems: the solution talks to an interactor instead of reading a fixed input.
+
+An interactor follows the testlib convention: it is run as
+
+    interactor <input> <output> <answer>
+
+with its stdin connected to the solution's stdout and its stdout to the
+solution's stdin. It reads the test from <input> (and <answer>, the .ok file,
+if it needs one), plays the other side of the dialogue and exits with the
+verdict: 0 accepted, 1 wrong answer, 2 presentation error, anything else an
+interactor failure. What it writes to <output> is ignored, what it prints to
+stderr is kept as the message.
+
+The two processes are connected by two pipes created by Judgee and handed to
+them as stdin and stdout, so queries and answers go from one process to the
+other through the kernel without passing through Python: a round trip costs
+two pipe writes, and tens of thousands of them per test take a fraction of a
+second. Tests run on the same worker pool as batch tests, one solution and
+one interactor per worker.
+
+Only the solution is timed and limited. The interactor runs without the
+memory and CPU limits and gets INTERACTOR_TIMEOUT seconds after the solution
+exits to give its verdict. A solution that runs out of time or memory, or
+crashes, gets TLE, MLE or RE whatever the interactor says. Only a solution
+killed by a broken pipe (SIGPIPE) gets the interactor's verdict, since a
+solution told it was wrong often dies writing to the closed pipe. An
+interactor killed by a broken pipe was still talking to a solution that had
+exited, which is a wrong answer.
+"""
+INTERACTOR_TIMEOUT = 10
+
+
+class Interactor:
+    def __init__(self, exe_path, timeout=INTERACTOR_TIMEOUT):
+        '''
+        Parameters
+        ----------
+        exe_path : str
+            compiled interactor
+        timeout : float
+            seconds the interactor may run on after the solution exits
+        '''
+        self.exe_path = exe_path
+        self.timeout = timeout
@@ -0,0 +1,1412 @@
+"""
+Headless judging engine for Judgee.
+
+Compiles a C++ source, runs it against a folder of .in/.ok tests and
+collects one result dict per test. Nothing in here touches Qt, so it can be
+used from the GUI, from the command line or from scripts:
+
+    python main.py judge solution.cpp tests/ --jobs 8 --json
+"""
+import argparse
+import concurrent.futures
+import contextlib
+import functools
+import hashlib
+import heapq
+import itertools
+import json
+import os
+import shutil
+import signal
+import sqlite3
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import resource
+except ImportError: # Windows
+    resource = None
+
+import compare
+import launcher
+import profiles
+import timings
+from checker import VERDICTS, Checker, CheckerError, output_path
+from compile_cache import CompileCache
+from pch import PchManager, uses_pch
+from history import ORDERS, natural_key, order_tests
+from interactor import Interactor
+from scheduler import CpuScheduler
+from staging import STAGING_BUDGET, InputStager, StagedInput
+from store import REGRESSION_THRESHOLD, ResultStore
+from testsource import anonymous_file, is_archive, open_answer, open_input, open_tests
+from timings import PhaseTimer, timed
+
+
+RUNTIME = 2.0 # 2s by default
+RUNTIME_MULTIPLIER = 1.0 # 1x by default
+MEMORY_LIMIT = 256 * 2**20 # 256MB by default
+COMPARE_MODE = 'tokens'
+
+COMPILE_TIMEOUT = 10
+
+JUDGEE_HOME = os.environ.get('JUDGEE_HOME', os.path.join(os.path.expanduser('~'), '.judgee'))
+
+# ru_maxrss is in kilobytes on Linux and in bytes on macOS
+MAXRSS_UNIT = 1 if sys.platform == 'darwin' else 1024
+
+# returncode of a process killed for writing to a pipe whose other end has exited
+BROKEN_PIPE = -signal.SIGPIPE if hasattr(signal, 'SIGPIPE') else None
+
+_cache = None
+_pch = None
+_launcher = None
+_launcher_lock = threading.Lock()
+
+
+class CompileError(Exception):
+    pass
+
+
+def find_compiler(mingw_path=None):
+    """
+    Returns the g++ executable inside mingw_path, or the one on PATH
+    when no folder is given. Returns None if nothing is found.
+    """
+    if mingw_path:
+        for name in ('g++.exe', 'g++'):
+            candidate = os.path.join(mingw_path, name)
+            if os.path.isfile(candidate):
+                return candidate
+        return None
+    return shutil.which('g++')
+
+
+def get_cache():
+    """
+    Returns the shared on-disk compile cache under JUDGEE_HOME
+    """
+    global _cache
+    if _cache is None:
+        _cache = CompileCache(os.path.join(JUDGEE_HOME, 'cache'))
+    return _cache
+
+
+def get_pch():
+    """
+    Returns the shared precompiled header manager under JUDGEE_HOME
+    """
+    global _pch
+    if _pch is None:
+        _pch = PchManager(os.path.join(JUDGEE_HOME, 'pch'))
+    return _pch
+
+
+def get_launcher(compiler=None):
+    """
+    Returns the path of the launcher that starts limited test processes (see launcher.py),
+    built through the compile cache the first time, or None where it can't be used
+    """
+    global _launcher
+    with _launcher_lock:
+        if _launcher is None:
+            _launcher = False
+            compiler = compiler or find_compiler()
+            if os.name != 'nt' and hasattr(os, 'wait4') and compiler:
+                try:
+                    _launcher = compile_source(launcher.SOURCE, compiler, flags=('-O2',), pch=False)
+                except CompileError:
+                    pass
+        return _launcher or None
+
+
+def get_profiles():
+    """
+    Returns the build profiles, {name: flags}, with the ones set in JUDGEE_HOME/profiles.json
+    """
+    return profiles.load(os.path.join(JUDGEE_HOME, 'profiles.json'))
+
+
+def _build(source_path, compiler, exe_path, flags, timeout):
+    try:
+        subprocess.run([compiler, *flags, '-o', exe_path, source_path], timeout=timeout, check=True,
+                       stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True)
+    except subprocess.CalledProcessError as e:
+        raise CompileError(e.stdout or "Compilation failed.")
+    except subprocess.TimeoutExpired:
+        raise CompileError(f"Compilation timed out after {timeout}s.")
+    except OSError as e:
+        raise CompileError(str(e))
+
+
+def build_flags(cpp_code, compiler, flags=(), pch=True):
+    """
+    Returns the flags to build cpp_code with, adding the precompiled header
+    include folder when the source can use it
+    """
+    flags = tuple(flags)
+    if pch and uses_pch(cpp_code):
+        include_dir = get_pch().include_dir(compiler, flags)
+        if include_dir is not None:
+            return ('-I', include_dir) + flags
+    return flags
+
+
+def compile_source(cpp_code, compiler, exe_path='temp.exe', timeout=COMPILE_TIMEOUT, flags=(), cache=True, pch=True):
+    """
+    Builds cpp_code and returns the path of the binary.
+    With cache=True (or a CompileCache) an identical earlier build is reused and
+    the binary lives in the cache; with cache=False it is written to exe_path.
+    With pch=True sources starting with <bits/stdc++.h> use a precompiled header.
+    Raises CompileError with the compiler output on failure.
+    """
+    flags = tuple(flags)
+    if cache is True:
+        cache = get_cache()
+
+    if not cache:
+        # Save the CPP code to a temporary file
+        with open('temp.cpp', 'w') as f:
+            f.write(cpp_code)
+        _build('temp.cpp', compiler, exe_path, build_flags(cpp_code, compiler, flags, pch), timeout)
+        return os.path.abspath(exe_path)
+
+    key = cache.key(cpp_code, compiler, flags)
+    cached_path = cache.lookup(key)
+    if cached_path is not None:
+        return cached_path
+
+    temp_path = cache.temp_path(key)
+    source_path = temp_path + '.cpp'
+    with open(source_path, 'w') as f:
+        f.write(cpp_code)
+    try:
+        _build(source_path, compiler, temp_path, build_flags(cpp_code, compiler, flags, pch), timeout)
+        return cache.store(key, temp_path)
+    finally:
+        for path in (source_path, temp_path):
+            if os.path.exists(path):
+                os.remove(path)
+
+
+def compile_profiles(cpp_code, compiler, names, cache=True, pch=True):
+    """
+    Builds cpp_code with every profile in names at once, each in a thread of its own.
+    Returns ({name: binary path}, {name: CompileError}) for the builds that worked and those that failed.
+    """
+    flags = get_profiles()
+    unknown = [name for name in names if name not in flags]
+    if unknown:
+        raise ValueError(f"unknown build profile {unknown[0]!r}, expected one of {', '.join(flags)}")
+    # g++ runs in a process of its own, so threads are enough to build in parallel.
+    # Uncached builds all write temp.cpp, so they go one after the other.
+    workers = max(len(names), 1) if cache else 1
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='judgee-build') as executor:
+        futures = {name: executor.submit(compile_source, cpp_code, compiler, exe_path=f'temp-{name}.exe',
+                                         flags=flags[name], cache=cache, pch=pch)
+                   for name in names}
+    built, failed = {}, {}
+    for name, future in futures.items():
+        try:
+            built[name] = future.result()
+        except CompileError as e:
+            failed[name] = e
+    return built, failed
+
+
+def compile_checker(source_path, compiler, persistent=False):
+    """
+    Compiles a checker source through the compile cache and returns a Checker for it.
+    The folder of the source is on the include path so a local testlib.h is found.
+    """
+    with open(source_path, 'r') as f:
+        cpp_code = f.read()
+    exe_path = compile_source(cpp_code, compiler, flags=('-I', os.path.dirname(os.path.abspath(source_path))))
+    return Checker(exe_path, persistent)
+
+
+def compile_interactor(source_path, compiler):
+    """
+    Compiles an interactor source with -O2 through the compile cache, like compile_checker,
+    and returns an Interactor for it
+    """
+    with open(source_path, 'r') as f:
+        cpp_code = f.read()
+    exe_path = compile_source(cpp_code, compiler, flags=('-O2', '-I', os.path.dirname(os.path.abspath(source_path))))
+    return Interactor(exe_path)
+
+
+def list_tests(folder_path):
+    """
+    Returns the test numbers (file names without extension) of every .in file in
+    folder_path, a folder or an archive, or None for archives that can only be streamed
+    """
+    with open_tests(folder_path) as source:
+        return source.names()
+
+
+def get_store():
+    """
+    Returns the SQLite store of past runs under JUDGEE_HOME
+    """
+    return ResultStore(os.path.join(JUDGEE_HOME, 'results.db'))
+
+
+def source_hash(cpp_code):
+    return hashlib.sha256(cpp_code.encode('utf-8', 'surrogateescape')).hexdigest()
+
+
+VERDICT_RESULTS = {
+    'OK': 'Passed',
+    'MLE': 'Memory Limit Exceeded',
+    'Cancelled': 'Cancelled',
+}
+
+
+def format_memory(memory):
+    return '-' if memory is None else f'{memory / 2**20:.1f}MB'
+
+
+def make_result(test_number, verdict, time_taken, elapsed=None, memory=None, **extra):
+    """
+    Builds the result dict of one test. verdict is a short code (OK, WA, TLE, MLE, RE, ...),
+    'Result' is what the table shows for it.
+    """
+    result = {'Test No.': test_number, 'Result': VERDICT_RESULTS.get(verdict, 'Failed'), 'Verdict': verdict,
+              'Time Taken': time_taken, 'Elapsed': elapsed, 'Memory': memory, 'Memory Used': format_memory(memory)}
+    result.update(extra)
+    return result
+
+
+class Watchdog:
+    """
+    Kills processes that run past their deadline. A single thread serves every
+    running test, so a test doesn't pay for starting a timer thread of its own.
+    """
+    def __init__(self):
+        self.condition = threading.Condition()
+        self.deadlines = [] # heap of (deadline, token)
+        self.watched = {}
+        self.tokens = itertools.count()
+        self.thread = None
+
+    def watch(self, process, timeout):
+        token = next(self.tokens)
+        with self.condition:
+            self.watched[token] = process
+            heapq.heappush(self.deadlines, (time.monotonic() + timeout, token))
+            if self.thread is None:
+                self.thread = threading.Thread(target=self.run, name='judgee-watchdog', daemon=True)
+                self.thread.start()
+            self.condition.notify()
+        return token
+
+    def unwatch(self, token):
+        with self.condition:
+            self.watched.pop(token, None)
+
+    def run(self):
+        with self.condition:
+            while True:
+                # drop deadlines of processes that already finished
+                while self.deadlines and self.deadlines[0][1] not in self.watched:
+                    heapq.heappop(self.deadlines)
+                if not self.deadlines:
+                    self.condition.wait()
+                    continue
+                deadline, token = self.deadlines[0]
+                now = time.monotonic()
+                if deadline > now:
+                    self.condition.wait(deadline - now)
+                    continue
+                heapq.heappop(self.deadlines)
+                kill_process(self.watched.pop(token))
+
+
+def kill_process(process):
+    """
+    Kills process together with any children it started
+    """
+    if process.poll() is not None:
+        return
+    try:
+        if os.name == 'nt':
+            subprocess.run(['taskkill', '/F', '/T', '/PID', str(process.pid)],
+                           stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        else:
+            os.killpg(process.pid, signal.SIGKILL)
+    except OSError:
+        process.kill()
+
+
+watchdog = Watchdog()
+
+
+class Judge:
+    def __init__(self, exe_path, runtime=RUNTIME, multiplier=RUNTIME_MULTIPLIER, jobs=None, scheduler=None,
+                 memory_limit=MEMORY_LIMIT, compare_mode=COMPARE_MODE, epsilon=compare.EPSILON, checker=None,
+                 source_hash=None, record=True, compile_time=None, workers=None, token=None, sanitized=False,
+                 staging_budget=STAGING_BUDGET, interactor=None):
+        '''
+        Parameters
+        ----------
+        exe_path : str
+            compiled solution to run
+        runtime : float
+            time limit per test in seconds
+        multiplier : float
+            factor applied to measured times before comparing with runtime
+        jobs : int
+            number of tests run in parallel, defaults to one per CPU
+        scheduler : CpuScheduler
+            sizes the pool and pins workers, overrides jobs
+        memory_limit : int
+            address space limit per test in bytes, None for no limit
+        compare_mode : str
+            how outputs are compared, one of compare.MODES
+        epsilon : float
+            allowed absolute or relative error in 'float' mode
+        checker : Checker
+            special judge deciding the verdict instead of compare_mode
+        source_hash : str
+            hash of the judged source, stored with the run
+        record : bool
+            save every run_all in the results store
+        compile_time : float
+            seconds spent compiling exe_path, reported as the compile phase of every run
+        workers : list of str
+            'host:port' of remote workers to run the tests on instead of the local pool,
+            see distributed.py
+        token : str
+            shared secret the workers were started with
+        sanitized : bool
+            exe_path was built with sanitizers (see profiles.py): the address space isn't
+            limited, since ASan reserves terabytes of it, and the sanitizer report a test
+            prints is added to its result as 'Sanitizer'
+        staging_budget : int
+            bytes of test inputs read into memory ahead of the local workers (see staging.py),
+            0 to open every input as its test starts
+        interactor : Interactor
+            interactor of an interactive problem, the solution talks to it instead of
+            reading the input, and it decides the verdict (see interactor.py)
+        '''
+        if workers and checker is not None:
+            raise ValueError('checkers only run locally, they cannot be used with remote workers')
+        if workers and interactor is not None:
+            raise ValueError('interactors only run locally, they cannot be used with remote workers')
+        if checker is not None and interactor is not None:
+            raise ValueError('the interactor decides the verdict of interactive problems, a checker cannot be used with it')
+        self.exe_path = exe_path
+        self.runtime = runtime
+        self.multiplier = multiplier
+        self.scheduler = scheduler or CpuScheduler(jobs)
+        self.jobs = self.scheduler.workers
+        self.memory_limit = memory_limit
+        self.compare_mode = compare_mode
+        self.epsilon = epsilon
+        self.checker = checker
+        self.source_hash = source_hash
+        self.record = record
+        self.compile_time = compile_time
+        self.workers = workers
+        self.token = token
+        self.sanitized = sanitized
+        self.env = dict(os.environ, **profiles.SANITIZER_ENV) if sanitized else None
+        self.staging_budget = staging_budget
+        self.interactor = interactor
+        self.launcher = get_launcher()
+        self.remote = None
+        self.run_id = None
+        self.run_start = None
+        self.run_phases = {}
+        self.cancelled = threading.Event()
+        self.processes = set()
+        self.processes_lock = threading.Lock()
+
+    def cancel(self):
+        """
+        Stops the current run: tests that haven't started are skipped and
+        running ones are killed straight away. Safe to call from any thread.
+        """
+        self.cancelled.set()
+        with self.processes_lock:
+            processes = list(self.processes)
+        for process in processes:
+            kill_process(process)
+        remote = self.remote
+        if remote is not None:
+            remote.cancel()
+
+    def spawn(self, args, stdin, stdout, stderr, limited=True, timeout=None):
+        """
+        Starts args in its own process group, under the memory and CPU limits
+        unless limited is False, and tracks it so cancel can kill it.
+        Limited processes go through the launcher when there is one, which also
+        kills them after timeout seconds of wall time.
+        """
+        if os.name == 'nt':
+            process = subprocess.Popen(args, stdin=stdin, stdout=stdout, stderr=stderr, env=self.env,
+                                       creationflags=subprocess.CREATE_NEW_PROCESS_GROUP)
+        elif limited and self.launcher:
+            report, report_write = os.pipe()
+            try:
+                memory_limit = self.memory_limit if not self.sanitized else None
+                command = launcher.command(self.launcher, args, memory_limit, self.cpu_limit(), timeout or 0, report_write)
+                process = subprocess.Popen(command, stdin=stdin, stdout=stdout, stderr=stderr, env=self.env,
+                                           start_new_session=True, pass_fds=(report_write,))
+            except BaseException:
+                os.close(report)
+                raise
+            finally:
+                os.close(report_write)
+            process.report = report
+            process.program = args[0]
+        else:
+            process = subprocess.Popen(args, stdin=stdin, stdout=stdout, stderr=stderr, env=self.env,
+                                       start_new_session=True, preexec_fn=self.limit_child if limited else None)
+        with self.processes_lock:
+            self.processes.add(process)
+        if self.cancelled.is_set():
+            kill_process(process)
+        return process
+
+    def cpu_limit(self):
+        return int(self.runtime / self.multiplier) + 2
+
+    def limit_child(self):
+        # runs in the child between fork and exec, when there is no launcher
+        if self.memory_limit and not self.sanitized:
+            resource.setrlimit(resource.RLIMIT_AS, (self.memory_limit, self.memory_limit))
+        cpu_limit = self.cpu_limit()
+        resource.setrlimit(resource.RLIMIT_CPU, (cpu_limit, cpu_limit))
+
+    def wait(self, process, timeout):
+        """
+        Waits for process and returns a dict with its returncode, cpu time, peak memory
+        in bytes, wall time and whether it timed out. The process is killed if it is
+        still running after timeout seconds of wall time.
+        Without wait4 (Windows) the CPU time is the wall time and memory is unknown.
+        For a process started through the launcher the figures are the ones it
+        reports for the program; if it was killed before reporting (cancelled,
+        or stuck past timeout) they are the wall time and unknown as well.
+        """
+        start_time = time.perf_counter()
+        try:
+            if not hasattr(os, 'wait4'):
+                timed_out = False
+                try:
+                    process.wait(timeout=timeout)
+                except subprocess.TimeoutExpired:
+                    kill_process(process)
+                    process.wait()
+                    timed_out = True
+                wall_time = time.perf_counter() - start_time
+                return {'returncode': process.returncode, 'cpu_time': wall_time, 'memory': None,
+                        'wall_time': wall_time, 'timed_out': timed_out}
+
+            report = getattr(process, 'report', None)
+            token = watchdog.watch(process, timeout + launcher.LAUNCHER_GRACE if report is not None else timeout)
+            try:
+                _, status, usage = os.wait4(process.pid, 0)
+            finally:
+                watchdog.unwatch(token)
+            wall_time = time.perf_counter() - start_time
+            if report is None:
+                process.returncode = os.waitstatus_to_exitcode(status)
+                return {'returncode': process.returncode, 'cpu_time': usage.ru_utime + usage.ru_stime,
+                        'memory': usage.ru_maxrss * MAXRSS_UNIT, 'wall_time': wall_time, 'timed_out': wall_time >= timeout}
+
+            reported = launcher.read_report(report, process.program)
+            if reported is None:
+                process.returncode = os.waitstatus_to_exitcode(status)
+                return {'returncode': process.returncode, 'cpu_time': wall_time, 'memory': None,
+                        'wall_time': wall_time, 'timed_out': wall_time >= timeout}
+            status, cpu_time, maxrss, killed = reported
+            process.returncode = os.waitstatus_to_exitcode(status)
+            return {'returncode': process.returncode, 'cpu_time': cpu_time, 'memory': maxrss * MAXRSS_UNIT,
+                    'wall_time': wall_time, 'timed_out': killed or wall_time >= timeout}
+        finally:
+            report = getattr(process, 'report', None)
+            if report is not None:
+                os.close(report)
+                process.report = None
+            with self.processes_lock:
+                self.processes.discard(process)
+
+    def run_test(self, in_file, out_file, test_number=None):
+        timer = PhaseTimer()
+        if test_number is None:
+            test_number = os.path.basename(str(in_file)).split('.')[0]
+        if self.cancelled.is_set():
+            return make_result(test_number, 'Cancelled', '-')
+        if isinstance(in_file, StagedInput):
+            timer.phases['stage'] = in_file.stage_time
+
+        if self.interactor is not None:
+            return self.run_interactive(in_file, out_file, test_number, timer)
+
+        # Run the compiled executable with the input file, output goes to an anonymous in-memory file
+        try:
+            with open_input(in_file) as stdin, anonymous_file('judgee-out') as stdout, anonymous_file('judgee-err') as stderr:
+                timer.mark('setup')
+                timeout = self.runtime / self.multiplier + 0.5
+                process = self.spawn([self.exe_path], stdin, stdout, stderr, timeout=timeout)
+                timer.mark('spawn')
+                usage = self.wait(process, timeout)
+                timer.mark('execute')
+                if self.cancelled.is_set():
+                    return make_result(test_number, 'Cancelled', '-')
+                verdict, time_taken, message = self.verdict(usage, in_file, out_file, stdin, stdout, stderr, timer)
+                if self.sanitized:
+                    stderr.seek(0)
+                    report = profiles.sanitizer_report(stderr.read())
+            timer.mark('cleanup')
+        except Exception as e:
+            return make_result(test_number, 'ERR', 'Unknown Error: ' + str(e), Phases=timer.phases)
+
+        extra = {'Message': message} if message else {}
+        if self.sanitized and report:
+            extra['Sanitizer'] = report
+        return make_result(test_number, verdict, time_taken, usage['cpu_time'] * self.multiplier, usage['memory'],
+                           Overhead=timer.total() - usage['wall_time'], Phases=timer.phases,
+                           Started=timer.start - self.run_start if self.run_start is not None else None,
+                           Worker=threading.current_thread().name, **extra)
+
+    def run_interactive(self, in_file, out_file, test_number, timer):
+        """
+        Runs the solution with its stdin and stdout connected to the interactor by two
+        pipes, see interactor.py
+        """
+        try:
+            with contextlib.ExitStack() as stack:
+                # the interactor opens the files by path, archive members and staged inputs get one through /proc
+                in_path = in_file if isinstance(in_file, str) else self.file_path(stack.enter_context(open_input(in_file)), stack)
+                ok_path = out_file if isinstance(out_file, str) else self.file_path(stack.enter_context(open_input(out_file)), stack)
+                interactor_out = stack.enter_context(anonymous_file('judgee-interactor-out'))
+                interactor_errors = stack.enter_context(anonymous_file('judgee-interactor-err'))
+                stderr = stack.enter_context(anonymous_file('judgee-err'))
+                solution_in, interactor_out_pipe = os.pipe()
+                interactor_in, solution_out = os.pipe()
+                timer.mark('setup')
+                try:
+                    interactor = self.spawn([self.interactor.exe_path, in_path, self.file_path(interactor_out, stack), ok_path],
+                                            interactor_in, interactor_out_pipe, interactor_errors, limited=False)
+                    timeout = self.runtime / self.multiplier + 0.5
+                    try:
+                        process = self.spawn([self.exe_path], solution_in, solution_out, stderr, timeout=timeout)
+                    except BaseException:
+                        kill_process(interactor)
+                        self.wait(interactor, self.interactor.timeout)
+                        raise
+                finally:
+                    # only the children hold the pipes now, so either sees EOF once the other exits
+                    for fd in (solution_in, interactor_out_pipe, interactor_in, solution_out):
+                        os.close(fd)
+                timer.mark('spawn')
+                usage = self.wait(process, timeout)
+                timer.mark('execute')
+                interactor_usage = self.wait(interactor, self.interactor.timeout)
+                timer.mark('compare')
+                if self.cancelled.is_set():
+                    return make_result(test_number, 'Cancelled', '-')
+                interactor_errors.seek(0)
+                message = interactor_errors.read().decode('utf-8', 'replace').strip()
+                verdict, time_taken, message = self.interactive_verdict(usage, interactor_usage, message, stderr, timer)
+                if self.sanitized:
+                    stderr.seek(0)
+                    report = profiles.sanitizer_report(stderr.read())
+            timer.mark('cleanup')
+        except Exception as e:
+            return make_result(test_number, 'ERR', 'Unknown Error: ' + str(e), Phases=timer.phases)
+
+        extra = {'Message': message} if message else {}
+        if self.sanitized and report:
+            extra['Sanitizer'] = report
+        return make_result(test_number, verdict, time_taken, usage['cpu_time'] * self.multiplier, usage['memory'],
+                           Overhead=timer.total() - usage['wall_time'], Phases=timer.phases,
+                           Started=timer.start - self.run_start if self.run_start is not None else None,
+                           Worker=threading.current_thread().name, **extra)
+
+    def file_path(self, f, stack):
+        path, cleanup = output_path(f)
+        stack.callback(cleanup)
+        return path
+
+    def interactive_verdict(self, usage, interactor_usage, message, stderr, timer):
+        """
+        Returns (verdict, time taken, message) of an interactive test: the solution's
+        time, memory and crashes first, then the interactor's exit code. A solution
+        killed by a broken pipe was most likely told it was wrong and wrote on, so
+        that isn't a crash that beats the interactor's verdict.
+        """
+        elapsed_time = usage['cpu_time'] * self.multiplier
+        memory = usage['memory']
+        if usage['timed_out']:
+            return 'TLE', 'Timeout: + >0.5s', message
+        if elapsed_time > self.runtime:
+            return 'TLE', f'Timeout: +{elapsed_time - self.runtime:.2f}s', message
+        if self.memory_limit and memory is not None and memory > self.memory_limit:
+            return 'MLE', f'{elapsed_time:.2f}s', message
+        if usage['returncode'] != 0:
+            stderr.seek(0)
+            errors = stderr.read()
+            timer.mark('read')
+            if self.memory_limit and b'bad_alloc' in errors:
+                return 'MLE', f'{elapsed_time:.2f}s', message
+            if usage['returncode'] != BROKEN_PIPE or interactor_usage['returncode'] == 0:
+                return 'RE', 'Returned non-zero exit status', message
+        if interactor_usage['timed_out']:
+            return 'ERR', 'Interactor failed', f'the interactor did not exit within {self.interactor.timeout}s of the solution'
+        if interactor_usage['returncode'] == BROKEN_PIPE:
+            # the solution exited while the interactor still had something to tell it
+            return 'WA', f'{elapsed_time:.2f}s', message or 'the solution exited before the interactor was done'
+        if interactor_usage['returncode'] not in VERDICTS:
+            return 'ERR', 'Interactor failed', message or f"interactor exited with code {interactor_usage['returncode']}"
+        if interactor_usage['returncode'] != 0:
+            return VERDICTS[interactor_usage['returncode']], f'{elapsed_time:.2f}s', message
+        return 'OK', f'{elapsed_time:.2f}s', message
+
+    def verdict(self, usage, in_file, out_file, stdin, stdout, stderr, timer):
+        """
+        Returns (verdict, time taken, message) of a test that finished running
+        """
+        elapsed_time = usage['cpu_time'] * self.multiplier
+        memory = usage['memory']
+        if usage['timed_out']:
+            return 'TLE', 'Timeout: + >0.5s', ''
+        if elapsed_time > self.runtime:
+            return 'TLE', f'Timeout: +{elapsed_time - self.runtime:.2f}s', ''
+        if self.memory_limit and memory is not None and memory > self.memory_limit:
+            return 'MLE', f'{elapsed_time:.2f}s', ''
+        if usage['returncode'] != 0:
+            stderr.seek(0)
+            errors = stderr.read()
+            timer.mark('read')
+            if self.memory_limit and b'bad_alloc' in errors:
+                return 'MLE', f'{elapsed_time:.2f}s', ''
+            return 'RE', 'Returned non-zero exit status', ''
+
+        # Compare the output to the expected output
+        if self.checker is not None:
+            with contextlib.ExitStack() as stack:
+                # the checker opens the files by path, archive members get one through /proc
+                if not isinstance(in_file, str):
+                    in_path, cleanup = output_path(stdin)
+                    stack.callback(cleanup)
+                    in_file = in_path
+                if not isinstance(out_file, str):
+                    answer = stack.enter_context(open_input(out_file))
+                    ok_path, cleanup = output_path(answer)
+                    stack.callback(cleanup)
+                    out_file = ok_path
+                timer.mark('read')
+                try:
+                    verdict, message = self.checker.check(in_file, stdout, out_file)
+                except CheckerError as e:
+                    return 'ERR', 'Checker failed', str(e)
+                finally:
+                    timer.mark('compare')
+            return verdict, f'{elapsed_time:.2f}s', message
+        stdout.seek(0)
+        with open_answer(out_file) as expected:
+            timer.mark('read')
+            passed, message = compare.compare(stdout, expected, self.compare_mode, self.epsilon)
+            timer.mark('compare')
+        return 'OK' if passed else 'WA', f'{elapsed_time:.2f}s', message
+
+    def run_all(self, folder_path, on_result=None, order='history', fail_fast=False, tests=None):
+        """
+        Runs every test in folder_path (only the test numbers in tests, if given)
+        and returns the list of results.
+        on_result, if given, is called with each result as soon as it finishes.
+        With order='history' the tests that failed last time and the slowest ones
+        start first, order='name' runs them by name.
+        With fail_fast the run stops at the first test that doesn't pass.
+        After cancel only the tests that finished are returned.
+        How long each phase of the run took is left in run_phases.
+        """
+        started = time.time()
+        self.run_phases = {} if self.compile_time is None else {'compile': self.compile_time}
+        self.run_start = time.perf_counter()
+        source = open_tests(folder_path)
+        with timed(self.run_phases, 'order'):
+            store = get_store() if self.record or order == 'history' else None
+            # streamed archives only know their tests once read, they run in archive order
+            test_numbers = source.names() if source.random_access else None
+            if tests is not None and test_numbers is not None:
+                test_numbers = [test_number for test_number in test_numbers if test_number in tests]
+            if order == 'history' and test_numbers is not None:
+                test_numbers = order_tests(test_numbers, store.last_results(source.path))
+
+        test_results = []
+        tests_start = time.perf_counter()
+        if self.workers:
+            from distributed import REMOTE_SETTINGS, RemotePool
+            try:
+                settings = self.settings()
+                executor = self.remote = RemotePool(self.workers, self.exe_path, {key: settings[key] for key in REMOTE_SETTINGS},
+                                                    self.token)
+            except BaseException:
+                source.close()
+                raise
+            submit, window = executor.submit, 2 * executor.capacity
+        else:
+            executor = ThreadPoolExecutor(max_workers=self.jobs, thread_name_prefix='judgee-worker',
+                                          initializer=self.scheduler.pin_worker)
+            submit, window = functools.partial(executor.submit, self.run_test), 2 * self.jobs
+
+        stager = None
+        staged_tests = ((test_number, in_file, out_file) for test_number, in_file, out_file in source.tests(test_numbers)
+                        if tests is None or test_number in tests)
+        if self.staging_budget and not self.workers:
+            stager = staged_tests = InputStager(staged_tests, self.staging_budget)
+
+            def run_staged(in_file, out_file, test_number):
+                try:
+                    return self.run_test(in_file, out_file, test_number)
+                finally:
+                    stager.release(in_file)
+
+            def submit(in_file, out_file, test_number):
+                future = executor.submit(run_staged, in_file, out_file, test_number)
+
+                def release_cancelled(future):
+                    # fail fast, cancel and shutdown cancel tests that never started
+                    if future.cancelled():
+                        stager.release(in_file)
+                future.add_done_callback(release_cancelled)
+                return future
+
+        def collect(done):
+            for future in done:
+                result = future.result()
+                if result['Result'] == 'Cancelled':
+                    continue
+                test_results.append(result)
+                if on_result is not None:
+                    on_result(result)
+                if fail_fast and result['Verdict'] != 'OK':
+                    self.cancel()
+
+        try:
+            # the pool starts tests in the order they are submitted. Only a few tests
+            # are queued ahead of the workers, so a streamed archive is read as the
+            # tests run and the first verdicts don't wait for the whole archive.
+            pending = set()
+            for test_number, in_file, out_file in staged_tests:
+                if len(pending) >= window:
+                    done, pending = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+                    collect(done)
+                if self.cancelled.is_set():
+                    if stager is not None:
+                        stager.release(in_file)
+                    break
+                pending.add(submit(in_file, out_file, test_number))
+            while pending and not self.cancelled.is_set():
+                done, pending = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+                collect(done)
+        finally:
+            if stager is not None:
+                stager.close()
+            executor.shutdown(wait=True, cancel_futures=True)
+            source.close()
+            if self.checker is not None:
+                self.checker.close()
+            self.run_phases['tests'] = time.perf_counter() - tests_start
+            if self.record and test_results:
+                with timed(self.run_phases, 'record'):
+                    try:
+                        self.run_id = store.record_run(source.path, test_results, self.source_hash, self.settings(), started,
+                                                       complete=not self.cancelled.is_set())
+                    except sqlite3.Error as e:
+                        sys.stderr.write(f"Could not save the run: {e}\n")
+            self.remote = None
+        return test_results
+
+    def settings(self):
+        return {'runtime': self.runtime, 'multiplier': self.multiplier, 'memory_limit': self.memory_limit,
+                'compare_mode': self.compare_mode, 'epsilon': self.epsilon,
+                'checker': self.checker.exe_path if self.checker else None,
+                'interactor': self.interactor.exe_path if self.interactor else None,
+                'jobs': self.remote.capacity if self.remote else self.jobs, 'pinned': self.scheduler.pin,
+                'workers': self.workers, 'staging_budget': self.staging_budget}
+
+
+def sanitizer_judge(exe_path, runtime=RUNTIME, multiplier=RUNTIME_MULTIPLIER, jobs=None, scheduler=None, interactor=None):
+    """
+    Returns a Judge for exe_path, a sanitizer or debug build, with the time limit
+    stretched for its slowdown and no memory limit
+    """
+    return Judge(exe_path, runtime * profiles.SANITIZER_SLOWDOWN, multiplier, jobs, scheduler,
+                 memory_limit=None, record=False, sanitized=True, interactor=interactor)
+
+
+def sanitize_failures(runner, folder_path, test_results, on_report=None):
+    """
+    Runs the tests of test_results that didn't pass again with runner, a sanitizer_judge,
+    and adds the report the program prints to their result as 'Sanitizer'.
+    on_report, if given, is called with each result that got one.
+    Returns the number of tests with a report.
+    """
+    failed = {r['Test No.']: r for r in test_results if r['Result'] not in ('Passed', 'Cancelled')}
+    if not failed:
+        return 0
+    reports = 0
+    for result in runner.run_all(folder_path, order='name', tests=set(failed)):
+        if result.get('Sanitizer'):
+            failed[result['Test No.']]['Sanitizer'] = result['Sanitizer']
+            reports += 1
+            if on_report is not None:
+                on_report(failed[result['Test No.']])
+    return reports
+
+
+def judge(cpp_code, folder_path, compiler, runtime=RUNTIME, multiplier=RUNTIME_MULTIPLIER, jobs=None, on_result=None,
+          memory_limit=MEMORY_LIMIT, compare_mode=COMPARE_MODE):
+    """
+    Compiles cpp_code and runs it against every test in folder_path.
+    Raises CompileError if the source does not build.
+    """
+    exe_path = compile_source(cpp_code, compiler)
+    return Judge(exe_path, runtime, multiplier, jobs, memory_limit=memory_limit, compare_mode=compare_mode,
+                 source_hash=source_hash(cpp_code)).run_all(folder_path, on_result)
+
+
+def print_results(test_results, as_json=False, file=sys.stdout):
+    test_results = sorted(test_results, key=lambda r: natural_key(r['Test No.']))
+    if as_json:
+        json.dump(test_results, file, indent=2)
+        file.write('\n')
+        return
+    for test_result in test_results:
+        line = f"{test_result['Test No.']:>8}  {test_result['Verdict']:<4}  {test_result['Time Taken']:<30}  {test_result['Memory Used']:<8}  {test_result.get('Message', '')}"
+        file.write(line.rstrip() + '\n')
+        if test_result.get('Sanitizer'):
+            file.write(''.join(f'{"":>10}| {line}\n' for line in test_result['Sanitizer'].splitlines()))
+    passed = sum(1 for r in test_results if r['Result'] == 'Passed')
+    file.write(f'{passed}/{len(test_results)} passed\n')
+    overheads = [r['Overhead'] for r in test_results if r.get('Overhead') is not None]
+    if overheads:
+        file.write(f'Harness overhead: {sum(overheads) / len(overheads) * 1000:.2f}ms per test\n')
+    phases = timings.totals(test_results)
+    if phases:
+        file.write(f'Phases per test: {timings.format_phases(phases, len(test_results))}\n')
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='judgee', description='Headless Judgee commands.')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    judge_parser = commands.add_parser('judge', help='compile a C++ source and judge it against a folder of .in/.ok tests')
+    judge_parser.add_argument('source', help='C++ source file')
+    judge_parser.add_argument('tests', help='folder, .zip or .tar(.gz) archive containing .in and .ok files')
+    judge_parser.add_argument('--mingw', default=None, help='folder containing g++ (defaults to g++ on PATH)')
+    judge_parser.add_argument('--jobs', '-j', type=int, default=None, help='tests run in parallel (defaults to one per CPU)')
+    judge_parser.add_argument('--pin', action='store_true', help='pin every test to a CPU of its own')
+    judge_parser.add_argument('--timing-accurate', action='store_true',
+                              help='one pinned test per physical core, keeping some cores free for the harness')
+    judge_parser.add_argument('--runtime', type=float, default=RUNTIME, help='time limit per test in seconds')
+    judge_parser.add_argument('--multiplier', type=float, default=None,
+                              help='runtime multiplier (defaults to the one `calibrate` found for this machine, else 1)')
+    judge_parser.add_argument('--workload', choices=('integer', 'memory', 'io'), default=None,
+                              help="use the calibrated multiplier of one workload class instead of the overall one")
+    judge_parser.add_argument('--compare', choices=compare.MODES, default=COMPARE_MODE,
+                              help='exact bytes, whitespace-separated tokens, or tokens with a float epsilon')
+    judge_parser.add_argument('--epsilon', type=float, default=compare.EPSILON, help='allowed float error in --compare float')
+    judge_parser.add_argument('--checker', default=None, help='testlib-style checker source: checker <in> <out> <ok>')
+    judge_parser.add_argument('--persistent-checker', action='store_true',
+                              help='keep one checker process per worker and send it a line per test')
+    judge_parser.add_argument('--interactor', default=None,
+                              help='testlib-style interactor source of an interactive problem: interactor <in> <out> <ok>')
+    judge_parser.add_argument('--order', choices=ORDERS, default='history',
+                              help='history: tests that failed last time and the slowest first; name: by test name')
+    judge_parser.add_argument('--fail-fast', action='store_true', help='stop at the first test that does not pass')
+    judge_parser.add_argument('--staging-budget', type=float, default=STAGING_BUDGET / 2**20,
+                              help='MB of test inputs read into memory ahead of the tests, 0 to read them as they run')
+    judge_parser.add_argument('--memory-limit', type=float, default=MEMORY_LIMIT / 2**20, help='memory limit per test in MB, 0 for none')
+    judge_parser.add_argument('--profile', default=profiles.DEFAULT_PROFILE,
+                              help=f'build profile the tests are timed with: {", ".join(profiles.PROFILES)} or one from profiles.json')
+    judge_parser.add_argument('--sanitize', nargs='?', const=profiles.SANITIZE_PROFILE, default=None, metavar='PROFILE',
+                              help='also build with sanitizers (or PROFILE) alongside and rerun failing tests with that build')
+    judge_parser.add_argument('--no-cache', action='store_true', help='always recompile instead of reusing a cached binary')
+    judge_parser.add_argument('--no-pch', action='store_true', help='do not use a precompiled <bits/stdc++.h>')
+    judge_parser.add_argument('--json', action='store_true', help='print results as JSON')
+    judge_parser.add_argument('--watch', action='store_true',
+                              help='keep judging as the source or the tests change, only the changed tests when just tests change')
+    judge_parser.add_argument('--timings', default=None, metavar='FILE', help='write the per-phase timings of the run to FILE')
+    judge_parser.add_argument('--timings-format', choices=timings.FORMATS, default='json',
+                              help='json, or chrome for the trace event format of chrome://tracing and Perfetto')
+    judge_parser.add_argument('--workers', nargs='+', default=None, metavar='HOST:PORT',
+                              help='run the tests on these `worker` processes instead of locally')
+    judge_parser.add_argument('--token', default=os.environ.get('JUDGEE_TOKEN'),
+                              help='shared secret of the workers (defaults to $JUDGEE_TOKEN)')
+
+    runs_parser = commands.add_parser('runs', help='list past runs')
+    runs_parser.add_argument('tests', nargs='?', help='only runs on this test folder')
+    runs_parser.add_argument('--limit', type=int, default=20, help='number of runs shown')
+
+    compare_runs_parser = commands.add_parser('compare-runs', help='show two runs side by side')
+    compare_runs_parser.add_argument('run_a', type=int, help='older run id')
+    compare_runs_parser.add_argument('run_b', type=int, help='newer run id')
+    compare_runs_parser.add_argument('--json', action='store_true', help='print rows as JSON')
+
+    regressions_parser = commands.add_parser('regressions', help='tests slower than in the previous run on the same folder')
+    regressions_parser.add_argument('run', type=int, nargs='?', help='run id (defaults to the latest run)')
+    regressions_parser.add_argument('--against', type=int, default=None, help='compare with this run instead of the previous one')
+    regressions_parser.add_argument('--threshold', type=float, default=REGRESSION_THRESHOLD, help='percent slower to report')
+    regressions_parser.add_argument('--json', action='store_true', help='print rows as JSON')
+
+    bench_parser = commands.add_parser('bench', help="benchmark Judgee's own overhead on synthetic test folders")
+    bench_parser.add_argument('--scenarios', nargs='+', default=['tiny', 'huge-io', 'cpu', 'startup'],
+                              choices=['tiny', 'huge-io', 'cpu', 'startup'])
+    bench_parser.add_argument('--mingw', default=None, help='folder containing g++ (defaults to g++ on PATH)')
+    bench_parser.add_argument('--jobs', '-j', type=int, default=None, help='tests run in parallel (defaults to one per CPU)')
+    bench_parser.add_argument('--pin', action='store_true', help='pin every test to a CPU of its own')
+    bench_parser.add_argument('--timing-accurate', action='store_true', help='one pinned test per physical core')
+    bench_parser.add_argument('--tiny-tests', type=int, default=2000, help='number of tests in the tiny scenario')
+    bench_parser.add_argument('--huge-mb', type=int, default=32, help='size in MB of every huge-io test')
+    bench_parser.add_argument('--cpu-tests', type=int, default=20, help='number of tests in the cpu scenario')
+    bench_parser.add_argument('--work-dir', default=None, help='generate the tests here and keep them (defaults to a temporary folder)')
+    bench_parser.add_argument('--output', '-o', default=None, help='write the JSON report to this file instead of stdout')
+
+    stress_parser = commands.add_parser('stress', help='run a generator, a brute force and a solution on random tests until they disagree')
+    stress_parser.add_argument('generator', help='C++ generator source, run as `generator <seed>`, prints one test')
+    stress_parser.add_argument('brute', help='C++ brute-force reference source')
+    stress_parser.add_argument('source', help='C++ source to check')
+    stress_parser.add_argument('--tests', default='.', help='folder the smallest failing test is saved to as .in/.ok')
+    stress_parser.add_argument('--iterations', '-n', type=int, default=1000, help='maximum number of tests')
+    stress_parser.add_argument('--shrink', type=int, default=200,
+                               help='tests run after the first failure, looking for a smaller failing one')
+    stress_parser.add_argument('--seed', type=int, default=1, help='seed of the first test')
+    stress_parser.add_argument('--timeout', type=float, default=2.0, help='seconds each program may run per test')
+    stress_parser.add_argument('--compare', choices=compare.MODES, default=COMPARE_MODE, help='how the answers are compared')
+    stress_parser.add_argument('--epsilon', type=float, default=compare.EPSILON, help='allowed float error in --compare float')
+    stress_parser.add_argument('--mingw', default=None, help='folder containing g++ (defaults to g++ on PATH)')
+    stress_parser.add_argument('--jobs', '-j', type=int, default=None, help='tests run in parallel (defaults to one per CPU)')
+    stress_parser.add_argument('--pin', action='store_true', help='pin every worker to a CPU of its own')
+
+    calibrate_parser = commands.add_parser('calibrate', help='time reference workloads and set the runtime multiplier of this machine')
+    calibrate_parser.add_argument('--mingw', default=None, help='folder containing g++ (defaults to g++ on PATH)')
+    calibrate_parser.add_argument('--target', default=None, help='baseline to calibrate against (defaults to the only stored one)')
+    calibrate_parser.add_argument('--repeat', type=int, default=5, help='runs per workload, the median counts')
+    calibrate_parser.add_argument('--save-baseline', default=None, metavar='NAME',
+                                  help='store the times of this machine as baseline NAME instead of calibrating')
+    calibrate_parser.add_argument('--set-baseline', nargs='+', default=None, metavar=('NAME', 'WORKLOAD=SECONDS'),
+                                  help='store baseline NAME from times measured elsewhere, e.g. integer=0.42 memory=0.61 io=0.18')
+    calibrate_parser.add_argument('--sources', default=None, metavar='DIR',
+                                  help='write the workload programs and the io input to DIR, to time them on the judge')
+    calibrate_parser.add_argument('--show', action='store_true', help='print the stored baselines and calibrations')
+
+    worker_parser = commands.add_parser('worker', help='run tests for `judge --workers` coordinators on this machine')
+    worker_parser.add_argument('--host', default='127.0.0.1', help='address to listen on, 0.0.0.0 for every interface')
+    worker_parser.add_argument('--port', type=int, default=7878, help='TCP port to listen on')
+    worker_parser.add_argument('--jobs', '-j', type=int, default=None, help='tests run in parallel (defaults to one per CPU)')
+    worker_parser.add_argument('--pin', action='store_true', help='pin every test to a CPU of its own')
+    worker_parser.add_argument('--token', default=os.environ.get('JUDGEE_TOKEN'),
+                               help='only accept coordinators sending this secret (defaults to $JUDGEE_TOKEN)')
+
+    cache_parser = commands.add_parser('cache', help='show or clear the compile cache')
+    cache_parser.add_argument('--clear', action='store_true', help='remove every cached binary')
+
+    pch_parser = commands.add_parser('pch', help='build the precompiled header and compare compile times with and without it')
+    pch_parser.add_argument('source', nargs='?', help='C++ source to time (defaults to a minimal <bits/stdc++.h> program)')
+    pch_parser.add_argument('--mingw', default=None, help='folder containing g++ (defaults to g++ on PATH)')
+    pch_parser.add_argument('--clear', action='store_true', help='remove every precompiled header first')
+    return parser
+
+
+def judge_command(args):
+    compiler = find_compiler(args.mingw)
+    if compiler is None:
+        sys.stderr.write("Error: could not find g++.\n")
+        return 2
+    if not os.path.isdir(args.tests) and not is_archive(args.tests):
+        sys.stderr.write(f"Error: {args.tests} is not a folder or a test archive.\n")
+        return 2
+    if args.checker and args.workers:
+        sys.stderr.write("Error: --checker cannot be used with --workers.\n")
+        return 2
+    if args.interactor and (args.checker or args.workers):
+        sys.stderr.write(f"Error: --interactor cannot be used with {'--checker' if args.checker else '--workers'}.\n")
+        return 2
+    if args.watch:
+        return watch_command(args, compiler)
+    return judge_source(args, compiler)[0]
+
+
+def judge_source(args, compiler, tests=None):
+    """
+    Builds args.source and judges it (only tests, if given) as `judge` does.
+    Returns (exit code, result dicts), the results are None when nothing ran.
+    """
+    with open(args.source, 'r') as f:
+        cpp_code = f.read()
+
+    names = [args.profile] + ([args.sanitize] if args.sanitize and args.sanitize != args.profile else [])
+    phases = {}
+    try:
+        with timed(phases, 'compile'):
+            built, failed = compile_profiles(cpp_code, compiler, names, cache=not args.no_cache, pch=not args.no_pch)
+    except ValueError as e:
+        sys.stderr.write(f"Error: {e}\n")
+        return 2, None
+    if args.profile in failed:
+        sys.stderr.write(f"Compilation failed.\n{failed[args.profile]}\n")
+        return 2, None
+    exe_path = built[args.profile]
+    sys.stderr.write(f"Compiled {', '.join(built)} in {phases['compile']:.2f}s\n")
+    if args.sanitize in failed:
+        sys.stderr.write(f"The {args.sanitize} build failed, failing tests won't be rerun with it.\n{failed[args.sanitize]}\n")
+
+    checker = None
+    if args.checker:
+        try:
+            checker = compile_checker(args.checker, compiler, args.persistent_checker)
+        except CompileError as e:
+            sys.stderr.write(f"Checker compilation failed.\n{e}\n")
+            return 2, None
+    interactor = None
+    if args.interactor:
+        try:
+            interactor = compile_interactor(args.interactor, compiler)
+        except CompileError as e:
+            sys.stderr.write(f"Interactor compilation failed.\n{e}\n")
+            return 2, None
+
+    scheduler = CpuScheduler(args.jobs, args.pin, args.timing_accurate)
+    if args.workers:
+        sys.stderr.write(f"Running tests on {', '.join(args.workers)}\n")
+    else:
+        sys.stderr.write(f"Running tests with {scheduler.describe()}\n")
+    memory_limit = int(args.memory_limit * 2**20) or None
+    multiplier = args.multiplier
+    if multiplier is None:
+        import calibrate
+        multiplier = calibrate.machine_multiplier(args.workload)
+        if multiplier != RUNTIME_MULTIPLIER:
+            sys.stderr.write(f"Using the calibrated runtime multiplier {multiplier:g}\n")
+    # a rerun of some tests isn't saved: it would be taken as the previous run of the folder
+    judge_runner = Judge(exe_path, args.runtime, multiplier, scheduler=scheduler, memory_limit=memory_limit,
+                         compare_mode=args.compare, epsilon=args.epsilon, checker=checker, interactor=interactor,
+                         source_hash=source_hash(cpp_code), compile_time=phases['compile'],
+                         record=tests is None, workers=args.workers, token=args.token, staging_budget=int(args.staging_budget * 2**20),
+                         sanitized=profiles.is_sanitized(get_profiles()[args.profile]))
+    try:
+        test_results = judge_runner.run_all(args.tests, order=args.order, fail_fast=args.fail_fast, tests=tests)
+    except ConnectionError as e:
+        sys.stderr.write(f"Error: could not reach the workers, {e}\n")
+        return 2, None
+    if args.sanitize in built:
+        sanitizer = sanitizer_judge(built[args.sanitize], args.runtime, multiplier, scheduler=scheduler, interactor=interactor)
+        reports = sanitize_failures(sanitizer, args.tests, test_results)
+        sys.stderr.write(f"{args.sanitize} build: {reports} failing tests reported undefined behavior or a memory error\n")
+    print_results(test_results, args.json)
+    sys.stderr.write(f"Run: {timings.format_phases(judge_runner.run_phases)}\n")
+    if args.timings:
+        timings.export(args.timings, test_results, judge_runner.run_phases, args.timings_format)
+    if judge_runner.run_id is not None:
+        sys.stderr.write(f"Saved as run {judge_runner.run_id}\n")
+    return 0 if all(r['Result'] == 'Passed' for r in test_results) else 1, test_results
+
+
+def watch_command(args, compiler):
+    """
+    Judges, then judges again on every change until interrupted: everything
+    when the source changes, only the changed tests when some .in/.ok files do
+    """
+    from watch import Watcher
+
+    watcher = Watcher(args.source, args.tests)
+    verdicts = {} # test -> latest result, the cached verdicts of tests that didn't change
+    tests = None # None for every test
+    code = 2
+    try:
+        while True:
+            if tests is None:
+                verdicts.clear() # also when the build fails, the old verdicts are of another source
+            if tests is None or tests:
+                code, test_results = judge_source(args, compiler, tests)
+                verdicts.update((r['Test No.'], r) for r in test_results or ())
+            if verdicts:
+                passed = sum(1 for r in verdicts.values() if r['Result'] == 'Passed')
+                sys.stderr.write(f"Overall {passed}/{len(verdicts)} passed. ")
+            sys.stderr.write(f"Watching {args.source} and {args.tests}, Ctrl-C to stop.\n")
+
+            change = watcher.wait()
+            for test in change.removed:
+                verdicts.pop(test, None)
+            if change.source or change.everything or not verdicts:
+                tests = None
+                sys.stderr.write(f"\n{args.source if change.source else args.tests} changed, judging every test.\n")
+            elif change.tests:
+                tests = change.tests
+                sys.stderr.write(f"\n{len(tests)} tests changed, judging them again: {', '.join(sorted(tests, key=natural_key))}\n")
+            else:
+                tests = set()
+                sys.stderr.write(f"\n{len(change.removed)} tests removed.\n")
+    except KeyboardInterrupt:
+        if not verdicts:
+            return code
+        return 0 if all(r['Result'] == 'Passed' for r in verdicts.values()) else 1
+
+
+def format_seconds(seconds):
+    return '-' if seconds is None else f'{seconds:.3f}s'
+
+
+def print_comparison(rows, as_json=False):
+    if as_json:
+        json.dump(rows, sys.stdout, indent=2)
+        sys.stdout.write('\n')
+        return
+    for row in rows:
+        change = '' if row['change'] is None else f"{row['change']:+.1f}%"
+        print(f"{row['test']:>8}  {row['verdict_a'] or '-':<4} {format_seconds(row['time_a']):>9}  "
+              f"{row['verdict_b'] or '-':<4} {format_seconds(row['time_b']):>9}  {change}")
+
+
+def runs_command(args):
+    for run in get_store().runs(args.tests, args.limit):
+        started = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(run['started']))
+        print(f"{run['id']:>6}  {started}  {run['passed'] or 0}/{run['tests']} passed  "
+              f"{format_seconds(run['cpu_time'])}  {(run['source_hash'] or '-')[:12]}  {run['tests_path']}"
+              f"{'' if run['complete'] else '  (stopped early)'}")
+    return 0
+
+
+def compare_runs_command(args):
+    store = get_store()
+    for run_id in (args.run_a, args.run_b):
+        if store.run(run_id) is None:
+            sys.stderr.write(f"Error: no run {run_id}.\n")
+            return 2
+    print_comparison(store.compare_runs(args.run_a, args.run_b), args.json)
+    return 0
+
+
+def regressions_command(args):
+    rows = get_store().regressions(args.run, args.threshold, against=args.against)
+    if rows is None:
+        sys.stderr.write("Error: no earlier run on the same test folder to compare with.\n")
+        return 2
+    if not rows and not args.json:
+        print("No regressions.")
+        return 0
+    print_comparison(rows, args.json)
+    return 1 if rows else 0
+
+
+def bench_command(args):
+    import bench
+
+    compiler = find_compiler(args.mingw)
+    if compiler is None:
+        sys.stderr.write("Error: could not find g++.\n")
+        return 2
+    report = bench.bench(args.scenarios, compiler, args.jobs, args.pin, args.timing_accurate, args.work_dir,
+                         tiny_tests=args.tiny_tests, huge_mb=args.huge_mb, cpu_tests=args.cpu_tests)
+    bench.print_report(report, sys.stderr)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        sys.stdout.write('\n')
+    return 0
+
+
+def stress_command(args):
+    from stress import StressError, save_failure, stress
+
+    compiler = find_compiler(args.mingw)
+    if compiler is None:
+        sys.stderr.write("Error: could not find g++.\n")
+        return 2
+
+    binaries = []
+    for path in (args.generator, args.brute, args.source):
+        with open(path, 'r') as f:
+            cpp_code = f.read()
+        try:
+            # static binaries skip loading libstdc++ on every start, which is most of a small test's time
+            binaries.append(compile_source(cpp_code, compiler, flags=('-O2', '-static')))
+        except CompileError:
+            try:
+                binaries.append(compile_source(cpp_code, compiler, flags=('-O2',)))
+            except CompileError as e:
+                sys.stderr.write(f"Compilation of {path} failed.\n{e}\n")
+                return 2
+
+    scheduler = CpuScheduler(args.jobs, args.pin)
+    sys.stderr.write(f"Stress testing with {scheduler.describe()}\n")
+    try:
+        failure, iterations, seconds = stress(*binaries, args.iterations, args.shrink, scheduler=scheduler, timeout=args.timeout,
+                                              compare_mode=args.compare, epsilon=args.epsilon, seed=args.seed)
+    except StressError as e:
+        sys.stderr.write(f"Error: {e}\n")
+        return 2
+    print(f"{iterations} tests in {seconds:.2f}s ({iterations / max(seconds, 1e-9):.0f} tests/s)")
+    if failure is None:
+        print("No difference found.")
+        return 0
+    in_path = save_failure(failure, args.tests)
+    print(f"{failure['verdict']} on seed {failure['seed']}: {failure['message']}")
+    print(f"Saved the smallest failing test ({len(failure['input'])} bytes) as {in_path[:-3]}.in/.ok")
+    return 1
+
+
+def calibrate_command(args):
+    import calibrate
+
+    if args.show:
+        json.dump(calibrate.load(), sys.stdout, indent=2)
+        sys.stdout.write('\n')
+        return 0
+    if args.sources:
+        calibrate.write_sources(args.sources)
+        print(f"Wrote {', '.join(w + '.cpp' for w in calibrate.WORKLOADS)} and io.in to {args.sources}, "
+              f"build them with {' '.join(calibrate.CALIBRATION_FLAGS)} and time them on the judge")
+        return 0
+    if args.set_baseline:
+        name, times = args.set_baseline[0], {}
+        for pair in args.set_baseline[1:]:
+            workload, _, seconds = pair.partition('=')
+            try:
+                times[workload] = float(seconds)
+            except ValueError:
+                times[workload] = None
+            if workload not in calibrate.WORKLOADS or not times[workload] or times[workload] <= 0:
+                sys.stderr.write(f"Error: expected WORKLOAD=SECONDS with a workload in {', '.join(calibrate.WORKLOADS)}, got {pair}.\n")
+                return 2
+        if not times:
+            sys.stderr.write("Error: give at least one WORKLOAD=SECONDS.\n")
+            return 2
+        calibrate.save_baseline(name, times)
+        print(f"Saved baseline {name}")
+        return 0
+
+    compiler = find_compiler(args.mingw)
+    if compiler is None:
+        sys.stderr.write("Error: could not find g++.\n")
+        return 2
+    try:
+        if args.save_baseline:
+            times = calibrate.run_workloads(compiler, repeat=args.repeat)
+            calibrate.save_baseline(args.save_baseline, times)
+            for workload, seconds in times.items():
+                print(f"{workload:>8}  {seconds:.3f}s")
+            print(f"Saved baseline {args.save_baseline}")
+            return 0
+        entry = calibrate.calibrate(compiler, args.target, args.repeat)
+    except calibrate.CalibrationError as e:
+        sys.stderr.write(f"Error: {e}\n")
+        return 2
+    baseline = calibrate.load()['baselines'][entry['target']]
+    for workload, seconds in entry['times'].items():
+        print(f"{workload:>8}  {seconds:.3f}s here, {baseline.get(workload, 0):.3f}s on {entry['target']}"
+              f"  x{entry['multipliers'].get(workload, 0):.3f}")
+    print(f"Runtime multiplier of {calibrate.machine_id()}: {entry['multiplier']:g}")
+    return 0
+
+
+def worker_command(args):
+    from distributed import WorkerServer
+
+    try:
+        server = WorkerServer(args.host, args.port, args.jobs, args.pin, args.token)
+    except OSError as e:
+        sys.stderr.write(f"Error: could not listen on {args.host}:{args.port}, {e}\n")
+        return 2
+    if args.host not in ('127.0.0.1', 'localhost', '::1') and not args.token:
+        sys.stderr.write("Warning: listening on the network without --token, anyone who can connect can run programs here.\n")
+    sys.stderr.write(f"Worker {server.node} listening on {args.host}:{server.server_address[1]} "
+                     f"with {CpuScheduler(args.jobs, args.pin).describe()}\n")
+    with server:
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+    return 0
+
+
+def cache_command(args):
+    cache = get_cache()
+    if args.clear:
+        cache.clear()
+    stats = cache.stats()
+    lookups = stats['hits'] + stats['misses']
+    hit_rate = stats['hits'] / lookups * 100 if lookups else 0.0
+    print(f"{stats['entries']} binaries, {stats['bytes'] / 2**20:.1f}MB of {stats['max_bytes'] / 2**20:.0f}MB")
+    print(f"{stats['hits']} hits, {stats['misses']} misses ({hit_rate:.0f}% hit rate), {stats['evictions']} evictions")
+    return 0
+
+
+def pch_command(args):
+    compiler = find_compiler(args.mingw)
+    if compiler is None:
+        sys.stderr.write("Error: could not find g++.\n")
+        return 2
+    if args.clear:
+        get_pch().clear()
+
+    if args.source:
+        with open(args.source, 'r') as f:
+            cpp_code = f.read()
+    else:
+        cpp_code = '#include <bits/stdc++.h>\nint main() { return 0; }\n'
+    if not uses_pch(cpp_code):
+        sys.stderr.write("Error: the first #include must be <bits/stdc++.h> to use the precompiled header.\n")
+        return 2
+
+    start_time = time.time()
+    include_dir = get_pch().include_dir(compiler)
+    print(f"Precompiled header: {include_dir} ({time.time() - start_time:.2f}s)")
+    if include_dir is None:
+        return 1
+
+    try:
+        phases = []
+        for pch in (False, True):
+            start_time = time.time()
+            compile_source(cpp_code, compiler, exe_path='temp_pch.exe', cache=False, pch=pch)
+            phases.append(time.time() - start_time)
+    except CompileError as e:
+        sys.stderr.write(f"Compilation failed.\n{e}\n")
+        return 2
+    finally:
+        if os.path.exists('temp_pch.exe'):
+            os.remove('temp_pch.exe')
+
+    print(f"Without precompiled header: {phases[0]:.2f}s")
+    print(f"With precompiled header: {phases[1]:.2f}s ({phases[0] / max(phases[1], 1e-9):.1f}x faster)")
+    return 0
+
+
+COMMANDS = {
+    'judge': judge_command,
+    'runs': runs_command,
+    'compare-runs': compare_runs_command,
+    'regressions': regressions_command,
+    'bench': bench_command,
+    'stress': stress_command,
+    'calibrate': calibrate_command,
+    'worker': worker_command,
+    'cache': cache_command,
+    'pch': pch_command,
+}
+
+
+def main(argv=None):
+    """
+    Command line entry point. For `judge` returns 0 if every test passed,
+    1 if any failed and 2 on usage or compilation errors.
+    """
+    args = build_parser().parse_args(argv)
+    return COMMANDS[args.command](args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
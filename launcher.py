@@ -0,0 +1,132 @@
+"""
+Launcher: a tiny C++ program that starts each limited test process so its peak
+memory is measured on its own.
+
+ru_maxrss of a process that was forked from Judgee and exec'd the solution is
+not the solution's peak: Linux keeps the high-water mark of the address space
+the process had before exec, and a child forked from Python starts with a copy
+of Python's. With the GUI holding a few hundred megabytes every test would
+report that much, and a trivial program would get MLE.
+
+So Judgee runs
+
+    launcher <memory limit> <cpu limit> <wall limit> <report fd> <program> [args...]
+
+The launcher is small, so the child it forks starts with a few hundred
+kilobytes, applies the limits (address space in bytes, 0 for none, and CPU
+seconds) and execs the program. The launcher waits for it, kills it once the
+wall limit in seconds has passed, and writes one line to the report fd:
+
+    <wait status> <user cpu> <system cpu> <ru_maxrss> <timed out>
+
+If the program can't be started the child writes `E <errno>` instead and the
+error is raised when the test is waited for, as if Popen had failed.
+
+Both processes share the process group Judgee kills on cancel. The launcher
+is built once through the compile cache with the g++ on PATH; without a
+compiler (and on Windows, which has no wait4) processes are started directly.
+"""
+import os
+
+
+LAUNCHER_GRACE = 1.0 # seconds Judgee waits past the wall limit before killing the launcher itself
+
+SOURCE = r'''
+#include <cerrno>
+#include <csignal>
+#include <cstdio>
+#include <cstdlib>
+#include <fcntl.h>
+#include <sys/resource.h>
+#include <sys/time.h>
+#include <sys/wait.h>
+#include <unistd.h>
+
+static pid_t child;
+static volatile sig_atomic_t timed_out = 0;
+
+static void on_alarm(int) {
+    timed_out = 1;
+    kill(child, SIGKILL);
+}
+
+int main(int argc, char **argv) {
+    if (argc < 6) {
+        fprintf(stderr, "usage: launcher memory cpu wall report-fd program [args...]\n");
+        return 126;
+    }
+    long long memory = atoll(argv[1]);
+    long long cpu = atoll(argv[2]);
+    double wall = atof(argv[3]);
+    int report = atoi(argv[4]);
+
+    child = fork();
+    if (child < 0)
+        return 126;
+    if (child == 0) {
+        fcntl(report, F_SETFD, FD_CLOEXEC);
+        if (memory > 0) {
+            struct rlimit limit = {(rlim_t)memory, (rlim_t)memory};
+            setrlimit(RLIMIT_AS, &limit);
+        }
+        if (cpu > 0) {
+            struct rlimit limit = {(rlim_t)cpu, (rlim_t)cpu};
+            setrlimit(RLIMIT_CPU, &limit);
+        }
+        execv(argv[5], argv + 5);
+        dprintf(report, "E %d\n", errno);
+        _exit(127);
+    }
+
+    struct sigaction action = {};
+    action.sa_handler = on_alarm;
+    sigaction(SIGALRM, &action, nullptr);
+    if (wall > 0) {
+        struct itimerval timer = {};
+        timer.it_value.tv_sec = (long)wall;
+        timer.it_value.tv_usec = (long)((wall - (long)wall) * 1e6);
+        setitimer(ITIMER_REAL, &timer, nullptr);
+    }
+    int status;
+    struct rusage usage;
+    while (wait4(child, &status, 0, &usage) < 0)
+        if (errno != EINTR)
+            return 126;
+    struct itimerval off = {};
+    setitimer(ITIMER_REAL, &off, nullptr);
+    dprintf(report, "%d %ld.%06ld %ld.%06ld %ld %d\n", status,
+            (long)usage.ru_utime.tv_sec, (long)usage.ru_utime.tv_usec,
+            (long)usage.ru_stime.tv_sec, (long)usage.ru_stime.tv_usec,
+            (long)usage.ru_maxrss, (int)timed_out);
+    return 0;
+}
+'''
+
+
+def command(launcher_path, args, memory_limit, cpu_limit, wall_limit, report_fd):
+    """
+    Returns the command line that runs args through the launcher
+    """
+    return [launcher_path, str(memory_limit or 0), str(cpu_limit), repr(float(wall_limit)), str(report_fd), *args]
+
+
+def read_report(fd, program):
+    """
+    Reads the launcher's report from fd once it has exited and returns
+    (wait status, cpu time, ru_maxrss, timed out), or None if the launcher was
+    killed before writing it. Raises OSError if program couldn't be started.
+    """
+    data = b''
+    while True:
+        chunk = os.read(fd, 4096)
+        if not chunk:
+            break
+        data += chunk
+    fields = data.split()
+    if fields[:1] == [b'E']:
+        code = int(fields[1])
+        raise OSError(code, os.strerror(code), program)
+    if len(fields) != 5:
+        return None
+    status, user, system, maxrss, timed_out = fields
+    return int(status), float(user) + float(system), int(maxrss), timed_out == b'1'
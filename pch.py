@@ -0,0 +1,114 @@
+"""
+Precompiled <bits/stdc++.h> for g++.
+
+Parsing bits/stdc++.h is most of the compile time for a typical competitive
+programming source. For every compiler and flag set we build the header once
+into JUDGEE_HOME/pch/<key>/bits/stdc++.h.gch next to a copy of the header, and
+add that folder to the include path of sources that start with the include.
+g++ picks the .gch up on its own and silently falls back to the copied header
+if it can't use it. The key covers the compiler path, its version and the
+flags, so a toolchain change builds a fresh header.
+"""
+import hashlib
+import os
+import re
+import shutil
+import subprocess
+import threading
+
+from compile_cache import compiler_version
+
+
+PCH_HEADER = 'bits/stdc++.h'
+PCH_TIMEOUT = 120
+
+_include_re = re.compile(r'^\s*#\s*include\s*[<"]([^>"]+)[>"]', re.MULTILINE)
+
+
+def uses_pch(cpp_code):
+    """
+    Returns True if the first #include of cpp_code is <bits/stdc++.h>
+    """
+    match = _include_re.search(cpp_code)
+    return match is not None and match.group(1) == PCH_HEADER
+
+
+def find_header(compiler, flags=()):
+    """
+    Returns the path of the bits/stdc++.h that compiler would include, or None
+    """
+    try:
+        deps = subprocess.run([compiler, *flags, '-M', '-x', 'c++', '-'], input=f'#include <{PCH_HEADER}>\n',
+                              stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True, timeout=30).stdout
+    except (OSError, subprocess.SubprocessError):
+        return None
+    for dep in deps.replace('\\\n', ' ').split():
+        if dep.replace('\\', '/').endswith(PCH_HEADER):
+            return dep
+    return None
+
+
+class PchManager:
+    def __init__(self, pch_dir):
+        self.pch_dir = pch_dir
+        self.lock = threading.Lock()
+        self.failed = set()
+
+    def key(self, compiler, flags=()):
+        digest = hashlib.sha256()
+        for part in (os.path.realpath(compiler), compiler_version(compiler), '\0'.join(flags)):
+            digest.update(part.encode('utf-8', 'surrogateescape'))
+            digest.update(b'\0')
+        return digest.hexdigest()[:32]
+
+    def include_dir(self, compiler, flags=()):
+        """
+        Returns the folder to pass with -I so that compiler finds the precompiled
+        header for flags, building it first if needed. Returns None if the header
+        can't be precompiled with this toolchain.
+        """
+        flags = tuple(flags)
+        key = self.key(compiler, flags)
+        include_dir = os.path.join(self.pch_dir, key)
+        if os.path.isfile(os.path.join(include_dir, PCH_HEADER + '.gch')):
+            return include_dir
+        if key in self.failed:
+            return None
+
+        with self.lock:
+            if os.path.isfile(os.path.join(include_dir, PCH_HEADER + '.gch')):
+                return include_dir
+            if not self.build(compiler, flags, include_dir):
+                self.failed.add(key)
+                return None
+        return include_dir
+
+    def build(self, compiler, flags, include_dir):
+        header = find_header(compiler, flags)
+        if header is None:
+            return False
+
+        temp_dir = f'{include_dir}.{os.getpid()}.tmp'
+        shutil.rmtree(temp_dir, ignore_errors=True)
+        os.makedirs(os.path.join(temp_dir, os.path.dirname(PCH_HEADER)))
+        header_copy = os.path.join(temp_dir, PCH_HEADER)
+        shutil.copyfile(header, header_copy)
+
+        try:
+            subprocess.run([compiler, *flags, '-x', 'c++-header', header_copy, '-o', header_copy + '.gch'],
+                           stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, timeout=PCH_TIMEOUT, check=True)
+        except (OSError, subprocess.SubprocessError):
+            shutil.rmtree(temp_dir, ignore_errors=True)
+            return False
+
+        try:
+            os.replace(temp_dir, include_dir)
+        except OSError:
+            # someone else finished the same header first
+            shutil.rmtree(temp_dir, ignore_errors=True)
+        return True
+
+    def clear(self):
+        with self.lock:
+            shutil.rmtree(self.pch_dir, ignore_errors=True)
+            self.failed.clear()
@@ -0,0 +1,69 @@
+"""
+Build profiles: named sets of compiler flags a source is built with.
+
+    release   -O2, what contest judges use, for timing
+    sanitize  AddressSanitizer and UndefinedBehaviorSanitizer, for finding out why a test fails
+    debug     -O0 with the checked standard library (out-of-range iterators, bad comparators, ...)
+
+Profiles are built concurrently, each into its own compile cache entry since
+the flags are part of the cache key. More profiles, or other flags for these,
+can be set in JUDGEE_HOME/profiles.json:
+
+    {"release": ["-O2", "-std=c++17"], "fast": ["-O3", "-march=native"]}
+"""
+import json
+import os
+
+
+DEFAULT_PROFILE = 'release'
+SANITIZE_PROFILE = 'sanitize'
+
+PROFILES = {
+    'release': ('-O2',),
+    'sanitize': ('-O1', '-g', '-fno-omit-frame-pointer', '-fsanitize=address,undefined'),
+    'debug': ('-O0', '-g', '-D_GLIBCXX_DEBUG', '-D_GLIBCXX_DEBUG_PEDANTIC'),
+}
+
+# sanitized programs run this much slower, their time limit is stretched to match
+SANITIZER_SLOWDOWN = 3
+
+# leak checking needs ptrace, which sandboxes and containers often forbid, and
+# a leak isn't why a test fails
+SANITIZER_ENV = {
+    'ASAN_OPTIONS': 'detect_leaks=0:abort_on_error=0:symbolize=1',
+    'UBSAN_OPTIONS': 'print_stacktrace=1',
+}
+
+REPORT_LINES = 20
+
+
+def load(path=None):
+    """
+    Returns {name: flags}: the default profiles, overridden and extended by the ones in path
+    """
+    profiles = dict(PROFILES)
+    if path is None or not os.path.isfile(path):
+        return profiles
+    with open(path) as f:
+        profiles.update({name: tuple(flags) for name, flags in json.load(f).items()})
+    return profiles
+
+
+def is_sanitized(flags):
+    """
+    Whether a build with flags runs under sanitizers, which need their address space unlimited
+    """
+    return any(flag.startswith('-fsanitize=') for flag in flags)
+
+
+def sanitizer_report(errors, limit=REPORT_LINES):
+    """
+    Returns the sanitizer or debug-mode diagnostics in a program's stderr, at most limit lines
+    from the first one, or '' if there are none
+    """
+    lines = errors.decode('utf-8', 'replace').splitlines()
+    for i, line in enumerate(lines):
+        # UBSan, ASan, and the checked standard library of the debug profile
+        if 'runtime error:' in line or 'ERROR: AddressSanitizer' in line or line.startswith('Error: attempt to'):
+            return '\n'.join(lines[i:i + limit])
+    return ''
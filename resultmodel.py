@@ -0,0 +1,345 @@
+"""
+The results table: a columnar store of test results and the Qt model that shows it.
+
+A result dict per test costs about a kilobyte once its phases are counted,
+and a QTableWidgetItem per cell several times that. ResultColumns keeps each
+field in a column of its own instead (arrays of doubles, interned strings,
+small integer codes), and ResultTableModel only formats the cells the view
+asks for, i.e. the rows on screen. Results are appended in batches, one
+rowsInserted per batch, so a fast run of 100k tests doesn't repaint per test.
+
+Rows are sorted naturally by test name ("2" before "10") or numerically by
+time and memory, and can be filtered to the failed tests or the N slowest.
+"""
+import heapq
+import math
+from array import array
+
+from PyQt5.QtCore import Qt, QAbstractTableModel, QModelIndex
+from PyQt5.QtGui import QColor
+
+from history import natural_key
+from judge import format_memory
+from timings import TEST_PHASES
+
+
+COLUMNS = ("Test No.", "Result", "Time Taken", "Memory")
+PASSED_COLOR = QColor(0, 255, 0)
+FAILED_COLOR = QColor(255, 0, 0)
+
+# fields kept per row only when present, they are rare
+SPARSE_FIELDS = ('Message', 'Sanitizer', 'Node')
+
+FILTERS = ('all', 'failed', 'slowest')
+
+
+class ResultColumns:
+    """
+    Test results stored column by column. row(i) rebuilds the result dict of row i.
+    """
+    def __init__(self):
+        self.clear()
+
+    def clear(self):
+        self.tests = []
+        self.keys = [] # natural sort keys of tests
+        self.verdicts = bytearray() # codes into self.verdict_names
+        self.verdict_names = []
+        self.results = {} # verdict -> 'Result' text, the same for every test with that verdict
+        self.times = [] # 'Time Taken' texts, interned
+        self.elapsed = array('d') # nan when unknown
+        self.memory = array('q') # -1 when unknown
+        self.overhead = array('d')
+        self.started = array('d')
+        self.phases = array('d') # len(TEST_PHASES) per row
+        self.workers = array('H') # codes into self.worker_names
+        self.worker_names = []
+        self.sparse = {} # row -> {field: value}
+        self.rows_by_test = {}
+        self._interned = {}
+
+    def __len__(self):
+        return len(self.tests)
+
+    def _code(self, names, name):
+        try:
+            return names.index(name)
+        except ValueError:
+            names.append(name)
+            return len(names) - 1
+
+    def append(self, result):
+        """
+        Adds a result dict, or replaces the row of its test if it has one. Returns the row.
+        """
+        test = str(result['Test No.'])
+        row = self.rows_by_test.get(test)
+        if row is not None:
+            self._replace(row, result)
+            return row
+        row = len(self.tests)
+        self.tests.append(test)
+        self.keys.append(tuple(natural_key(test)))
+        verdict, time_taken, elapsed, memory, overhead, started, phases, worker, sparse = self._columns(result)
+        self.verdicts.append(verdict)
+        self.times.append(time_taken)
+        self.elapsed.append(elapsed)
+        self.memory.append(memory)
+        self.overhead.append(overhead)
+        self.started.append(started)
+        self.phases.extend(phases)
+        self.workers.append(worker)
+        if sparse:
+            self.sparse[row] = sparse
+        self.rows_by_test[test] = row
+        return row
+
+    def _replace(self, row, result):
+        verdict, time_taken, elapsed, memory, overhead, started, phases, worker, sparse = self._columns(result)
+        self.verdicts[row] = verdict
+        self.times[row] = time_taken
+        self.elapsed[row] = elapsed
+        self.memory[row] = memory
+        self.overhead[row] = overhead
+        self.started[row] = started
+        self.phases[row * len(TEST_PHASES):(row + 1) * len(TEST_PHASES)] = array('d', phases)
+        self.workers[row] = worker
+        if sparse:
+            self.sparse[row] = sparse
+        else:
+            self.sparse.pop(row, None)
+
+    def _columns(self, result):
+        """
+        The column values of a result dict
+        """
+        self.results.setdefault(result['Verdict'], result['Result'])
+        phases = result.get('Phases') or {}
+        return (self._code(self.verdict_names, result['Verdict']),
+                self._interned.setdefault(result['Time Taken'], result['Time Taken']),
+                math.nan if result.get('Elapsed') is None else result['Elapsed'],
+                -1 if result.get('Memory') is None else result['Memory'],
+                math.nan if result.get('Overhead') is None else result['Overhead'],
+                math.nan if result.get('Started') is None else result['Started'],
+                [phases.get(phase, math.nan) for phase in TEST_PHASES],
+                self._code(self.worker_names, result.get('Worker')),
+                {field: result[field] for field in SPARSE_FIELDS if result.get(field)})
+
+    def remove(self, tests):
+        """
+        Drops the rows of tests. The remaining rows are renumbered.
+        """
+        tests = {str(test) for test in tests}
+        kept = [self.row(row) for row in range(len(self.tests)) if self.tests[row] not in tests]
+        self.clear()
+        for result in kept:
+            self.append(result)
+
+    def update(self, test, **fields):
+        """
+        Sets sparse fields of the row of test, returns the row or None
+        """
+        row = self.rows_by_test.get(str(test))
+        if row is not None:
+            self.sparse.setdefault(row, {}).update(fields)
+        return row
+
+    def verdict(self, row):
+        return self.verdict_names[self.verdicts[row]]
+
+    def result_text(self, row):
+        return self.results[self.verdict(row)]
+
+    def passed(self, row):
+        return self.result_text(row) == 'Passed'
+
+    def field(self, row, name):
+        return self.sparse.get(row, {}).get(name)
+
+    def row(self, row):
+        """
+        The result dict of row, as Judge.run_test returned it
+        """
+        def known(value):
+            return None if value != value else value # nan
+
+        memory = self.memory[row]
+        phases = self.phases[row * len(TEST_PHASES):(row + 1) * len(TEST_PHASES)]
+        result = {'Test No.': self.tests[row], 'Result': self.result_text(row), 'Verdict': self.verdict(row),
+                  'Time Taken': self.times[row], 'Elapsed': known(self.elapsed[row]),
+                  'Memory': None if memory < 0 else memory,
+                  'Memory Used': format_memory(None if memory < 0 else memory),
+                  'Overhead': known(self.overhead[row]), 'Started': known(self.started[row]),
+                  'Phases': {phase: seconds for phase, seconds in zip(TEST_PHASES, phases) if seconds == seconds},
+                  'Worker': self.worker_names[self.workers[row]]}
+        result.update(self.sparse.get(row, {}))
+        return result
+
+    def __iter__(self):
+        return (self.row(row) for row in range(len(self.tests)))
+
+
+class ResultTableModel(QAbstractTableModel):
+    """
+    Shows a ResultColumns through a view order of its rows, sorted and filtered
+    """
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.store = ResultColumns()
+        self.view = array('l') # store rows in display order
+        self.sort_column = None
+        self.sort_order = Qt.AscendingOrder
+        self.filter = 'all'
+        self.slowest = 100
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.view)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(COLUMNS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return COLUMNS[section]
+        return None
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        row = self.view[index.row()]
+        column = index.column()
+        store = self.store
+        if role == Qt.DisplayRole:
+            if column == 0:
+                return store.tests[row]
+            if column == 1:
+                text = store.result_text(row)
+                return f"{text} (sanitizer)" if store.field(row, 'Sanitizer') else text
+            if column == 2:
+                return store.times[row]
+            memory = store.memory[row]
+            return format_memory(None if memory < 0 else memory)
+        if role == Qt.BackgroundRole:
+            return PASSED_COLOR if store.passed(row) else FAILED_COLOR
+        if role == Qt.ToolTipRole:
+            if column == 0 and store.field(row, 'Node'):
+                return f"Run on {store.field(row, 'Node')}"
+            if column == 1:
+                return "\n\n".join(filter(None, (store.field(row, 'Message'), store.field(row, 'Sanitizer')))) or None
+        return None
+
+    def clear(self):
+        self.beginResetModel()
+        self.store.clear()
+        self.view = array('l')
+        self.endResetModel()
+
+    def addResults(self, results):
+        """
+        Appends a batch of result dicts. They show at the bottom (if they pass the
+        filter) until the next sort, so rows don't jump around during a run.
+        A result of a test already in the table replaces its row.
+        """
+        if not results:
+            return
+        count = len(self.store)
+        rows = [self.store.append(result) for result in results]
+        if self.filter == 'slowest' or any(row < count for row in rows):
+            # the slowest N can change with any result, and a replaced result can pass the filter or stop passing it
+            self.refresh()
+            return
+        visible = [row for row in rows if self.accepts(row)]
+        if visible:
+            self.beginInsertRows(QModelIndex(), len(self.view), len(self.view) + len(visible) - 1)
+            self.view.extend(visible)
+            self.endInsertRows()
+
+    def removeTests(self, tests):
+        self.beginResetModel()
+        self.store.remove(tests)
+        self.view = array('l', self.visibleRows())
+        self.endResetModel()
+
+    def updateResult(self, test, **fields):
+        row = self.store.update(test, **fields)
+        if row is None:
+            return
+        try:
+            position = self.view.index(row)
+        except ValueError:
+            return
+        self.dataChanged.emit(self.index(position, 0), self.index(position, len(COLUMNS) - 1))
+
+    def accepts(self, row):
+        return self.filter != 'failed' or not self.store.passed(row)
+
+    def setFilter(self, filter, slowest=None):
+        """
+        filter is 'all', 'failed' (tests that didn't pass) or 'slowest' (the slowest N by CPU time)
+        """
+        self.filter = filter
+        if slowest is not None:
+            self.slowest = slowest
+        self.refresh()
+
+    def refresh(self):
+        """
+        Rebuilds the view order from the store, the filter and the sort
+        """
+        self.relayout(self.visibleRows())
+
+    def visibleRows(self):
+        """
+        The store rows that pass the filter, sorted
+        """
+        rows = range(len(self.store))
+        if self.filter == 'failed':
+            rows = [row for row in rows if not self.store.passed(row)]
+        elif self.filter == 'slowest':
+            elapsed = self.store.elapsed
+            rows = heapq.nlargest(self.slowest, (row for row in rows if elapsed[row] == elapsed[row]),
+                                  key=elapsed.__getitem__)
+        return self.sorted(rows)
+
+    def sortKey(self, column):
+        store = self.store
+        if column == 0:
+            return store.keys.__getitem__
+        if column == 1:
+            return lambda row: (store.passed(row), store.verdict(row), store.keys[row])
+        if column == 2:
+            return lambda row: (store.elapsed[row] if store.elapsed[row] == store.elapsed[row] else -1.0, store.keys[row])
+        return lambda row: (store.memory[row], store.keys[row])
+
+    def sorted(self, rows):
+        if self.sort_column is None:
+            return rows
+        return sorted(rows, key=self.sortKey(self.sort_column), reverse=self.sort_order == Qt.DescendingOrder)
+
+    def sort(self, column, order=Qt.AscendingOrder):
+        self.sort_column = column
+        self.sort_order = order
+        self.relayout(self.sorted(self.view))
+
+    def relayout(self, rows):
+        """
+        Shows rows (store rows in display order) instead of the current view, keeping
+        the view's selection and current index on the same tests
+        """
+        self.layoutAboutToBeChanged.emit()
+        persistent = self.persistentIndexList()
+        stored = [(self.view[index.row()], index.column()) for index in persistent]
+        self.view = array('l', rows)
+        positions = {row: position for position, row in enumerate(self.view)} if persistent else {}
+        self.changePersistentIndexList(persistent, [self.index(positions[row], column) if row in positions else QModelIndex()
+                                                    for row, column in stored])
+        self.layoutChanged.emit()
+
+    def testNumber(self, position):
+        return self.store.tests[self.view[position]]
+
+    def results(self):
+        """
+        Every stored result dict, whatever the filter
+        """
+        return list(self.store)
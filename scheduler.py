@@ -0,0 +1,90 @@
+"""
+Sizes the judging pool from the CPUs this process may use and optionally pins
+every worker to a CPU of its own.
+
+Pinning is done on the worker thread itself: on Linux sched_setaffinity(0)
+only affects the calling thread, and every test process started from that
+thread inherits its mask, so a test never shares a core with another test.
+On platforms without sched_setaffinity the pool is still sized from the CPU
+count but nothing is pinned.
+"""
+import os
+import threading
+
+
+def available_cpus():
+    """
+    Returns the sorted CPU ids this process is allowed to run on
+    """
+    if hasattr(os, 'sched_getaffinity'):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+
+def physical_cpus(cpus):
+    """
+    Keeps one logical CPU per physical core, dropping hyper-thread siblings
+    """
+    seen = set()
+    physical = []
+    for cpu in cpus:
+        try:
+            with open(f'/sys/devices/system/cpu/cpu{cpu}/topology/thread_siblings_list', 'r') as f:
+                siblings = f.read().strip()
+        except OSError:
+            siblings = str(cpu)
+        if siblings not in seen:
+            seen.add(siblings)
+            physical.append(cpu)
+    return physical
+
+
+class CpuScheduler:
+    def __init__(self, jobs=None, pin=False, timing_accurate=False):
+        '''
+        Parameters
+        ----------
+        jobs : int
+            number of workers, defaults to one per usable CPU
+        pin : bool
+            pin every worker (and the tests it runs) to its own CPU
+        timing_accurate : bool
+            use one CPU per physical core, keep some cores free for the
+            harness and the OS, and pin workers. Fewer tests run at once
+            but they don't slow each other down.
+        '''
+        cpus = available_cpus()
+        if timing_accurate:
+            cpus = physical_cpus(cpus)
+            headroom = max(1, len(cpus) // 8) if len(cpus) > 1 else 0
+            # leave the first cores to the harness, the OS usually prefers them
+            cpus = cpus[headroom:]
+            pin = True
+
+        self.can_pin = hasattr(os, 'sched_setaffinity')
+        self.pin = pin and self.can_pin
+        self.cpus = cpus
+        if jobs is None:
+            jobs = len(cpus)
+        if self.pin:
+            # a pinned worker needs a CPU of its own
+            jobs = min(jobs, len(cpus))
+        self.workers = max(1, jobs)
+        self.lock = threading.Lock()
+        self.next_cpu = 0
+
+    def pin_worker(self):
+        """
+        Pool initializer: pins the calling worker thread to the next free CPU
+        """
+        if not self.pin:
+            return
+        with self.lock:
+            cpu = self.cpus[self.next_cpu % len(self.cpus)]
+            self.next_cpu += 1
+        os.sched_setaffinity(0, {cpu})
+
+    def describe(self):
+        if self.pin:
+            return f"{self.workers} workers pinned to CPUs {','.join(map(str, self.cpus[:self.workers]))}"
+        return f"{self.workers} workers on {len(self.cpus)} CPUs"
@@ -0,0 +1,182 @@
+"""
+Input staging: test inputs are read into memory ahead of the workers, so a
+cold page cache or a slow network drive isn't charged to the solution.
+
+A stager thread walks the tests in the order they are submitted and copies
+each input into an anonymous in-memory file (a memfd on Linux) while earlier
+tests run. That copy is the process's stdin, so every read it makes is served
+from RAM and its clock starts with the whole input resident. Staged inputs are
+held under a memory budget (STAGING_BUDGET, `judge --staging-budget`): the
+stager waits for running tests to release theirs when the next input doesn't
+fit. An input bigger than the whole budget isn't copied, the kernel is only
+asked to read it ahead into the page cache (posix_fadvise WILLNEED).
+
+How long staging an input took is the test's 'stage' phase. It is spent on
+the stager thread before the test starts, so it isn't part of the test's
+harness overhead.
+
+Archive members are passed through: zip members are extracted and tar members
+spooled into memory before their process starts anyway.
+"""
+import collections
+import os
+import threading
+import time
+
+from testsource import Member, spool
+
+
+STAGING_BUDGET = 256 * 2**20 # bytes of staged inputs held at once
+STAGING_AHEAD = 64 # staged tests waiting to be submitted, each holds a descriptor
+
+
+class StagedInput(Member):
+    """
+    A test input read ahead of its test: a copy in memory, or the path once prefetched
+    """
+    def __init__(self, path, spooled, size, stage_time):
+        super().__init__(None, path)
+        self.spooled = spooled
+        self.size = size # bytes counted against the budget
+        self.stage_time = stage_time
+
+    def open(self):
+        if self.spooled is None:
+            return open(self.name, 'rb')
+        self.spooled.seek(0)
+        return self.spooled
+
+    def close(self):
+        if self.spooled is not None:
+            self.spooled.close()
+
+
+def prefetch(path):
+    """
+    Asks the kernel to read path into the page cache in the background
+    """
+    if not hasattr(os, 'posix_fadvise'):
+        return
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+    finally:
+        os.close(fd)
+
+
+def stage(path, size, copy):
+    """
+    Returns the StagedInput of path, or path itself if it can't be read
+    (the test then fails to open it as it would have without staging)
+    """
+    start_time = time.perf_counter()
+    try:
+        if not copy:
+            prefetch(path)
+            return StagedInput(path, None, 0, time.perf_counter() - start_time)
+        with open(path, 'rb') as f:
+            spooled = spool(f, 'judgee-in')
+    except OSError:
+        return path
+    return StagedInput(path, spooled, size, time.perf_counter() - start_time)
+
+
+class InputStager:
+    def __init__(self, tests, budget=STAGING_BUDGET, ahead=STAGING_AHEAD):
+        '''
+        Parameters
+        ----------
+        tests : iterable
+            (test number, input, answer) in submission order, consumed on the stager thread
+        budget : int
+            bytes of staged inputs held at once
+        ahead : int
+            staged tests waiting to be taken at most
+        '''
+        self.tests = tests
+        self.budget = budget
+        self.ahead = ahead
+        self.used = 0
+        self.staged = collections.deque()
+        self.finished = False
+        self.closed = False
+        self.error = None
+        self.condition = threading.Condition()
+        self.thread = threading.Thread(target=self.run, name='judgee-stager', daemon=True)
+        self.thread.start()
+
+    def run(self):
+        try:
+            for test_number, in_file, out_file in self.tests:
+                if isinstance(in_file, str):
+                    try:
+                        size = os.path.getsize(in_file)
+                    except OSError:
+                        size = 0
+                    copy = size <= self.budget
+                    with self.condition:
+                        # an input that fits the budget waits for room, unless nothing else is held
+                        while not self.closed and (len(self.staged) >= self.ahead or
+                                                   (copy and self.used and self.used + size > self.budget)):
+                            self.condition.wait()
+                        if self.closed:
+                            return
+                        if copy:
+                            self.used += size
+                    staged = stage(in_file, size, copy)
+                    if not isinstance(staged, StagedInput) and copy:
+                        self.release_bytes(size)
+                    in_file = staged
+                with self.condition:
+                    if self.closed:
+                        # closed while this one was being copied, nothing will take it
+                        if isinstance(in_file, StagedInput):
+                            in_file.close()
+                            self.used -= in_file.size
+                        return
+                    self.staged.append((test_number, in_file, out_file))
+                    self.condition.notify_all()
+        except BaseException as e:
+            self.error = e
+        finally:
+            with self.condition:
+                self.finished = True
+                self.condition.notify_all()
+
+    def __iter__(self):
+        while True:
+            with self.condition:
+                while not self.staged and not self.finished:
+                    self.condition.wait()
+                if not self.staged:
+                    if self.error is not None:
+                        raise self.error
+                    return
+                test = self.staged.popleft()
+                self.condition.notify_all()
+            yield test
+
+    def release(self, in_file):
+        """
+        Frees a staged input and gives its memory back to the budget once its
+        test is done, or won't run at all
+        """
+        if isinstance(in_file, StagedInput):
+            in_file.close()
+            self.release_bytes(in_file.size)
+
+    def release_bytes(self, size):
+        with self.condition:
+            self.used -= size
+            self.condition.notify_all()
+
+    def close(self):
+        with self.condition:
+            self.closed = True
+            self.condition.notify_all()
+        self.thread.join()
+        for _, in_file, _ in self.staged:
+            if isinstance(in_file, StagedInput):
+                in_file.close()
+                self.used -= in_file.size
+        self.staged.clear()
@@ -0,0 +1,161 @@
+"""
+Local SQLite store of every judging run.
+
+Each run keeps the source hash, the test folder and, per test, the verdict,
+CPU time, peak memory and harness timings, so runs can be compared later:
+which tests got slower than last time, or two runs side by side.
+
+A run stopped early (fail fast or cancel) is saved as incomplete: its verdicts
+still order the next run, but it is never the previous run a later one is
+compared with, since every test it skipped would look new or gone.
+"""
+import contextlib
+import json
+import os
+import sqlite3
+import time
+
+from history import natural_key
+
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    started REAL NOT NULL,
+    source_hash TEXT,
+    tests_path TEXT NOT NULL,
+    settings TEXT,
+    complete INTEGER NOT NULL DEFAULT 1
+);
+CREATE TABLE IF NOT EXISTS results (
+    run_id INTEGER NOT NULL REFERENCES runs(id) ON DELETE CASCADE,
+    test TEXT NOT NULL,
+    verdict TEXT NOT NULL,
+    cpu_time REAL,
+    memory INTEGER,
+    overhead REAL,
+    phases TEXT,
+    message TEXT,
+    PRIMARY KEY (run_id, test)
+);
+CREATE INDEX IF NOT EXISTS runs_by_tests ON runs (tests_path, id);
+'''
+
+REGRESSION_THRESHOLD = 10.0 # percent
+NOISE_FLOOR = 0.01 # seconds, smaller differences are treated as noise
+
+
+class ResultStore:
+    def __init__(self, db_path):
+        self.db_path = db_path
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        with self.connect() as connection:
+            connection.executescript(SCHEMA)
+            columns = {row['name'] for row in connection.execute('PRAGMA table_info(runs)')}
+            if 'complete' not in columns: # stores from before runs could be incomplete
+                connection.execute('ALTER TABLE runs ADD COLUMN complete INTEGER NOT NULL DEFAULT 1')
+
+    @contextlib.contextmanager
+    def connect(self):
+        connection = sqlite3.connect(self.db_path, timeout=30)
+        connection.row_factory = sqlite3.Row
+        connection.execute('PRAGMA foreign_keys = ON')
+        try:
+            with connection:
+                yield connection
+        finally:
+            connection.close()
+
+    def record_run(self, tests_path, test_results, source_hash=None, settings=None, started=None, complete=True):
+        """
+        Saves a run and its results, returns the new run id.
+        complete is False for a run that stopped before running every test.
+        """
+        with self.connect() as connection:
+            run_id = connection.execute('INSERT INTO runs (started, source_hash, tests_path, settings, complete) VALUES (?, ?, ?, ?, ?)',
+                                        (started or time.time(), source_hash, os.path.abspath(tests_path),
+                                         json.dumps(settings) if settings else None, int(complete))).lastrowid
+            connection.executemany('INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?, ?, ?)', [
+                (run_id, r['Test No.'], r['Verdict'], r.get('Elapsed'), r.get('Memory'), r.get('Overhead'),
+                 json.dumps(r['Phases']) if r.get('Phases') else None, r.get('Message') or None)
+                for r in test_results if r['Verdict'] != 'Cancelled'])
+        return run_id
+
+    def runs(self, tests_path=None, limit=20):
+        query = "SELECT runs.*, COUNT(results.test) AS tests, SUM(results.verdict = 'OK') AS passed, SUM(results.cpu_time) AS cpu_time " \
+                "FROM runs LEFT JOIN results ON results.run_id = runs.id"
+        params = []
+        if tests_path is not None:
+            query += ' WHERE runs.tests_path = ?'
+            params.append(os.path.abspath(tests_path))
+        query += ' GROUP BY runs.id ORDER BY runs.id DESC LIMIT ?'
+        params.append(limit)
+        with self.connect() as connection:
+            return [dict(row) for row in connection.execute(query, params)]
+
+    def run(self, run_id=None):
+        """
+        Returns the run with run_id, or the latest run, or None
+        """
+        with self.connect() as connection:
+            if run_id is None:
+                row = connection.execute('SELECT * FROM runs ORDER BY id DESC LIMIT 1').fetchone()
+            else:
+                row = connection.execute('SELECT * FROM runs WHERE id = ?', (run_id,)).fetchone()
+        return dict(row) if row else None
+
+    def previous_run(self, run_id):
+        """
+        Returns the last complete run before run_id on the same test folder, or None
+        """
+        with self.connect() as connection:
+            row = connection.execute('SELECT * FROM runs WHERE tests_path = (SELECT tests_path FROM runs WHERE id = ?) AND id < ? '
+                                     'AND complete ORDER BY id DESC LIMIT 1', (run_id, run_id)).fetchone()
+        return dict(row) if row else None
+
+    def results(self, run_id):
+        with self.connect() as connection:
+            return {row['test']: dict(row) for row in connection.execute('SELECT * FROM results WHERE run_id = ?', (run_id,))}
+
+    def last_results(self, tests_path):
+        """
+        Returns {test: (verdict, cpu time)} with the most recent result of every test ever run in tests_path
+        """
+        with self.connect() as connection:
+            rows = connection.execute('SELECT results.test, results.verdict, results.cpu_time FROM results '
+                                      'JOIN runs ON runs.id = results.run_id WHERE runs.tests_path = ? '
+                                      "AND results.verdict != 'ERR' ORDER BY runs.id", (os.path.abspath(tests_path),))
+            return {row['test']: (row['verdict'], row['cpu_time']) for row in rows}
+
+    def compare_runs(self, run_a, run_b):
+        """
+        Side-by-side rows for two runs: test, verdict and CPU time in each run, and the change in percent
+        """
+        results_a, results_b = self.results(run_a), self.results(run_b)
+        rows = []
+        for test in set(results_a) | set(results_b):
+            a, b = results_a.get(test), results_b.get(test)
+            time_a = a['cpu_time'] if a else None
+            time_b = b['cpu_time'] if b else None
+            change = None
+            if time_a and time_b is not None:
+                change = (time_b - time_a) / time_a * 100
+            rows.append({'test': test, 'verdict_a': a['verdict'] if a else None, 'time_a': time_a,
+                         'verdict_b': b['verdict'] if b else None, 'time_b': time_b, 'change': change})
+        rows.sort(key=lambda row: natural_key(row['test']))
+        return rows
+
+    def regressions(self, run_id=None, threshold=REGRESSION_THRESHOLD, noise_floor=NOISE_FLOOR, against=None):
+        """
+        Returns the compare_runs rows of tests that got slower by more than threshold percent
+        (and by more than noise_floor seconds) compared with the previous run on the same
+        test folder, or with run `against`. Returns None if there is nothing to compare with.
+        """
+        run = self.run(run_id)
+        if run is None:
+            return None
+        base = self.run(against) if against is not None else self.previous_run(run['id'])
+        if base is None:
+            return None
+        return [row for row in self.compare_runs(base['id'], run['id'])
+                if row['change'] is not None and row['change'] > threshold and row['time_b'] - row['time_a'] > noise_floor]
@@ -0,0 +1,184 @@
+"""
+Stress testing: a generator, a brute-force reference and the solution are run
+on random tests until they disagree.
+
+Each iteration runs
+
+    generator <seed>          prints a test to stdout
+    brute < test              the reference answer
+    solution < test           the answer being checked
+
+and compares the two answers like a normal test. Iterations run in parallel,
+one loop per worker, with everything kept in memory: inputs and outputs go
+through pipes and nothing is written to disk until a failing test is saved.
+After the first failure the search goes on for a few more iterations and the
+smallest failing input found is saved as a .in/.ok pair.
+"""
+import io
+import itertools
+import os
+import subprocess
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import compare
+from judge import watchdog
+from scheduler import CpuScheduler
+
+
+STRESS_ITERATIONS = 1000
+STRESS_TIMEOUT = 2.0 # seconds per program per iteration
+SHRINK_ITERATIONS = 200 # iterations run after the first failure, looking for a smaller one
+
+
+class StressError(Exception):
+    """
+    The generator or the brute-force reference failed, so nothing can be compared
+    """
+    pass
+
+
+def run_program(exe_path, stdin=None, args=(), timeout=STRESS_TIMEOUT):
+    """
+    Runs exe_path with stdin fed through a pipe.
+    Returns (returncode, stdout), returncode None if it timed out.
+    The shared watchdog enforces the timeout, so waiting blocks instead of
+    polling the way communicate(timeout=...) does.
+    """
+    start_time = time.perf_counter()
+    process = subprocess.Popen([exe_path, *args], stdin=subprocess.DEVNULL if stdin is None else subprocess.PIPE,
+                               stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, start_new_session=os.name != 'nt')
+    token = watchdog.watch(process, timeout)
+    try:
+        stdout, _ = process.communicate(stdin)
+    finally:
+        watchdog.unwatch(token)
+    if time.perf_counter() - start_time >= timeout:
+        return None, b''
+    return process.returncode, stdout
+
+
+class Stress:
+    def __init__(self, generator, brute, solution, jobs=None, scheduler=None, timeout=STRESS_TIMEOUT,
+                 compare_mode='tokens', epsilon=compare.EPSILON, seed=1):
+        '''
+        Parameters
+        ----------
+        generator : str
+            compiled generator, run as `generator <seed>`
+        brute : str
+            compiled brute-force reference
+        solution : str
+            compiled solution to check
+        jobs : int
+            iterations run in parallel, defaults to one per CPU
+        scheduler : CpuScheduler
+            sizes the pool and pins workers, overrides jobs
+        timeout : float
+            seconds each program may run per iteration
+        compare_mode : str
+            how the answers are compared, one of compare.MODES
+        epsilon : float
+            allowed absolute or relative error in 'float' mode
+        seed : int
+            seed of the first iteration, every next one adds 1
+        '''
+        self.generator = generator
+        self.brute = brute
+        self.solution = solution
+        self.scheduler = scheduler or CpuScheduler(jobs)
+        self.jobs = self.scheduler.workers
+        self.timeout = timeout
+        self.compare_mode = compare_mode
+        self.epsilon = epsilon
+        self.seeds = itertools.count(seed)
+        self.lock = threading.Lock()
+        self.iterations = 0
+        self.failures = []
+        self.error = None
+        self.stop_at = None # iteration count at which to stop once a failure is found
+
+    def iteration(self, seed):
+        """
+        Runs one generate, brute, solve, compare round.
+        Returns None if the solution agrees, otherwise a failure dict.
+        """
+        returncode, test = run_program(self.generator, args=(str(seed),), timeout=self.timeout)
+        if returncode != 0:
+            raise StressError(f'generator failed on seed {seed}' + ('' if returncode is None else f' with exit code {returncode}'))
+        returncode, expected = run_program(self.brute, test, timeout=self.timeout)
+        if returncode != 0:
+            raise StressError(f'brute force failed on seed {seed}' + ('' if returncode is None else f' with exit code {returncode}'))
+
+        returncode, output = run_program(self.solution, test, timeout=self.timeout)
+        if returncode is None:
+            verdict, message = 'TLE', f'timed out after {self.timeout}s'
+        elif returncode != 0:
+            verdict, message = 'RE', f'exit code {returncode}'
+        else:
+            passed, message = compare.compare(io.BytesIO(output), io.BytesIO(expected), self.compare_mode, self.epsilon)
+            if passed:
+                return None
+            verdict = 'WA'
+        return {'seed': seed, 'verdict': verdict, 'message': message, 'input': test, 'expected': expected}
+
+    def worker(self, iterations, shrink):
+        while True:
+            with self.lock:
+                limit = iterations if self.stop_at is None else min(iterations, self.stop_at)
+                if self.error is not None or self.iterations >= limit:
+                    return
+                self.iterations += 1
+                seed = next(self.seeds)
+            try:
+                failure = self.iteration(seed)
+            except StressError as e:
+                with self.lock:
+                    self.error = self.error or e
+                return
+            if failure is not None:
+                with self.lock:
+                    self.failures.append(failure)
+                    if self.stop_at is None:
+                        self.stop_at = self.iterations + shrink
+
+    def run(self, iterations=STRESS_ITERATIONS, shrink=SHRINK_ITERATIONS):
+        """
+        Runs until the solution fails (plus shrink more iterations) or iterations is reached.
+        Returns the smallest failure dict, or None if every iteration agreed.
+        Raises StressError if the generator or the brute force fails.
+        """
+        with ThreadPoolExecutor(max_workers=self.jobs, thread_name_prefix='judgee-stress',
+                                initializer=self.scheduler.pin_worker) as executor:
+            for future in [executor.submit(self.worker, iterations, shrink) for _ in range(self.jobs)]:
+                future.result()
+        if self.error is not None:
+            raise self.error
+        if not self.failures:
+            return None
+        return min(self.failures, key=lambda failure: (len(failure['input']), failure['seed']))
+
+
+def save_failure(failure, folder_path, name=None):
+    """
+    Writes the input and the brute-force answer of failure as <name>.in/.ok in folder_path.
+    Returns the path of the .in file.
+    """
+    os.makedirs(folder_path, exist_ok=True)
+    name = name or f"stress-{failure['seed']}"
+    with open(os.path.join(folder_path, name + '.in'), 'wb') as f:
+        f.write(failure['input'])
+    with open(os.path.join(folder_path, name + '.ok'), 'wb') as f:
+        f.write(failure['expected'])
+    return os.path.join(folder_path, name + '.in')
+
+
+def stress(generator, brute, solution, iterations=STRESS_ITERATIONS, shrink=SHRINK_ITERATIONS, **options):
+    """
+    Runs a Stress over compiled binaries and returns (smallest failure or None, iterations run, seconds)
+    """
+    runner = Stress(generator, brute, solution, **options)
+    start_time = time.perf_counter()
+    failure = runner.run(iterations, shrink)
+    return failure, runner.iterations, time.perf_counter() - start_time
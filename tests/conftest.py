@@ -0,0 +1,36 @@
+import os
+import sys
+import tempfile
+
+import pytest
+
+# the modules live at the top of the repository, and every test builds into a cache of its own
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ['JUDGEE_HOME'] = tempfile.mkdtemp(prefix='judgee-tests-')
+
+import judge  # noqa: E402
+
+
+@pytest.fixture(scope='session')
+def compiler():
+    compiler = judge.find_compiler()
+    if compiler is None:
+        pytest.skip('needs g++ on PATH')
+    return compiler
+
+
+@pytest.fixture
+def build(compiler):
+    def build(cpp_code):
+        return judge.compile_source(cpp_code, compiler, flags=('-O2',))
+    return build
+
+
+def write_tests(folder, tests):
+    """
+    Writes {test: (input, answer)} as .in/.ok files into folder
+    """
+    for test, (data, answer) in tests.items():
+        (folder / f'{test}.in').write_text(data)
+        (folder / f'{test}.ok').write_text(answer)
+    return str(folder)
@@ -0,0 +1,121 @@
+import io
+
+import pytest
+
+import compare
+from compare import CHUNK_SIZE
+
+
+@pytest.fixture(params=['memory', 'file'])
+def opened(request, tmp_path):
+    """
+    Opens bytes as a BytesIO, or as a real file that has a descriptor
+    """
+    files = []
+
+    def opened(data):
+        if request.param == 'memory':
+            return io.BytesIO(data)
+        path = tmp_path / f'{len(files)}.txt'
+        path.write_bytes(data)
+        files.append(open(path, 'rb'))
+        return files[-1]
+    yield opened
+    for f in files:
+        f.close()
+
+
+def check(opened, output, expected, mode, epsilon=compare.EPSILON):
+    return compare.compare(opened(output), opened(expected), mode, epsilon)
+
+
+@pytest.mark.parametrize('mode', compare.MODES)
+def test_identical_outputs_match(opened, mode):
+    assert check(opened, b'1 2 3\n4.5\n', b'1 2 3\n4.5\n', mode) == (True, '')
+
+
+def test_exact_treats_crlf_as_lf(opened):
+    assert check(opened, b'1\r\n2\r\n', b'1\n2\n', 'exact') == (True, '')
+
+
+def test_exact_crlf_across_chunks(opened):
+    line = b'x' * (CHUNK_SIZE - 1)
+    assert check(opened, line + b'\r\n' + line + b'\r\n', line + b'\n' + line + b'\n', 'exact') == (True, '')
+
+
+def test_exact_reports_trailing_whitespace(opened):
+    assert check(opened, b'1 2 \n', b'1 2\n', 'exact') == (False, 'byte 3 differs')
+    assert check(opened, b'1 2\n\n', b'1 2\n', 'exact') == (False, 'output is longer at byte 4')
+    assert check(opened, b'1 2', b'1 2\n', 'exact') == (False, 'output ends early at byte 3')
+
+
+def test_tokens_ignore_spacing(opened):
+    assert check(opened, b'1  2\t3 \r\n\n\n', b'1 2 3\n', 'tokens') == (True, '')
+    assert check(opened, b'1 2 3', b'1\n2\n3\n\n', 'tokens') == (True, '')
+
+
+def test_tokens_report_the_first_difference(opened):
+    assert check(opened, b'1 2 4\n', b'1 2 3\n', 'tokens') == (False, "token 1 after byte 4: expected '3', found '4'")
+    assert check(opened, b'1 2\n', b'1 2 3\n', 'tokens') == (False, "output ends early, expected '3'")
+    assert check(opened, b'1 2 3 4\n', b'1 2 3\n', 'tokens') == (False, "output is longer, found extra '4'")
+
+
+def test_tokens_split_across_chunks(opened):
+    prefix = b'7 ' * (CHUNK_SIZE // 2 - 1) + b'1'
+    # the token '123' starts one byte before a chunk border
+    assert check(opened, prefix + b'23\n', b'7 ' * (CHUNK_SIZE // 2 - 1) + b'123 \n', 'tokens') == (True, '')
+    matched, message = check(opened, prefix + b'24\n', prefix + b'23\n', 'tokens')
+    assert not matched and message.endswith("expected '123', found '124'")
+
+
+def test_identical_bytes_are_not_tokenized(opened, monkeypatch):
+    def tokens(stream):
+        raise AssertionError('identical outputs were tokenized')
+    monkeypatch.setattr(compare, 'tokens', tokens)
+    data = b'42 ' * CHUNK_SIZE
+    assert check(opened, data, data, 'tokens') == (True, '')
+    assert check(opened, data, data, 'float') == (True, '')
+
+
+def test_common_prefix_backs_up_to_the_token(opened):
+    output, expected = opened(b'10 20 345\n'), opened(b'10 20 346\n')
+    assert compare._common_prefix(output, expected) == 8
+    assert compare._token_start(output, expected) == 6
+    assert output.read() == b'345\n' and expected.read() == b'346\n'
+
+
+def test_common_prefix_of_different_lengths(opened):
+    assert compare._common_prefix(opened(b'abc'), opened(b'abcdef')) == 3
+    assert compare._common_prefix(opened(b''), opened(b'')) is None
+
+
+def test_difference_after_a_long_prefix_is_found(opened):
+    prefix = b'1 ' * (3 * CHUNK_SIZE)
+    assert check(opened, prefix + b'2\n', prefix + b'3\n', 'tokens') == (
+        False, f"token 1 after byte {len(prefix)}: expected '3', found '2'")
+
+
+def test_float_tolerance(opened):
+    assert check(opened, b'1.0000001 2\n', b'1 2\n', 'float') == (True, '')
+    assert check(opened, b'1000000.5\n', b'1000000\n', 'float') == (True, '') # relative
+    assert check(opened, b'1.1\n', b'1\n', 'float')[0] is False
+    assert check(opened, b'1.01\n', b'1\n', 'float', epsilon=0.1) == (True, '')
+    assert check(opened, b'nan\n', b'nan\n', 'float') == (True, '') # identical bytes
+    assert check(opened, b'nan\n', b'1\n', 'float')[0] is False
+    assert check(opened, b'yes\n', b'YES\n', 'float')[0] is False
+
+
+def test_tokens_mode_has_no_tolerance(opened):
+    assert check(opened, b'1.0\n', b'1\n', 'tokens')[0] is False
+
+
+def test_big_files_are_mapped(opened, monkeypatch):
+    monkeypatch.setattr(compare, 'MMAP_THRESHOLD', CHUNK_SIZE)
+    data = b'5 ' * (2 * CHUNK_SIZE)
+    assert check(opened, data + b'6\r\n', data + b'6\n', 'exact') == (True, '')
+    assert check(opened, data + b'6\n', data + b'7\n', 'tokens')[0] is False
+
+
+def test_unknown_mode():
+    with pytest.raises(ValueError):
+        compare.compare(io.BytesIO(), io.BytesIO(), 'fuzzy')
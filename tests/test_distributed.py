@@ -0,0 +1,121 @@
+import hashlib
+import io
+import os
+import socket
+import threading
+import time
+
+import pytest
+
+import distributed
+import judge
+from conftest import write_tests
+
+
+@pytest.fixture
+def worker():
+    server = distributed.WorkerServer(port=0, jobs=2, token='secret')
+    thread = threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+    yield f'127.0.0.1:{server.server_address[1]}'
+    server.shutdown()
+    server.server_close()
+
+
+def handshake(address, start, *payloads):
+    """
+    Says hello to the worker, sends start (and payloads after a 'need') and returns its reply
+    """
+    with socket.create_connection(distributed.parse_address(address), timeout=10) as sock:
+        stream = sock.makefile('rwb')
+        hello, _ = distributed.receive(stream)
+        assert hello['type'] == 'hello' and hello['version'] == distributed.PROTOCOL_VERSION
+        distributed.send(stream, dict({'type': 'start', 'token': 'secret'}, **start))
+        reply, _ = distributed.receive(stream)
+        if reply is not None and reply['type'] == 'need' and payloads:
+            distributed.send(stream, {'type': 'binary'}, *payloads)
+            reply, _ = distributed.receive(stream)
+        return reply
+
+
+def test_messages_carry_their_payloads():
+    stream = io.BytesIO()
+    distributed.send(stream, {'type': 'test', 'id': 1}, b'1 2\n', b'')
+    distributed.send(stream, {'type': 'done'})
+    stream.seek(0)
+    assert distributed.receive(stream) == ({'type': 'test', 'id': 1, 'sizes': [4, 0]}, [b'1 2\n', b''])
+    assert distributed.receive(stream) == ({'type': 'done'}, [])
+    assert distributed.receive(stream) == (None, [])
+
+
+def test_truncated_payload_is_a_closed_connection():
+    stream = io.BytesIO(b'{"type": "binary", "sizes": [10]}\nshort')
+    assert distributed.receive(stream) == (None, [])
+
+
+@pytest.mark.parametrize('sha256', ['../../../tmp/judgee-escape', '/etc/passwd', 'A' * 64, 'a' * 63, 'a' * 65, 42, None])
+def test_worker_rejects_hashes_that_are_not_digests(worker, sha256):
+    reply = handshake(worker, {'sha256': sha256})
+    assert reply['type'] == 'error'
+    assert not os.path.exists('/tmp/judgee-escape')
+
+
+def test_binary_path_only_takes_digests():
+    with pytest.raises(ValueError):
+        distributed.binary_path('../escape')
+    digest = hashlib.sha256(b'').hexdigest()
+    assert os.path.dirname(distributed.binary_path(digest)) == os.path.join(judge.JUDGEE_HOME, 'remote')
+
+
+def test_worker_rejects_wrong_token(worker):
+    reply = handshake(worker, {'token': 'guess', 'sha256': hashlib.sha256(b'x').hexdigest()})
+    assert reply == {'type': 'error', 'message': 'wrong token'}
+
+
+def test_worker_rejects_binary_that_does_not_match_its_hash(worker):
+    reply = handshake(worker, {'sha256': hashlib.sha256(b'expected').hexdigest()}, b'something else')
+    assert reply['type'] == 'error'
+
+
+def test_tests_run_on_the_worker(worker, build, tmp_path):
+    exe_path = build('#include <cstdio>\nint main() { int a, b; scanf("%d %d", &a, &b); printf("%d\\n", a + b); }')
+    tests = write_tests(tmp_path, {'1': ('1 2\n', '3\n'), '2': ('2 2\n', '5\n')})
+    runner = judge.Judge(exe_path, workers=[worker], token='secret', record=False)
+    results = {result['Test No.']: result for result in runner.run_all(tests)}
+    assert results['1']['Verdict'] == 'OK'
+    assert results['2']['Verdict'] == 'WA'
+    assert results['1']['Node'].endswith(worker.rpartition(':')[2])
+
+
+def test_cancelled_run_leaves_the_worker_serving(worker, build, tmp_path, caplog, capfd):
+    exe_path = build('#include <cstdio>\n#include <unistd.h>\n'
+                     'int main() { int a, b; scanf("%d %d", &a, &b); usleep(200000); printf("%d\\n", a - b); }')
+    tests = write_tests(tmp_path, {str(i): (f'{i} 1\n', f'{i + 1}\n') for i in range(1, 21)})
+    # every test fails, so the run stops at the first verdict with tests queued on the worker
+    runner = judge.Judge(exe_path, workers=[worker], token='secret', record=False)
+    results = runner.run_all(tests, order='name', fail_fast=True)
+    assert results and len(results) < 20
+
+    folder = tmp_path / 'again'
+    folder.mkdir()
+    runner = judge.Judge(exe_path, workers=[worker], token='secret', record=False)
+    results = runner.run_all(write_tests(folder, {'1': ('3 1\n', '2\n')}))
+    assert [result['Verdict'] for result in results] == ['OK']
+    assert not [record for record in caplog.records if record.levelname in ('ERROR', 'CRITICAL')]
+    assert 'Traceback' not in capfd.readouterr().err
+
+
+def test_tests_are_sent_while_a_slow_one_runs(worker, build, tmp_path):
+    exe_path = build('#include <cstdio>\n#include <unistd.h>\n'
+                     'int main() { int ms; scanf("%d", &ms); usleep(ms * 1000); printf("%d\\n", ms); }')
+    write_tests(tmp_path, {'slow': ('1500\n', '1500\n'), 'fast': ('0\n', '0\n')})
+    pool = distributed.RemotePool([worker], exe_path, {'runtime': 5.0}, token='secret')
+    try:
+        slow = pool.submit(str(tmp_path / 'slow.in'), str(tmp_path / 'slow.ok'), 'slow')
+        time.sleep(0.2) # the slow test is on the worker before the fast one is submitted
+        fast = pool.submit(str(tmp_path / 'fast.in'), str(tmp_path / 'fast.ok'), 'fast')
+        assert fast.result(timeout=1)['Verdict'] == 'OK'
+        assert not slow.done()
+        assert slow.result(timeout=5)['Verdict'] == 'OK'
+    finally:
+        pool.shutdown()
@@ -0,0 +1,110 @@
+import os
+
+import pytest
+
+import judge
+from conftest import write_tests
+from interactor import Interactor
+
+
+pytestmark = pytest.mark.skipif(os.name == 'nt', reason='signals are POSIX only')
+
+# guess the number in the input, the interactor answers <, > or =
+GUESS = r'''
+#include <cstdio>
+int main(int argc, char **argv) {
+    FILE *f = fopen(argv[1], "r");
+    int secret;
+    fscanf(f, "%d", &secret);
+    for (int queries = 0; queries < 30; queries++) {
+        int guess;
+        if (scanf("%d", &guess) != 1) {
+            fprintf(stderr, "no answer at %d", queries);
+            return 1;
+        }
+        printf("%s\n", guess < secret ? "<" : guess > secret ? ">" : "=");
+        fflush(stdout);
+        if (guess == secret)
+            return 0;
+    }
+    fprintf(stderr, "too many queries");
+    return 1;
+}
+'''
+
+# reads one query, then sends more than a pipe holds, so it writes on after the solution exits
+CHATTY = r'''
+#include <cstdio>
+int main() {
+    int query;
+    scanf("%d", &query);
+    for (int i = 0; i < 1 << 20; i++)
+        putchar('.');
+    return 0;
+}
+'''
+
+SEARCH = r'''
+#include <cstdio>
+#include <cstdlib>
+int main() {
+    int low = 1, high = 1000000;
+    for (int queries = 0; ; queries++) {
+        int guess = (low + high) / 2;
+        printf("%d\n", guess);
+        fflush(stdout);
+        char reply[2];
+        scanf("%1s", reply);
+        if (CRASH && queries == 2)
+            abort();
+        if (reply[0] == '=')
+            return 0;
+        if (reply[0] == '<')
+            low = guess + 1;
+        else
+            high = guess - 1;
+    }
+}
+'''
+
+
+@pytest.fixture
+def tests(tmp_path):
+    return write_tests(tmp_path, {'1': ('123456\n', '\n'), '2': ('999\n', '\n')})
+
+
+def run(build, solution, interactor, tests):
+    runner = judge.Judge(build(solution), jobs=2, record=False, interactor=Interactor(build(interactor)))
+    return {result['Test No.']: result for result in runner.run_all(tests)}
+
+
+def test_solution_that_finds_the_number_passes(build, tests):
+    results = run(build, '#define CRASH 0\n' + SEARCH, GUESS, tests)
+    assert {test: result['Verdict'] for test, result in results.items()} == {'1': 'OK', '2': 'OK'}
+
+
+def test_solution_that_gives_up_is_wrong(build, tests):
+    results = run(build, '#include <cstdio>\nint main() { printf("1\\n"); }', GUESS, tests)
+    # the interactor either finds no second query or breaks its pipe answering the first
+    assert results['1']['Verdict'] == 'WA'
+
+
+def test_crash_mid_protocol_is_re(build, tests):
+    results = run(build, '#define CRASH 1\n' + SEARCH, GUESS, tests)
+    assert {test: result['Verdict'] for test, result in results.items()} == {'1': 'RE', '2': 'RE'}
+
+
+def test_interactor_killed_by_broken_pipe(build, tests):
+    results = run(build, '#include <cstdlib>\n#include <cstdio>\nint main() { printf("1\\n"); fflush(stdout); abort(); }',
+                  CHATTY, tests)
+    assert results['1']['Verdict'] == 'RE'
+    results = run(build, '#include <cstdio>\nint main() { printf("1\\n"); }', CHATTY, tests)
+    assert results['1']['Verdict'] == 'WA'
+
+
+def test_solution_killed_by_broken_pipe_gets_the_interactors_verdict(build, tests):
+    rejecting = '#include <cstdio>\nint main() { int query; scanf("%d", &query); fprintf(stderr, "wrong"); return 1; }'
+    flooding = '#include <cstdio>\nint main() { for (int i = 0; i < 1 << 22; i++) printf("%d\\n", i); }'
+    results = run(build, flooding, rejecting, tests)
+    assert results['1']['Verdict'] == 'WA'
+    assert results['1']['Message'] == 'wrong'
@@ -0,0 +1,73 @@
+import os
+
+import pytest
+
+import judge
+from conftest import write_tests
+
+
+pytestmark = pytest.mark.skipif(not hasattr(os, 'wait4'), reason='memory is only measured with wait4')
+
+A_PLUS_B = r'''
+#include <cstdio>
+int main() {
+    long long a, b;
+    if (scanf("%lld %lld", &a, &b) == 2)
+        printf("%lld\n", a + b);
+}
+'''
+
+ALLOCATE = r'''
+#include <cstdio>
+#include <vector>
+int main() {
+    std::vector<char> memory(%d << 20, 1);
+    long long a, b;
+    scanf("%%lld %%lld", &a, &b);
+    printf("%%lld\n", a + b + memory.back() - 1);
+}
+'''
+
+
+@pytest.fixture
+def ballast():
+    # the harness holds more than the memory limit of the tests
+    data = bytearray(96 * 2**20)
+    for i in range(0, len(data), 4096):
+        data[i] = 1
+    return data
+
+
+@pytest.fixture
+def tests(tmp_path):
+    return write_tests(tmp_path, {'1': ('1 2\n', '3\n')})
+
+
+def run(exe_path, tests, memory_limit):
+    runner = judge.Judge(exe_path, jobs=1, memory_limit=memory_limit, record=False)
+    [result] = runner.run_all(tests)
+    return result
+
+
+def test_trivial_program_is_not_charged_for_the_harness(build, tests, ballast):
+    result = run(build(A_PLUS_B), tests, 64 * 2**20)
+    assert result['Verdict'] == 'OK'
+    assert result['Memory'] < 16 * 2**20
+
+
+def test_peak_memory_is_the_programs(build, tests, ballast):
+    result = run(build(ALLOCATE % 40), tests, 256 * 2**20)
+    assert result['Verdict'] == 'OK'
+    assert 40 * 2**20 <= result['Memory'] < 64 * 2**20
+
+
+def test_over_the_limit_is_mle(build, tests):
+    result = run(build(ALLOCATE % 200), tests, 64 * 2**20)
+    assert result['Verdict'] == 'MLE'
+
+
+def test_runaway_program_is_killed_at_the_time_limit(build, tests):
+    exe_path = build('int main() { volatile unsigned long x = 0; for (;;) x++; }')
+    runner = judge.Judge(exe_path, runtime=0.5, jobs=1, record=False)
+    [result] = runner.run_all(tests)
+    assert result['Verdict'] == 'TLE'
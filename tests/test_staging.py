@@ -0,0 +1,126 @@
+import time
+
+import judge
+import staging
+from conftest import write_tests
+from staging import InputStager, StagedInput
+
+
+def make_inputs(folder, sizes):
+    """
+    Writes one input per size and returns the (test number, input, answer) the stager takes
+    """
+    tests = []
+    for i, size in enumerate(sizes, 1):
+        path = folder / f'{i}.in'
+        path.write_bytes(b'x' * size)
+        tests.append((str(i), str(path), str(folder / f'{i}.ok')))
+    return tests
+
+
+def wait_until(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+
+
+def test_inputs_are_copied_and_the_budget_is_given_back(tmp_path):
+    stager = InputStager(make_inputs(tmp_path, [100, 200, 300]), budget=1000)
+    taken = list(stager)
+    assert [test_number for test_number, _, _ in taken] == ['1', '2', '3']
+    assert [in_file.size for _, in_file, _ in taken] == [100, 200, 300]
+    assert stager.used == 600
+    assert taken[1][1].open().read() == b'x' * 200
+    for _, in_file, _ in taken:
+        stager.release(in_file)
+        assert in_file.spooled.closed
+    assert stager.used == 0
+    stager.close()
+
+
+def test_stager_waits_for_room_in_the_budget(tmp_path):
+    stager = InputStager(make_inputs(tmp_path, [400, 400, 400]), budget=1000)
+    tests = iter(stager)
+    first, second = next(tests), next(tests)
+    time.sleep(0.1)
+    # the third doesn't fit until a test is done with its input
+    assert not stager.staged and stager.used == 800
+    stager.release(first[1])
+    third = next(tests)
+    assert third[0] == '3' and stager.used == 800
+    stager.release(second[1])
+    stager.release(third[1])
+    assert stager.used == 0
+    stager.close()
+
+
+def test_input_bigger_than_the_budget_is_only_prefetched(tmp_path):
+    stager = InputStager(make_inputs(tmp_path, [2000, 100]), budget=1000)
+    (_, big, _), (_, small, _) = list(stager)
+    assert isinstance(big, StagedInput) and big.spooled is None and big.size == 0
+    assert big.open().read() == b'x' * 2000
+    assert small.size == 100 and stager.used == 100
+    stager.close()
+
+
+def test_unreadable_input_is_passed_through(tmp_path):
+    missing = str(tmp_path / 'missing.in')
+    stager = InputStager([('1', missing, None)], budget=1000)
+    assert list(stager) == [('1', missing, None)]
+    assert stager.used == 0
+    stager.close()
+
+
+def test_close_frees_inputs_nobody_took(tmp_path):
+    stager = InputStager(make_inputs(tmp_path, [10] * 5), budget=1000)
+    wait_until(lambda: stager.finished)
+    queued = [in_file for _, in_file, _ in stager.staged]
+    stager.close()
+    assert queued and all(in_file.spooled.closed for in_file in queued)
+    assert stager.used == 0
+
+
+def test_close_while_an_input_is_being_copied_frees_it(tmp_path, monkeypatch):
+    copied = []
+    real_stage = staging.stage
+
+    def stage(path, size, copy):
+        staged = real_stage(path, size, copy)
+        copied.append(staged)
+        with stager.condition:
+            stager.closed = True # close() arriving in the middle of the copy
+        return staged
+
+    monkeypatch.setattr(staging, 'stage', stage)
+    stager = InputStager(make_inputs(tmp_path, [10, 10]), budget=1000)
+    stager.thread.join()
+    assert len(copied) == 1 and copied[0].spooled.closed
+    assert not stager.staged and stager.used == 0
+
+
+def test_cancelled_tests_give_their_inputs_back(build, tmp_path, monkeypatch):
+    stagers = []
+
+    class RecordingStager(InputStager):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            stagers.append(self)
+            self.taken = []
+
+        def __iter__(self):
+            for test in super().__iter__():
+                self.taken.append(test[1])
+                yield test
+
+    monkeypatch.setattr(judge, 'InputStager', RecordingStager)
+    exe_path = build('#include <cstdio>\nint main() { int a; scanf("%d", &a); printf("%d\\n", a); }')
+    # every answer is wrong, so the run stops at the first verdict with tests still queued
+    tests = write_tests(tmp_path, {str(i): (f'{i}\n', '0\n') for i in range(1, 41)})
+    runner = judge.Judge(exe_path, jobs=2, record=False, staging_budget=2**20)
+    results = runner.run_all(tests, order='name', fail_fast=True)
+    assert results and len(results) < 40
+    [stager] = stagers
+    assert stager.used == 0
+    assert len(stager.taken) > len(results)
+    assert all(in_file.spooled.closed for in_file in stager.taken)
@@ -0,0 +1,49 @@
+import sqlite3
+
+import judge
+from conftest import write_tests
+from store import ResultStore
+
+
+def results(times):
+    return [{'Test No.': test, 'Verdict': 'OK', 'Elapsed': time} for test, time in times.items()]
+
+
+def test_previous_run_skips_runs_that_stopped_early(tmp_path):
+    store = ResultStore(str(tmp_path / 'results.db'))
+    full = store.record_run('tests', results({'1': 0.1, '2': 1.0}))
+    store.record_run('tests', results({'1': 0.1}), complete=False)
+    latest = store.record_run('tests', results({'1': 0.1, '2': 2.0}))
+    assert store.previous_run(latest)['id'] == full
+    assert [row['test'] for row in store.regressions(latest)] == ['2']
+    # a stopped run still orders the next one
+    assert store.last_results('tests') == {'1': ('OK', 0.1), '2': ('OK', 2.0)}
+
+
+def test_old_stores_get_the_complete_column(tmp_path):
+    path = str(tmp_path / 'results.db')
+    with sqlite3.connect(path) as connection:
+        connection.execute('CREATE TABLE runs (id INTEGER PRIMARY KEY AUTOINCREMENT, started REAL NOT NULL, '
+                           'source_hash TEXT, tests_path TEXT NOT NULL, settings TEXT)')
+        connection.execute("INSERT INTO runs (started, tests_path) VALUES (0, 'tests')")
+    connection.close()
+    store = ResultStore(path)
+    assert store.run(1)['complete'] == 1
+
+
+def test_fail_fast_run_is_saved_as_incomplete(build, tmp_path, monkeypatch):
+    store = ResultStore(str(tmp_path / 'results.db'))
+    monkeypatch.setattr(judge, 'get_store', lambda: store)
+    exe_path = build('#include <cstdio>\nint main() { int a; scanf("%d", &a); printf("%d\\n", a); }')
+    folder = tmp_path / 'tests'
+    folder.mkdir()
+    tests = write_tests(folder, {str(i): (f'{i}\n', f'{i}\n' if i > 1 else '0\n') for i in range(1, 30)})
+
+    runner = judge.Judge(exe_path, jobs=1)
+    runner.run_all(tests, order='name', fail_fast=True)
+    assert store.run(runner.run_id)['complete'] == 0
+
+    runner = judge.Judge(exe_path, jobs=1)
+    runner.run_all(tests, order='name')
+    assert store.run(runner.run_id)['complete'] == 1
+    assert store.previous_run(runner.run_id) is None
@@ -0,0 +1,91 @@
+import io
+import tarfile
+
+import pytest
+
+import judge
+from testsource import TarSource, open_answer, open_input, open_tests
+
+
+def write_tar(path, members, mode='w:gz'):
+    """
+    Writes [(name, data)] in that order, data None for a directory
+    """
+    with tarfile.open(path, mode) as tar:
+        for name, data in members:
+            info = tarfile.TarInfo(name)
+            if data is None:
+                info.type = tarfile.DIRTYPE
+                tar.addfile(info)
+            else:
+                info.size = len(data)
+                tar.addfile(info, io.BytesIO(data))
+    return str(path)
+
+
+def read_tests(source):
+    tests = []
+    for test_number, in_file, out_file in source.tests():
+        with open_input(in_file) as f:
+            data = f.read()
+        try:
+            with open_answer(out_file) as f:
+                answer = f.read()
+        except FileNotFoundError:
+            answer = None
+        tests.append((test_number, data, answer))
+    return tests
+
+
+def test_pairs_are_yielded_as_soon_as_both_files_are_read(tmp_path):
+    path = write_tar(tmp_path / 'tests.tar.gz', [
+        ('tests', None),
+        ('tests/2.in', b'in 2'),
+        ('tests/1.ok', b'ok 1'),
+        ('tests/2.ok', b'ok 2'),
+        ('tests/readme.txt', b'not a test'),
+        ('tests/1.in', b'in 1'),
+        ('tests/10.in', b'in 10'),
+        ('tests/10.ok', b'ok 10'),
+    ])
+    with open_tests(path) as source:
+        assert isinstance(source, TarSource) and not source.random_access and source.names() is None
+        assert read_tests(source) == [('2', b'in 2', b'ok 2'), ('1', b'in 1', b'ok 1'), ('10', b'in 10', b'ok 10')]
+
+
+def test_unpaired_files_come_last(tmp_path):
+    path = write_tar(tmp_path / 'tests.tar', [
+        ('10.in', b'in 10'),
+        ('3.ok', b'only an answer'),
+        ('2.in', b'in 2'),
+        ('1.in', b'in 1'),
+        ('1.ok', b'ok 1'),
+    ], mode='w')
+    with open_tests(path) as source:
+        # inputs without an answer in natural order, answers without an input are dropped
+        assert read_tests(source) == [('1', b'in 1', b'ok 1'), ('2', b'in 2', None), ('10', b'in 10', None)]
+
+
+def test_first_tests_are_read_before_the_rest_of_the_archive(tmp_path):
+    path = tmp_path / 'tests.tar.gz'
+    write_tar(path, [('1.in', b'1'), ('1.ok', b'1')] + [(f'{i}.{ext}', bytes(64 * 1024)) for i in range(2, 50) for ext in ('in', 'ok')])
+    data = path.read_bytes()
+    path.write_bytes(data[:len(data) // 2]) # cut off in the middle
+    with open_tests(str(path)) as source:
+        tests = source.tests()
+        assert next(tests)[0] == '1'
+        with pytest.raises((tarfile.TarError, EOFError, OSError)):
+            list(tests)
+
+
+def test_streamed_archive_is_judged(build, tmp_path):
+    exe_path = build('#include <cstdio>\nint main() { int a, b; scanf("%d %d", &a, &b); printf("%d\\n", a + b); }')
+    path = write_tar(tmp_path / 'tests.tar.gz', [
+        ('1.ok', b'3\n'), ('1.in', b'1 2\n'),
+        ('2.in', b'2 2\n'), ('2.ok', b'5\n'),
+        ('3.in', b'0 0\n'),
+    ])
+    runner = judge.Judge(exe_path, jobs=2, record=False)
+    results = {result['Test No.']: result['Verdict'] for result in runner.run_all(path)}
+    assert results['1'] == 'OK' and results['2'] == 'WA'
+    assert results['3'] == 'ERR'
@@ -0,0 +1,232 @@
+"""
+Where the tests of a run come from: a folder of .in/.ok files, or a .zip or
+.tar (.tar.gz, .tgz, .tar.bz2, .tar.xz) archive of them, read in place.
+
+Nothing is extracted to disk. Zip members are opened on demand, so tests can
+still run in any order. Compressed tars can only be read front to back, so
+their tests are handed out in archive order as soon as both files of a test
+have been read, each file kept in an anonymous in-memory file until its test
+has run (so a tar holding every input before every answer is held in memory
+whole).
+
+zipfile and tarfile (with the compression modules behind it) are imported
+when an archive is met, judging a folder doesn't load them.
+
+A test's files are either paths (folders) or members with an open() method
+(archives); open_input and open_answer accept both.
+"""
+import io
+import os
+import shutil
+import tempfile
+
+from history import natural_key
+
+
+def anonymous_file(name):
+    """
+    Returns a read/write binary file that never shows up on disk: a memfd on Linux,
+    an already-unlinked temporary file elsewhere
+    """
+    if hasattr(os, 'memfd_create'):
+        return os.fdopen(os.memfd_create(name, os.MFD_CLOEXEC), 'w+b')
+    return tempfile.TemporaryFile()
+
+
+def spool(f, name='judgee-test'):
+    """
+    Copies the rest of f into an anonymous file and returns it rewound
+    """
+    spooled = anonymous_file(name)
+    shutil.copyfileobj(f, spooled, 1 << 20)
+    spooled.seek(0)
+    return spooled
+
+
+def _has_fileno(f):
+    try:
+        f.fileno()
+    except (AttributeError, OSError, io.UnsupportedOperation):
+        return False
+    return True
+
+
+def open_input(file):
+    """
+    Opens a test input for reading, as a file with a real descriptor that can be a process's stdin
+    """
+    f = open(file, 'rb') if isinstance(file, str) else file.open()
+    if _has_fileno(f):
+        return f
+    with f:
+        return spool(f, 'judgee-in')
+
+
+def open_answer(file):
+    """
+    Opens an expected output for reading. Archive members are streamed, not copied.
+    """
+    return open(file, 'rb') if isinstance(file, str) else file.open()
+
+
+def _split(member_name):
+    """
+    Returns (test number, extension) of an archive member path, like the file names in a folder
+    """
+    base = member_name.replace('\\', '/').rsplit('/', 1)[-1]
+    return base.split('.')[0], base.rsplit('.', 1)[-1] if '.' in base else ''
+
+
+class Member:
+    """
+    A file inside an archive, opened when its test runs
+    """
+    def __init__(self, opener, name):
+        self.opener = opener
+        self.name = name
+
+    def open(self):
+        return self.opener()
+
+    def __str__(self):
+        return self.name
+
+
+class SpooledMember(Member):
+    """
+    A file already read out of a streamed archive, handed over once
+    """
+    def __init__(self, spooled, name):
+        super().__init__(None, name)
+        self.spooled = spooled
+
+    def open(self):
+        self.spooled.seek(0)
+        return self.spooled
+
+
+def _missing(name):
+    def opener():
+        raise FileNotFoundError(f'{name} is not in the archive')
+    return Member(opener, name)
+
+
+class TestSource:
+    random_access = True # tests can be run in any order
+
+    def __init__(self, path):
+        self.path = os.path.abspath(path)
+
+    def names(self):
+        """
+        The natural-sorted test numbers, or None if they are only known after reading everything
+        """
+        raise NotImplementedError
+
+    def tests(self, names=None):
+        """
+        Yields (test number, input, answer) for names, or for every test in the
+        source's own order when names is None
+        """
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class FolderSource(TestSource):
+    def names(self):
+        return sorted((file.split('.')[0] for file in os.listdir(self.path) if file.endswith(".in")), key=natural_key)
+
+    def tests(self, names=None):
+        for test_number in self.names() if names is None else names:
+            yield test_number, f'{self.path}/{test_number}.in', f'{self.path}/{test_number}.ok'
+
+
+class ZipSource(TestSource):
+    def __init__(self, path):
+        super().__init__(path)
+        import zipfile
+        self.zip = zipfile.ZipFile(path)
+        self.members = {}
+        for info in self.zip.infolist():
+            if info.is_dir():
+                continue
+            test_number, extension = _split(info.filename)
+            if extension in ('in', 'ok'):
+                self.members.setdefault(test_number, {})[extension] = info
+
+    def names(self):
+        return sorted((test_number for test_number, files in self.members.items() if 'in' in files), key=natural_key)
+
+    def member(self, test_number, extension):
+        info = self.members.get(test_number, {}).get(extension)
+        if info is None:
+            return _missing(f'{test_number}.{extension}')
+        # ZipFile serializes reads of the shared archive, so workers can open members concurrently
+        return Member(lambda: self.zip.open(info), info.filename)
+
+    def tests(self, names=None):
+        for test_number in self.names() if names is None else names:
+            yield test_number, self.member(test_number, 'in'), self.member(test_number, 'ok')
+
+    def close(self):
+        self.zip.close()
+
+
+class TarSource(TestSource):
+    random_access = False
+
+    def names(self):
+        return None
+
+    def tests(self, names=None):
+        # names are ignored: a compressed tar can only be read in archive order
+        import tarfile
+        pending = {}
+        with tarfile.open(self.path, 'r|*') as tar:
+            for info in tar:
+                if not info.isfile():
+                    continue
+                test_number, extension = _split(info.name)
+                if extension not in ('in', 'ok'):
+                    continue
+                files = pending.setdefault(test_number, {})
+                files[extension] = SpooledMember(spool(tar.extractfile(info), f'judgee-{extension}'), info.name)
+                if len(files) == 2:
+                    del pending[test_number]
+                    yield test_number, files['in'], files['ok']
+        for test_number in sorted(pending, key=natural_key):
+            files = pending[test_number]
+            if 'in' in files:
+                yield test_number, files['in'], _missing(f'{test_number}.ok')
+
+
+def is_archive(path):
+    if not os.path.isfile(path):
+        return False
+    import tarfile
+    import zipfile
+    return zipfile.is_zipfile(path) or tarfile.is_tarfile(path)
+
+
+def open_tests(path):
+    """
+    Returns the TestSource for a folder or an archive of tests
+    """
+    if os.path.isdir(path):
+        return FolderSource(path)
+    if os.path.isfile(path):
+        import tarfile
+        import zipfile
+        if zipfile.is_zipfile(path):
+            return ZipSource(path)
+        if tarfile.is_tarfile(path):
+            return TarSource(path)
+    raise ValueError(f'{path} is not a folder or a zip/tar archive of tests')
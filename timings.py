@@ -0,0 +1,151 @@
+"""
+Per-phase timings of the judging hot path.
+
+Every test records how many seconds each step took:
+
+    stage    reading the input into memory ahead of the test, on the stager thread (see staging.py)
+    setup    opening the input and creating the output files
+    spawn    starting the process
+    execute  from the start of the process to its exit
+    read     rewinding the output, opening the answer (or reading stderr after a crash)
+    compare  comparing the output, or running the checker; the output is streamed
+             from memory while it is compared, so this includes reading it
+    cleanup  closing the files
+
+and a run records compile, order (listing and ordering the tests), tests and
+record (saving the run). Timings can be exported as JSON or in the Chrome
+trace event format, which chrome://tracing and https://ui.perfetto.dev open.
+"""
+import contextlib
+import json
+import time
+
+
+TEST_PHASES = ('stage', 'setup', 'spawn', 'execute', 'read', 'compare', 'cleanup')
+RUN_PHASES = ('compile', 'order', 'tests', 'record')
+FORMATS = ('json', 'chrome')
+
+
+class PhaseTimer:
+    """
+    Splits the time since it was created into consecutive phases
+    """
+    def __init__(self):
+        self.start = self.last = time.perf_counter()
+        self.phases = {}
+
+    def mark(self, phase):
+        """
+        Ends phase: the time since the previous mark is added to it
+        """
+        now = time.perf_counter()
+        self.phases[phase] = self.phases.get(phase, 0.0) + now - self.last
+        self.last = now
+
+    def total(self):
+        return time.perf_counter() - self.start
+
+
+@contextlib.contextmanager
+def timed(phases, phase):
+    """
+    Adds the time spent in the with block to phases[phase]
+    """
+    start_time = time.perf_counter()
+    try:
+        yield
+    finally:
+        phases[phase] = phases.get(phase, 0.0) + time.perf_counter() - start_time
+
+
+def totals(test_results):
+    """
+    Returns {phase: total seconds over every test} in TEST_PHASES order
+    """
+    result = {}
+    for test_result in test_results:
+        for phase, seconds in (test_result.get('Phases') or {}).items():
+            result[phase] = result.get(phase, 0.0) + seconds
+    return _ordered(result, TEST_PHASES)
+
+
+def _ordered(phases, order):
+    return {phase: phases[phase] for phase in sorted(phases, key=lambda phase: order.index(phase) if phase in order else len(order))}
+
+
+def to_json(test_results, run_phases=None):
+    """
+    Timings of a run as a JSON-ready dict: the run phases, the totals per phase and every test's phases
+    """
+    return {
+        'run': _ordered(run_phases or {}, RUN_PHASES),
+        'totals': totals(test_results),
+        'tests': [{'test': r['Test No.'], 'verdict': r['Verdict'], 'started': r.get('Started'),
+                   'worker': r.get('Worker'), 'phases': r.get('Phases') or {}} for r in test_results],
+    }
+
+
+def to_chrome_trace(test_results, run_phases=None):
+    """
+    Timings of a run in the Chrome trace event format: the run phases on one track
+    and the tests, split into their phases, on one track per worker thread.
+    Staging happens before a test starts, it is drawn on a stager track ending
+    where the test starts.
+    """
+    run_phases = run_phases or {}
+    events = [{'name': 'thread_name', 'ph': 'M', 'pid': 1, 'tid': 0, 'args': {'name': 'run'}}]
+    position = 0.0
+    for phase, seconds in _ordered(run_phases, RUN_PHASES).items():
+        events.append({'name': phase, 'cat': 'run', 'ph': 'X', 'pid': 1, 'tid': 0,
+                       'ts': position * 1e6, 'dur': seconds * 1e6})
+        position += seconds
+
+    # test start times are relative to run_all, which starts after compiling
+    offset = run_phases.get('compile', 0.0)
+    workers = {}
+    for test_result in test_results:
+        if test_result.get('Started') is None or not test_result.get('Phases'):
+            continue
+        worker = test_result.get('Worker') or 'worker'
+        if worker not in workers:
+            workers[worker] = len(workers) + 1
+            events.append({'name': 'thread_name', 'ph': 'M', 'pid': 1, 'tid': workers[worker], 'args': {'name': worker}})
+        tid = workers[worker]
+        start = offset + test_result['Started']
+        phases = dict(test_result['Phases'])
+        staged = phases.pop('stage', None)
+        if staged is not None:
+            if 'stager' not in workers:
+                workers['stager'] = len(workers) + 1
+                events.append({'name': 'thread_name', 'ph': 'M', 'pid': 1, 'tid': workers['stager'], 'args': {'name': 'stager'}})
+            events.append({'name': f"stage {test_result['Test No.']}", 'cat': 'phase', 'ph': 'X', 'pid': 1,
+                           'tid': workers['stager'], 'ts': (start - staged) * 1e6, 'dur': staged * 1e6})
+        duration = sum(phases.values())
+        events.append({'name': f"test {test_result['Test No.']}", 'cat': 'test', 'ph': 'X', 'pid': 1, 'tid': tid,
+                       'ts': start * 1e6, 'dur': duration * 1e6, 'args': {'verdict': test_result['Verdict']}})
+        for phase, seconds in phases.items():
+            events.append({'name': phase, 'cat': 'phase', 'ph': 'X', 'pid': 1, 'tid': tid,
+                           'ts': start * 1e6, 'dur': seconds * 1e6})
+            start += seconds
+    return {'traceEvents': events, 'displayTimeUnit': 'ms'}
+
+
+def export(path, test_results, run_phases=None, format='json'):
+    """
+    Writes the timings of a run to path, format is one of FORMATS
+    """
+    if format == 'json':
+        data = to_json(test_results, run_phases)
+    elif format == 'chrome':
+        data = to_chrome_trace(test_results, run_phases)
+    else:
+        raise ValueError(f'unknown timings format {format!r}, expected one of {", ".join(FORMATS)}')
+    with open(path, 'w') as f:
+        json.dump(data, f, indent=None if format == 'chrome' else 2)
+
+
+def format_phases(phases, count=1):
+    """
+    'spawn 0.80ms, execute 2.10ms, ...' with the time of every phase divided by count
+    """
+    return ', '.join(f'{phase} {seconds / count * 1000:.2f}ms' for phase, seconds in phases.items())
@@ -0,0 +1,150 @@
+"""
+Watch mode: judge again whenever the source or the tests change.
+
+    python main.py judge solution.cpp tests/ --watch
+
+The source and the test folder are polled, so nothing beyond the standard
+library is needed and network drives work too. A change is acted on once the
+files have stopped changing for one poll, so a test generator still writing
+doesn't trigger a run per file.
+
+    source changed          rebuild and rerun every test, the ones that failed before first
+    some .in/.ok changed    rerun only those tests, the other verdicts are kept
+    tests removed           drop their verdicts
+
+A source that was only touched (same contents) doesn't count as changed. In a
+zip archive members are compared by CRC, so rewriting the archive with a few
+new tests reruns just those; any change to a tar archive reruns everything.
+"""
+import hashlib
+import os
+import time
+import zipfile
+
+from testsource import _split
+
+
+WATCH_INTERVAL = 0.5 # seconds between polls
+SCAN_SHARE = 0.2 # at most this share of the time goes to scanning big test folders
+
+
+class Change:
+    def __init__(self, source=False, tests=(), removed=(), everything=False):
+        self.source = source # the source's contents changed
+        self.tests = set(tests) # tests added or changed
+        self.removed = set(removed) # tests gone
+        self.everything = everything # every test has to run again
+
+    def __bool__(self):
+        return self.source or self.everything or bool(self.tests) or bool(self.removed)
+
+    def __repr__(self):
+        return f'Change(source={self.source}, tests={sorted(self.tests)}, removed={sorted(self.removed)}, everything={self.everything})'
+
+
+def file_state(path):
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def tests_state(tests_path):
+    """
+    Returns {test: {extension: state}} of the .in/.ok files of a folder or a zip,
+    or {None: state} for other archives, which can only be judged as a whole
+    """
+    if os.path.isdir(tests_path):
+        state = {}
+        with os.scandir(tests_path) as entries:
+            for entry in entries:
+                test, extension = _split(entry.name)
+                if extension in ('in', 'ok'):
+                    try:
+                        stat = entry.stat()
+                    except OSError: # removed while scanning
+                        continue
+                    state.setdefault(test, {})[extension] = (stat.st_mtime_ns, stat.st_size)
+        return state
+    try:
+        with zipfile.ZipFile(tests_path) as archive:
+            state = {}
+            for info in archive.infolist():
+                test, extension = _split(info.filename)
+                if extension in ('in', 'ok') and not info.is_dir():
+                    state.setdefault(test, {})[extension] = (info.CRC, info.file_size)
+            return state
+    except (OSError, zipfile.BadZipFile):
+        return {None: file_state(tests_path)}
+
+
+def source_hash(path):
+    try:
+        with open(path, 'rb') as f:
+            return hashlib.sha256(f.read()).hexdigest()
+    except OSError:
+        return None
+
+
+class Watcher:
+    def __init__(self, source_path, tests_path, interval=WATCH_INTERVAL):
+        '''
+        Parameters
+        ----------
+        source_path : str
+            source file to watch, None to watch only the tests
+        tests_path : str
+            folder or archive of tests to watch
+        interval : float
+            seconds between polls, stretched for folders that take long to scan
+        '''
+        self.source_path = source_path
+        self.tests_path = tests_path
+        self.interval = interval
+        self.source_hash = source_hash(source_path) if source_path else None
+        self.state = self.pending = self.snapshot()
+
+    def snapshot(self):
+        start_time = time.perf_counter()
+        state = (file_state(self.source_path) if self.source_path else None, tests_state(self.tests_path))
+        self.scan_time = time.perf_counter() - start_time
+        return state
+
+    def poll(self):
+        """
+        Returns the Change since the last poll that reported one, or None if
+        nothing changed or the files are still being written
+        """
+        state = self.snapshot()
+        if state != self.pending:
+            # changed since the previous poll: wait until it settles
+            self.pending = state
+            return None
+        if state == self.state:
+            return None
+        previous, self.state = self.state, state
+        change = Change()
+
+        if state[0] != previous[0]:
+            new_hash = source_hash(self.source_path)
+            change.source = new_hash != self.source_hash
+            self.source_hash = new_hash
+
+        old_tests, new_tests = previous[1], state[1]
+        if None in old_tests or None in new_tests:
+            change.everything = old_tests != new_tests
+        else:
+            change.tests = {test for test, files in new_tests.items() if 'in' in files and files != old_tests.get(test)}
+            change.removed = {test for test, files in old_tests.items() if 'in' in files and 'in' not in new_tests.get(test, {})}
+        return change if change else None
+
+    def wait(self):
+        """
+        Blocks until something changes and returns the Change
+        """
+        while True:
+            time.sleep(max(self.interval, self.scan_time / SCAN_SHARE))
+            change = self.poll()
+            if change is not None:
+                return change